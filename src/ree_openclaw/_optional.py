@@ -0,0 +1,15 @@
+"""Lazy imports for optional dependencies."""
+
+from __future__ import annotations
+
+from types import ModuleType
+
+
+def require_numpy() -> ModuleType:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "this feature requires numpy; install with `pip install ree-openclaw[vector]`"
+        ) from exc
+    return numpy
@@ -56,6 +56,15 @@ class TypedBoundaryRouter:
             provenance=Provenance(source_class="USER", source_id=source_id),
         )
 
+    def check_llm_output(self, role: str) -> PayloadType:
+        """Run the boundary checks for an LLM output role and return its payload type."""
+        payload_type = _ROLE_TO_PAYLOAD.get(role)
+        if payload_type is None:
+            raise ValueError(f"unknown llm role: {role}")
+
+        self.assert_may_write("MODEL_INTERNAL", payload_type)
+        return payload_type
+
     def route_llm_output(
         self,
         content: str,
@@ -66,21 +75,38 @@ class TypedBoundaryRouter:
         input_provenance: tuple[str, ...],
         proposed_effect_class: EffectClass = EffectClass.NONE,
     ) -> Envelope:
-        payload_type = _ROLE_TO_PAYLOAD.get(role)
-        if payload_type is None:
-            raise ValueError(f"unknown llm role: {role}")
-
-        self.assert_may_write("MODEL_INTERNAL", payload_type)
-        return Envelope(
+        payload_type = self.check_llm_output(role)
+        return build_llm_envelope(
+            content,
             payload_type=payload_type,
-            payload={"content": content, "role": role},
-            provenance=Provenance(
-                source_class="MODEL_INTERNAL",
-                source_id="llm",
-                model_call_id=model_call_id,
-                prompt_hash=prompt_hash,
-                input_provenance=input_provenance,
-            ),
-            effect_class=proposed_effect_class,
+            role=role,
+            model_call_id=model_call_id,
+            prompt_hash=prompt_hash,
+            input_provenance=input_provenance,
+            proposed_effect_class=proposed_effect_class,
         )
 
+
+def build_llm_envelope(
+    content: str,
+    *,
+    payload_type: PayloadType,
+    role: str,
+    model_call_id: str,
+    prompt_hash: str,
+    input_provenance: tuple[str, ...],
+    proposed_effect_class: EffectClass = EffectClass.NONE,
+) -> Envelope:
+    """Build an LLM output envelope; callers must have run `check_llm_output` first."""
+    return Envelope(
+        payload_type=payload_type,
+        payload={"content": content, "role": role},
+        provenance=Provenance(
+            source_class="MODEL_INTERNAL",
+            source_id="llm",
+            model_call_id=model_call_id,
+            prompt_hash=prompt_hash,
+            input_provenance=input_provenance,
+        ),
+        effect_class=proposed_effect_class,
+    )
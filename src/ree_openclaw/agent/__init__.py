@@ -5,18 +5,41 @@ from ree_openclaw.agent.autonomy import (
     AutonomousPolicy,
     AutonomousSessionResult,
     AutonomousSessionRunner,
+    AutonomousSessionState,
+    AutonomousSessionStream,
     AutonomousStep,
     AutonomousStepResult,
+    autonomy_step_provenance,
 )
+from ree_openclaw.agent.executor import AutonomousSessionExecutor, AutonomousSessionSpec
 from ree_openclaw.agent.memory import AutonomousSessionMemoryStore, SessionMemorySummary
+from ree_openclaw.agent.replay import (
+    AutonomousSessionReplayer,
+    ReplayDivergence,
+    ReplayedStep,
+    SessionReplay,
+    SessionRecords,
+    SessionReplayIndex,
+)
 
 __all__ = [
     "AutonomousCandidatePlan",
     "AutonomousPolicy",
+    "AutonomousSessionExecutor",
     "AutonomousSessionMemoryStore",
+    "AutonomousSessionReplayer",
     "AutonomousSessionResult",
     "AutonomousSessionRunner",
+    "AutonomousSessionSpec",
+    "AutonomousSessionState",
+    "AutonomousSessionStream",
+    "ReplayDivergence",
+    "ReplayedStep",
     "SessionMemorySummary",
+    "SessionRecords",
+    "SessionReplay",
+    "SessionReplayIndex",
     "AutonomousStep",
     "AutonomousStepResult",
+    "autonomy_step_provenance",
 ]
@@ -1,18 +1,53 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import threading
 import time
-from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterable
 
 from ree_openclaw.agent.memory import AutonomousSessionMemoryStore, SessionMemorySummary
+from ree_openclaw.rc.hysteresis import RCState, next_rc_state
 from ree_openclaw.rc.scoring import RCConflictSignals
-from ree_openclaw.rollout.planner import RolloutProposal, RolloutSignals
+from ree_openclaw.rollout.planner import RolloutEvaluation, RolloutProposal, RolloutSignals
 from ree_openclaw.runtime.pipeline import OpenClawRuntime, ProposalCycleResult
 from ree_openclaw.types import EffectClass
 
 
+_STEP_PROVENANCE_PREFIX = "autonomy-step-"
+
+
+def autonomy_step_provenance(step_index: int) -> str:
+    """Input-provenance tag identifying an autonomy step; session ledger entries record it."""
+    return f"{_STEP_PROVENANCE_PREFIX}{step_index}"
+
+
+def autonomy_step_index(input_provenance: Iterable[object]) -> int | None:
+    """Step index from an `autonomy_step_provenance` tag, or None if there is none."""
+    for item in input_provenance:
+        if isinstance(item, str) and item.startswith(_STEP_PROVENANCE_PREFIX):
+            suffix = item[len(_STEP_PROVENANCE_PREFIX) :]
+            if suffix.isdigit():
+                return int(suffix)
+    return None
+
+
+def _recorded_elapsed_seconds(started: dict, records: Iterable[dict]) -> float:
+    """Seconds from the session_started record to the latest timestamped record.
+
+    Without checkpoints this is the only record of the wall-clock budget used;
+    time between a crash and the resume is not counted.
+    """
+    latest = max((datetime.fromisoformat(item["timestamp"]) for item in records), default=None)
+    if latest is None:
+        return 0.0
+    return max(0.0, (latest - datetime.fromisoformat(started["timestamp"])).total_seconds())
+
+
 @dataclass(frozen=True)
 class AutonomousCandidatePlan:
     proposal_text: str
@@ -38,6 +73,7 @@ class AutonomousPolicy:
     max_command_count: int | None = None
     max_wall_clock_seconds: float | None = None
     stop_on_reject: bool = True
+    checkpoint_interval_steps: int | None = None
 
 
 @dataclass(frozen=True)
@@ -48,6 +84,9 @@ class AutonomousStepResult:
     memory_bias_applied: float
     cycle_result: ProposalCycleResult
 
+    def compact(self) -> AutonomousStepResult:
+        return replace(self, cycle_result=self.cycle_result.compact())
+
 
 @dataclass(frozen=True)
 class AutonomousSessionResult:
@@ -57,22 +96,121 @@ class AutonomousSessionResult:
     stopped_reason: str
     memory_path: Path
     memory_summary: SessionMemorySummary
+    resumed_steps: int = 0
 
     @property
     def steps_executed(self) -> int:
-        return len(self.step_results)
+        return self.resumed_steps + len(self.step_results)
+
+
+@dataclass
+class AutonomousSessionState:
+    """Mutable progress of one session, advanced a step at a time by the runner."""
+
+    session_id: str
+    goal_text: str
+    steps: tuple[AutonomousStep, ...]
+    policy: AutonomousPolicy
+    start_time: float
+    step_results: list[AutonomousStepResult] = field(default_factory=list)
+    command_count: int = 0
+    next_step_index: int = 0
+    stopped_reason: str | None = None
+    resumed_steps: int = 0
+    uncheckpointed_trajectories: list[str] = field(default_factory=list)
+    prefetched: tuple[int, Future[list[RolloutEvaluation]]] | None = None
+    prefetched_steps: int = 0
+    speculating: bool = False
+
+
+class AutonomousSessionStream:
+    """Step results of a running session, yielded as each step completes.
+
+    Works as an iterator and as an async iterator (steps then run in a worker
+    thread). `result` is set once the stream is exhausted and the session has
+    been finalized. With `compact_results`, the copies kept for `result` drop
+    command output and ledger payloads, which are already in the ledger. An
+    abandoned stream leaves the session unfinished; `abandon_session` releases
+    its speculation threads and `resume` can continue it. A step that raises
+    abandons the session itself before the error propagates.
+    """
+
+    def __init__(
+        self,
+        runner: AutonomousSessionRunner,
+        state: AutonomousSessionState,
+        *,
+        compact_results: bool = False,
+    ) -> None:
+        self.runner = runner
+        self.state = state
+        self.compact_results = compact_results
+        self.result: AutonomousSessionResult | None = None
+
+    def __iter__(self) -> AutonomousSessionStream:
+        return self
+
+    def __next__(self) -> AutonomousStepResult:
+        step_result = self._advance()
+        if step_result is None:
+            raise StopIteration
+        return step_result
+
+    def __aiter__(self) -> AutonomousSessionStream:
+        return self
+
+    async def __anext__(self) -> AutonomousStepResult:
+        step_result = await asyncio.to_thread(self._advance)
+        if step_result is None:
+            raise StopAsyncIteration
+        return step_result
+
+    def _advance(self) -> AutonomousStepResult | None:
+        if self.result is not None:
+            return None
+        if self.state.stopped_reason is None:
+            steps_before = len(self.state.step_results)
+            try:
+                self.runner.run_step(self.state)
+            except BaseException:
+                self.runner.abandon_session(self.state)
+                raise
+            if len(self.state.step_results) > steps_before:
+                step_result = self.state.step_results[-1]
+                if self.compact_results:
+                    self.state.step_results[-1] = step_result.compact()
+                return step_result
+        self.result = self.runner.finish_session(self.state)
+        return None
 
 
 class AutonomousSessionRunner:
+    """Run autonomous sessions step by step against one runtime.
+
+    With `speculative_planning`, the next step is ranked and its verifier
+    decisions primed on up to `speculation_workers` threads while the current
+    step executes. The thread pool is shared by the runner's sessions and shut
+    down when the last of them finishes or is abandoned.
+    """
+
     def __init__(
         self,
         runtime: OpenClawRuntime,
         *,
         memory_store: AutonomousSessionMemoryStore | None = None,
+        speculative_planning: bool = False,
+        speculation_workers: int = 1,
     ) -> None:
+        if speculation_workers <= 0:
+            raise ValueError("speculation_workers must be positive")
         self.runtime = runtime
         default_memory_path = runtime.ledger.path.parent / "autonomy" / "session_memory.jsonl"
         self.memory = memory_store or AutonomousSessionMemoryStore(default_memory_path)
+        self.speculative_planning = speculative_planning
+        self.speculation_workers = speculation_workers
+        self._speculation_pool: ThreadPoolExecutor | None = None
+        self._speculation_lock = threading.Lock()
+        self._speculating_sessions = 0
 
     def run(
         self,
@@ -81,11 +219,29 @@ class AutonomousSessionRunner:
         steps: tuple[AutonomousStep, ...],
         policy: AutonomousPolicy | None = None,
     ) -> AutonomousSessionResult:
+        state = self.begin_session(goal_text=goal_text, steps=steps, policy=policy)
+        return self._run_to_completion(state)
+
+    def iter_run(
+        self,
+        *,
+        goal_text: str,
+        steps: tuple[AutonomousStep, ...],
+        policy: AutonomousPolicy | None = None,
+        compact_results: bool = False,
+    ) -> AutonomousSessionStream:
+        """Start a session and stream its step results; see `AutonomousSessionStream`."""
+        state = self.begin_session(goal_text=goal_text, steps=steps, policy=policy)
+        return AutonomousSessionStream(self, state, compact_results=compact_results)
+
+    def begin_session(
+        self,
+        *,
+        goal_text: str,
+        steps: tuple[AutonomousStep, ...],
+        policy: AutonomousPolicy | None = None,
+    ) -> AutonomousSessionState:
         active_policy = policy or AutonomousPolicy()
-        step_results: list[AutonomousStepResult] = []
-        stopped_reason = "completed"
-        limit = min(active_policy.max_steps, len(steps))
-        command_count = 0
         start_time = time.monotonic()
         session_id = self.memory.start_session(
             goal_text=goal_text,
@@ -94,143 +250,403 @@ class AutonomousSessionRunner:
                 "max_command_count": active_policy.max_command_count,
                 "max_wall_clock_seconds": active_policy.max_wall_clock_seconds,
                 "stop_on_reject": active_policy.stop_on_reject,
+                "checkpoint_interval_steps": active_policy.checkpoint_interval_steps,
             },
         )
+        state = AutonomousSessionState(
+            session_id=session_id,
+            goal_text=goal_text,
+            steps=steps,
+            policy=active_policy,
+            start_time=start_time,
+        )
+        self._begin_speculation(state)
+        return state
 
-        for step_index in range(limit):
-            if (
-                active_policy.max_wall_clock_seconds is not None
-                and time.monotonic() - start_time >= active_policy.max_wall_clock_seconds
-            ):
-                stopped_reason = "max_wall_clock_reached"
-                break
-            if (
-                active_policy.max_command_count is not None
-                and command_count >= active_policy.max_command_count
-            ):
-                stopped_reason = "max_command_count_reached"
-                break
-
-            step = steps[step_index]
-            if not step.candidates:
-                stopped_reason = "no_candidates"
-                break
-
-            ranked = self.runtime.plan_rollouts(
-                tuple(
-                    RolloutProposal(
-                        proposal_text=item.proposal_text,
-                        action_class=item.action_class,
-                        scope=item.scope,
-                        effect_class=item.effect_class,
-                        command=item.command,
-                        trajectory_reference=item.trajectory_reference,
-                        input_provenance=(f"autonomy-step-{step_index}",),
-                    )
-                    for item in step.candidates
-                ),
-                signal_overrides={
-                    item.trajectory_reference: RolloutSignals(
-                        viability=item.viability,
-                        valence=item.valence,
-                    )
-                    for item in step.candidates
-                },
-            )
-            ranked_with_memory = []
-            for evaluation in ranked:
-                memory_bias = self.memory.trajectory_bias(
-                    evaluation.candidate.trajectory_reference
-                )
-                ranked_with_memory.append(
-                    (evaluation.ranking_score + memory_bias, memory_bias, evaluation)
-                )
-            selected_adjusted_score, memory_bias_applied, selected = max(
-                ranked_with_memory,
-                key=lambda item: item[0],
-            )
-            selected_plan = next(
-                item
-                for item in step.candidates
-                if item.trajectory_reference == selected.candidate.trajectory_reference
-            )
+    def run_step(self, state: AutonomousSessionState) -> bool:
+        """Run the session's next step; returns False once the session has stopped."""
+        if state.stopped_reason is not None:
+            return False
+        active_policy = state.policy
+        if state.next_step_index >= min(active_policy.max_steps, len(state.steps)):
+            state.stopped_reason = "completed"
+            return False
+        if self._wall_clock_exhausted(state):
+            state.stopped_reason = "max_wall_clock_reached"
+            return False
+        if (
+            active_policy.max_command_count is not None
+            and state.command_count >= active_policy.max_command_count
+        ):
+            state.stopped_reason = "max_command_count_reached"
+            return False
 
-            cycle = self.runtime.run_command_cycle(
-                user_text=step.user_intent,
-                proposal_text=selected_plan.proposal_text,
-                action_class=selected_plan.action_class,
-                scope=selected_plan.scope,
-                effect_class=selected_plan.effect_class,
-                command=selected_plan.command,
-                rc_signals=selected_plan.rc_signals,
-                input_provenance=(f"autonomy-step-{step_index}",),
-                trajectory_reference=selected_plan.trajectory_reference,
-            )
-            command_count += 1
-            step_results.append(
-                AutonomousStepResult(
-                    step_index=step_index,
-                    selected_trajectory_reference=selected_plan.trajectory_reference,
-                    selected_ranking_score=selected_adjusted_score,
-                    memory_bias_applied=memory_bias_applied,
-                    cycle_result=cycle,
-                )
+        step_index = state.next_step_index
+        step = state.steps[step_index]
+        if not step.candidates:
+            state.stopped_reason = "no_candidates"
+            return False
+
+        ranked = self._take_prefetched(state, step_index)
+        if ranked is None:
+            ranked = self._plan_step(step_index, step)
+        else:
+            state.prefetched_steps += 1
+        bias_table = self.memory.trajectory_bias_table()
+        ranked_with_memory = []
+        for evaluation in ranked:
+            memory_bias = bias_table.get(evaluation.candidate.trajectory_reference, 0.0)
+            ranked_with_memory.append(
+                (evaluation.ranking_score + memory_bias, memory_bias, evaluation)
             )
-            self.memory.append_step_record(
-                session_id=session_id,
+        selected_adjusted_score, memory_bias_applied, selected = max(
+            ranked_with_memory,
+            key=lambda item: item[0],
+        )
+        plans_by_reference: dict[str, AutonomousCandidatePlan] = {}
+        for item in step.candidates:
+            plans_by_reference.setdefault(item.trajectory_reference, item)
+        selected_plan = plans_by_reference[selected.candidate.trajectory_reference]
+
+        self._prefetch_next_step(state, step_index, selected_plan)
+        cycle = self.runtime.run_command_cycle(
+            user_text=step.user_intent,
+            proposal_text=selected_plan.proposal_text,
+            action_class=selected_plan.action_class,
+            scope=selected_plan.scope,
+            effect_class=selected_plan.effect_class,
+            command=selected_plan.command,
+            rc_signals=selected_plan.rc_signals,
+            input_provenance=(autonomy_step_provenance(step_index),),
+            trajectory_reference=selected_plan.trajectory_reference,
+            session_id=state.session_id,
+        )
+        state.command_count += 1
+        state.next_step_index += 1
+        state.step_results.append(
+            AutonomousStepResult(
                 step_index=step_index,
-                user_intent=step.user_intent,
                 selected_trajectory_reference=selected_plan.trajectory_reference,
                 selected_ranking_score=selected_adjusted_score,
                 memory_bias_applied=memory_bias_applied,
-                action_class=selected_plan.action_class,
-                scope=selected_plan.scope,
-                effect_class=selected_plan.effect_class.value,
-                allowed=cycle.verification.allowed,
-                reason=cycle.verification.reason,
-                rc_state=cycle.rc_state.value,
-                rc_conflict_score=cycle.rc_conflict_score,
-                commit_id=cycle.commit_token.commit_id if cycle.commit_token else None,
+                cycle_result=cycle,
             )
-            if not cycle.verification.allowed and active_policy.stop_on_reject:
-                stopped_reason = "rejected_step"
-                break
-            if (
-                active_policy.max_wall_clock_seconds is not None
-                and time.monotonic() - start_time >= active_policy.max_wall_clock_seconds
-            ):
-                stopped_reason = "max_wall_clock_reached"
-                break
+        )
+        self.memory.append_step_record(
+            session_id=state.session_id,
+            step_index=step_index,
+            user_intent=step.user_intent,
+            selected_trajectory_reference=selected_plan.trajectory_reference,
+            selected_ranking_score=selected_adjusted_score,
+            memory_bias_applied=memory_bias_applied,
+            action_class=selected_plan.action_class,
+            scope=selected_plan.scope,
+            effect_class=selected_plan.effect_class.value,
+            allowed=cycle.verification.allowed,
+            reason=cycle.verification.reason,
+            rc_state=cycle.rc_state.value,
+            rc_conflict_score=cycle.rc_conflict_score,
+            commit_id=cycle.commit_token.commit_id if cycle.commit_token else None,
+        )
+        elapsed_seconds = time.monotonic() - state.start_time
+        state.uncheckpointed_trajectories.append(selected_plan.trajectory_reference)
+        interval = active_policy.checkpoint_interval_steps
+        if interval is not None and state.next_step_index % interval == 0:
+            self._checkpoint(state, elapsed_seconds, cycle.rc_state.value)
+        if not cycle.verification.allowed and active_policy.stop_on_reject:
+            state.stopped_reason = "rejected_step"
+            return False
+        if (
+            active_policy.max_wall_clock_seconds is not None
+            and elapsed_seconds >= active_policy.max_wall_clock_seconds
+        ):
+            state.stopped_reason = "max_wall_clock_reached"
+            return False
+        if state.next_step_index >= min(active_policy.max_steps, len(state.steps)):
+            state.stopped_reason = "completed"
+            return False
+        return True
 
+    def finish_session(self, state: AutonomousSessionState) -> AutonomousSessionResult:
+        self.abandon_session(state)
+        stopped_reason = state.stopped_reason or "completed"
+        steps_executed = state.resumed_steps + len(state.step_results)
         if (
             stopped_reason == "completed"
-            and len(step_results) >= active_policy.max_steps
-            and len(steps) > active_policy.max_steps
+            and steps_executed >= state.policy.max_steps
+            and len(state.steps) > state.policy.max_steps
         ):
             stopped_reason = "max_steps_reached"
+        state.stopped_reason = stopped_reason
 
         self.memory.finalize_session(
-            session_id=session_id,
+            session_id=state.session_id,
             stopped_reason=stopped_reason,
-            steps_executed=len(step_results),
+            steps_executed=steps_executed,
         )
         memory_summary = self.memory.summarize()
 
         return AutonomousSessionResult(
-            session_id=session_id,
-            goal_text=goal_text,
-            step_results=tuple(step_results),
+            session_id=state.session_id,
+            goal_text=state.goal_text,
+            step_results=tuple(state.step_results),
             stopped_reason=stopped_reason,
             memory_path=self.memory.path,
             memory_summary=memory_summary,
+            resumed_steps=state.resumed_steps,
+        )
+
+    def resume(
+        self,
+        session_id: str,
+        *,
+        steps: tuple[AutonomousStep, ...],
+        policy: AutonomousPolicy | None = None,
+    ) -> AutonomousSessionResult:
+        """Continue an unfinished session after its last committed step.
+
+        `steps` is the session's full step list. Steps with a ledger entry or a
+        step record are never re-run, even if the process died before their
+        memory record or checkpoint was written. The command count, the
+        elapsed wall-clock budget (as of the last checkpoint) and the session's
+        RC lane are restored. The policy defaults to the one recorded at start.
+        """
+        state = self.restore_session(session_id, steps=steps, policy=policy)
+        return self._run_to_completion(state)
+
+    def restore_session(
+        self,
+        session_id: str,
+        *,
+        steps: tuple[AutonomousStep, ...],
+        policy: AutonomousPolicy | None = None,
+    ) -> AutonomousSessionState:
+        records = self.memory.session_records(session_id)
+        started = next((item for item in records if item["event"] == "session_started"), None)
+        if started is None:
+            raise KeyError(f"unknown autonomous session: {session_id}")
+        if any(item["event"] == "session_finished" for item in records):
+            raise ValueError(f"autonomous session already finished: {session_id}")
+
+        if policy is None:
+            snapshot = started.get("policy_snapshot", {})
+            policy = AutonomousPolicy(
+                **{
+                    name: snapshot[name]
+                    for name in AutonomousPolicy.__dataclass_fields__
+                    if name in snapshot
+                }
+            )
+        checkpoints = [item for item in records if item["event"] == "session_checkpoint"]
+        step_records = [item for item in records if item["event"] == "step_recorded"]
+        ledger_by_step: dict[int, dict] = {}
+        for entry in self.runtime.ledger.read_all():
+            payload = entry["payload"]
+            if payload.get("session_id") != session_id:
+                continue
+            step_index = autonomy_step_index(payload.get("input_provenance", ()))
+            if step_index is not None:
+                ledger_by_step[step_index] = entry
+        ledger_entries = [ledger_by_step[index] for index in sorted(ledger_by_step)]
+        completed_steps = max(
+            max(ledger_by_step, default=-1) + 1,
+            max((int(item["step_index"]) + 1 for item in step_records), default=0),
+            max((int(item["next_step_index"]) for item in checkpoints), default=0),
+        )
+        elapsed_seconds = max(
+            float(checkpoints[-1]["elapsed_seconds"]) if checkpoints else 0.0,
+            _recorded_elapsed_seconds(started, (*step_records, *checkpoints, *ledger_entries)),
         )
 
+        if ledger_entries:
+            rc_state = RCState(ledger_entries[-1]["payload"]["rc_state"])
+        elif checkpoints:
+            rc_state = RCState(checkpoints[-1]["rc_state"])
+        else:
+            rc_state = RCState.NORMAL
+        self.runtime.rc_lanes.set_state(session_id, rc_state)
+
+        state = AutonomousSessionState(
+            session_id=session_id,
+            goal_text=str(started.get("goal_text", "")),
+            steps=steps,
+            policy=policy,
+            start_time=time.monotonic() - elapsed_seconds,
+            command_count=completed_steps,
+            next_step_index=completed_steps,
+            resumed_steps=completed_steps,
+        )
+        last_event = ledger_entries[-1]["payload"].get("event") if ledger_entries else None
+        if last_event == "proposal_rejected" and policy.stop_on_reject:
+            state.stopped_reason = "rejected_step"
+        self._begin_speculation(state)
+        return state
+
+    def abandon_session(self, state: AutonomousSessionState) -> None:
+        """Release the speculation resources a session holds without finishing it.
+
+        `finish_session` does this itself; call it for a session that is dropped
+        (for example an abandoned stream). The session can still be resumed.
+        """
+        prefetched, state.prefetched = state.prefetched, None
+        if prefetched is not None:
+            prefetched[1].cancel()
+        if not state.speculating:
+            return
+        state.speculating = False
+        with self._speculation_lock:
+            self._speculating_sessions -= 1
+            if self._speculating_sessions > 0:
+                return
+            pool, self._speculation_pool = self._speculation_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _run_to_completion(self, state: AutonomousSessionState) -> AutonomousSessionResult:
+        try:
+            while self.run_step(state):
+                pass
+        except BaseException:
+            self.abandon_session(state)
+            raise
+        return self.finish_session(state)
+
+    def _begin_speculation(self, state: AutonomousSessionState) -> None:
+        if not self.speculative_planning:
+            return
+        state.speculating = True
+        with self._speculation_lock:
+            self._speculating_sessions += 1
+
+    def _checkpoint(
+        self, state: AutonomousSessionState, elapsed_seconds: float, rc_state: str
+    ) -> None:
+        self.memory.append_checkpoint(
+            session_id=state.session_id,
+            next_step_index=state.next_step_index,
+            command_count=state.command_count,
+            elapsed_seconds=elapsed_seconds,
+            selected_trajectory_references=state.uncheckpointed_trajectories,
+            rc_state=rc_state,
+        )
+        state.uncheckpointed_trajectories = []
+
+    def _plan_step(
+        self,
+        step_index: int,
+        step: AutonomousStep,
+        *,
+        prime_rc_state: RCState | None = None,
+        session_id: str | None = None,
+    ) -> list[RolloutEvaluation]:
+        ranked = self.runtime.plan_rollouts(
+            tuple(
+                RolloutProposal(
+                    proposal_text=item.proposal_text,
+                    action_class=item.action_class,
+                    scope=item.scope,
+                    effect_class=item.effect_class,
+                    command=item.command,
+                    trajectory_reference=item.trajectory_reference,
+                    input_provenance=(autonomy_step_provenance(step_index),),
+                )
+                for item in step.candidates
+            ),
+            signal_overrides={
+                item.trajectory_reference: RolloutSignals(
+                    viability=item.viability,
+                    valence=item.valence,
+                )
+                for item in step.candidates
+            },
+        )
+        if prime_rc_state is not None:
+            for item in step.candidates:
+                self.runtime.prime_verification(
+                    action_class=item.action_class,
+                    scope=item.scope,
+                    effect_class=item.effect_class,
+                    rc_signals=item.rc_signals,
+                    session_id=session_id,
+                    rc_state=prime_rc_state,
+                )
+        return ranked
+
+    def _prefetch_next_step(
+        self,
+        state: AutonomousSessionState,
+        step_index: int,
+        selected_plan: AutonomousCandidatePlan,
+    ) -> None:
+        next_index = step_index + 1
+        if (
+            not state.speculating
+            or next_index >= min(state.policy.max_steps, len(state.steps))
+            or not state.steps[next_index].candidates
+        ):
+            return
+        # The next step runs in the band this step moves the lane to, so priming
+        # starts from that predicted state rather than the lane's current one.
+        predicted_rc_state = next_rc_state(
+            self.runtime.rc_lanes.state(state.session_id),
+            self.runtime.rc_scorer.score(selected_plan.rc_signals),
+            self.runtime.rc_lanes.config,
+        )
+        with self._speculation_lock:
+            if self._speculation_pool is None:
+                self._speculation_pool = ThreadPoolExecutor(
+                    max_workers=self.speculation_workers,
+                    thread_name_prefix="autonomy-speculation",
+                )
+            future = self._speculation_pool.submit(
+                self._plan_step,
+                next_index,
+                state.steps[next_index],
+                prime_rc_state=predicted_rc_state,
+                session_id=state.session_id,
+            )
+        state.prefetched = (next_index, future)
+
+    @staticmethod
+    def _take_prefetched(
+        state: AutonomousSessionState, step_index: int
+    ) -> list[RolloutEvaluation] | None:
+        prefetched, state.prefetched = state.prefetched, None
+        if prefetched is None or prefetched[0] != step_index:
+            return None
+        future = prefetched[1]
+        if not future.done():
+            future.cancel()
+            return None
+        if future.cancelled() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def close(self) -> None:
+        """Stop the speculative planning threads, even if sessions are still open."""
+        with self._speculation_lock:
+            pool, self._speculation_pool = self._speculation_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> AutonomousSessionRunner:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @staticmethod
+    def _wall_clock_exhausted(state: AutonomousSessionState) -> bool:
+        limit = state.policy.max_wall_clock_seconds
+        return limit is not None and time.monotonic() - state.start_time >= limit
+
     @staticmethod
     def write_artifact(result: AutonomousSessionResult, output_path: Path) -> Path:
         payload = {
             "session_id": result.session_id,
             "goal_text": result.goal_text,
             "steps_executed": result.steps_executed,
+            "resumed_steps": result.resumed_steps,
             "stopped_reason": result.stopped_reason,
             "memory_path": str(result.memory_path),
             "memory_summary": {
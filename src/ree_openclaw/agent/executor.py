@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Sequence
+
+from ree_openclaw.agent.autonomy import (
+    AutonomousPolicy,
+    AutonomousSessionResult,
+    AutonomousSessionRunner,
+    AutonomousSessionState,
+    AutonomousStep,
+)
+
+
+@dataclass(frozen=True)
+class AutonomousSessionSpec:
+    goal_text: str
+    steps: tuple[AutonomousStep, ...]
+    policy: AutonomousPolicy | None = None
+
+
+class AutonomousSessionExecutor:
+    """Run many autonomous sessions concurrently against one shared runtime.
+
+    Sessions are scheduled round-robin one step at a time: a worker takes the
+    session at the head of the ready queue, runs its next step and puts it back
+    at the tail. A session is never stepped by two workers at once, so its
+    steps stay ordered. `max_concurrency` caps steps running at the same time;
+    `max_active_sessions` caps sessions admitted at once. A session begins, and
+    its wall-clock budget starts, when a worker first takes it from the queue,
+    not when it is admitted. Per-session budgets come from each spec's
+    `AutonomousPolicy`. With speculative planning, sessions run on a runner
+    sharing `runner`'s runtime and memory store whose speculation pool has at
+    least `max_concurrency` threads, so one session's prefetch never waits on
+    another's; `runner` itself is not modified.
+    """
+
+    def __init__(
+        self,
+        runner: AutonomousSessionRunner,
+        *,
+        max_concurrency: int = 4,
+        max_active_sessions: int | None = None,
+    ) -> None:
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        if max_active_sessions is not None and max_active_sessions <= 0:
+            raise ValueError("max_active_sessions must be positive")
+        self.runner = runner
+        self.max_concurrency = max_concurrency
+        self.max_active_sessions = max_active_sessions
+        self._session_runner = runner
+        if runner.speculative_planning and runner.speculation_workers < max_concurrency:
+            self._session_runner = AutonomousSessionRunner(
+                runner.runtime,
+                memory_store=runner.memory,
+                speculative_planning=True,
+                speculation_workers=max_concurrency,
+            )
+
+    def run_all(self, specs: Sequence[AutonomousSessionSpec]) -> list[AutonomousSessionResult]:
+        """Run every spec to completion; results are returned in spec order.
+
+        If a session raises, it is dropped, the remaining sessions still finish,
+        and the first error is re-raised.
+        """
+        session_runner = self._session_runner
+        results: list[AutonomousSessionResult | None] = [None] * len(specs)
+        unadmitted = iter(enumerate(specs))
+        ready: deque[tuple[int, AutonomousSessionSpec, AutonomousSessionState | None]] = deque()
+        condition = threading.Condition()
+        errors: list[BaseException] = []
+        active = 0
+
+        def admit() -> None:
+            nonlocal active
+            while self.max_active_sessions is None or active < self.max_active_sessions:
+                item = next(unadmitted, None)
+                if item is None:
+                    return
+                index, spec = item
+                ready.append((index, spec, None))
+                active += 1
+
+        def worker() -> None:
+            nonlocal active
+            while True:
+                with condition:
+                    while not ready and active > 0:
+                        condition.wait()
+                    if not ready:
+                        return
+                    index, spec, state = ready.popleft()
+                try:
+                    if state is None:
+                        state = session_runner.begin_session(
+                            goal_text=spec.goal_text,
+                            steps=spec.steps,
+                            policy=spec.policy,
+                        )
+                        running = True
+                    else:
+                        running = session_runner.run_step(state)
+                    result = None if running else session_runner.finish_session(state)
+                except BaseException as exc:
+                    running, result = False, None
+                    if state is not None:
+                        session_runner.abandon_session(state)
+                    with condition:
+                        errors.append(exc)
+                with condition:
+                    if running:
+                        ready.append((index, spec, state))
+                    else:
+                        results[index] = result
+                        active -= 1
+                        admit()
+                    condition.notify_all()
+
+        with condition:
+            admit()
+        workers = [
+            threading.Thread(target=worker, name=f"autonomy-session-{number}", daemon=True)
+            for number in range(min(self.max_concurrency, max(len(specs), 1)))
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return [result for result in results if result is not None]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import json
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 from uuid import uuid4
 
 
@@ -16,12 +18,23 @@ class SessionMemorySummary:
 
 
 class AutonomousSessionMemoryStore:
-    """Persistent autonomy memory store, separate from trusted POL/ID/CAPS stores."""
+    """Persistent autonomy memory store, separate from trusted POL/ID/CAPS stores.
+
+    Safe to share between threads: each record is written as one line under a
+    lock, together with the in-memory bias update.
+    """
 
     def __init__(self, path: Path) -> None:
         self.path = path
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.path.touch(exist_ok=True)
+        self._outcomes: dict[str, tuple[int, int]] = {}
+        self._bias: dict[str, float] = {}
+        self._bias_view: Mapping[str, float] = MappingProxyType(self._bias)
+        self._session_ids: set[str] = set()
+        self._step_record_count = 0
+        self._indexed_size = 0
+        self._lock = threading.Lock()
 
     def start_session(self, *, goal_text: str, policy_snapshot: dict[str, Any]) -> str:
         session_id = str(uuid4())
@@ -73,6 +86,29 @@ class AutonomousSessionMemoryStore:
             }
         )
 
+    def append_checkpoint(
+        self,
+        *,
+        session_id: str,
+        next_step_index: int,
+        command_count: int,
+        elapsed_seconds: float,
+        selected_trajectory_references: list[str],
+        rc_state: str,
+    ) -> None:
+        """Record resumable session progress; trajectories are those since the last checkpoint."""
+        self._append(
+            {
+                "event": "session_checkpoint",
+                "session_id": session_id,
+                "next_step_index": next_step_index,
+                "command_count": command_count,
+                "elapsed_seconds": elapsed_seconds,
+                "selected_trajectory_references": selected_trajectory_references,
+                "rc_state": rc_state,
+            }
+        )
+
     def finalize_session(
         self,
         *,
@@ -90,41 +126,32 @@ class AutonomousSessionMemoryStore:
         )
 
     def trajectory_bias(self, trajectory_reference: str) -> float:
-        step_records = [
-            entry
-            for entry in self.read_all()
-            if entry.get("event") == "step_recorded"
-            and entry.get("selected_trajectory_reference") == trajectory_reference
-        ]
-        if not step_records:
-            return 0.0
-        successes = sum(1 for entry in step_records if bool(entry.get("allowed")))
-        failures = len(step_records) - successes
-        bias = (successes - failures) / len(step_records)
-        return max(min(bias * 0.05, 0.05), -0.05)
+        return self.trajectory_bias_table().get(trajectory_reference, 0.0)
+
+    def trajectory_bias_table(self) -> Mapping[str, float]:
+        """Read-only bias per trajectory reference that has step records.
+
+        Bias aggregates step records across all sessions. The table is built
+        from the file once and then updated as this store appends records.
+        Lookups only stat the file; records appended by another writer are
+        indexed from where the index left off, and the file is re-read in
+        full only if it shrank.
+        """
+        with self._lock:
+            self._catch_up()
+        return self._bias_view
 
     def summarize(self) -> SessionMemorySummary:
-        entries = self.read_all()
-        sessions = {
-            entry["session_id"]
-            for entry in entries
-            if entry.get("event") in {"session_started", "session_finished"}
-            and "session_id" in entry
-        }
-        step_records = [entry for entry in entries if entry.get("event") == "step_recorded"]
-        trajectories = {
-            str(entry["selected_trajectory_reference"])
-            for entry in step_records
-            if "selected_trajectory_reference" in entry
-        }
-        trajectory_bias = {
-            trajectory: self.trajectory_bias(trajectory) for trajectory in sorted(trajectories)
-        }
-        return SessionMemorySummary(
-            total_sessions=len(sessions),
-            total_step_records=len(step_records),
-            trajectory_bias=trajectory_bias,
-        )
+        with self._lock:
+            self._catch_up()
+            return SessionMemorySummary(
+                total_sessions=len(self._session_ids),
+                total_step_records=self._step_record_count,
+                trajectory_bias=dict(sorted(self._bias.items())),
+            )
+
+    def session_records(self, session_id: str) -> list[dict[str, Any]]:
+        return [entry for entry in self.read_all() if entry.get("session_id") == session_id]
 
     def read_all(self) -> list[dict[str, Any]]:
         entries: list[dict[str, Any]] = []
@@ -141,5 +168,50 @@ class AutonomousSessionMemoryStore:
             "timestamp": datetime.now(tz=timezone.utc).isoformat(),
             **payload,
         }
-        with self.path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(record, sort_keys=True) + "\n")
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as handle:
+                size_before = handle.tell()
+                handle.write(line)
+                size_after = handle.tell()
+            # Otherwise another writer appended first; `_catch_up` indexes both.
+            if self._indexed_size == size_before:
+                self._index_entry(record)
+                self._indexed_size = size_after
+
+    def _catch_up(self) -> None:
+        size = self.path.stat().st_size
+        if size == self._indexed_size:
+            return
+        if size < self._indexed_size:
+            self._outcomes.clear()
+            self._bias.clear()
+            self._session_ids.clear()
+            self._step_record_count = 0
+            self._indexed_size = 0
+        with self.path.open("rb") as handle:
+            handle.seek(self._indexed_size)
+            data = handle.read()
+        # A line still being written by another process is left for the next lookup.
+        complete = data[: data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            if line.strip():
+                self._index_entry(json.loads(line))
+        self._indexed_size += len(complete)
+
+    def _index_entry(self, entry: dict[str, Any]) -> None:
+        event = entry.get("event")
+        if event in {"session_started", "session_finished"} and "session_id" in entry:
+            self._session_ids.add(str(entry["session_id"]))
+        if event != "step_recorded":
+            return
+        self._step_record_count += 1
+        if "selected_trajectory_reference" not in entry:
+            return
+        trajectory_reference = str(entry["selected_trajectory_reference"])
+        successes, total = self._outcomes.get(trajectory_reference, (0, 0))
+        successes += 1 if bool(entry.get("allowed")) else 0
+        total += 1
+        self._outcomes[trajectory_reference] = (successes, total)
+        bias = (successes - (total - successes)) / total
+        self._bias[trajectory_reference] = max(min(bias * 0.05, 0.05), -0.05)
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from ree_openclaw.agent.autonomy import autonomy_step_index, autonomy_step_provenance
+from ree_openclaw.agent.memory import AutonomousSessionMemoryStore
+from ree_openclaw.rc.hysteresis import RCHysteresisConfig, RCState, next_rc_state
+from ree_openclaw.runtime.pipeline import (
+    DEFAULT_MODEL_CALL_ID,
+    DEFAULT_PROMPT_HASH,
+    OpenClawRuntime,
+)
+from ree_openclaw.types import EffectClass
+from ree_openclaw.verifier.verifier import (
+    CapabilityVerifier,
+    ConsentToken,
+    VerificationDecision,
+    VerificationRequest,
+)
+
+
+@dataclass
+class SessionRecords:
+    """One session's memory records and ledger entries.
+
+    `ledger_by_step` maps step index to the ledger entry whose input provenance
+    names that step; session entries without a step tag are kept only in
+    `ledger_entries`.
+    """
+
+    started: dict[str, Any] | None = None
+    steps: list[dict[str, Any]] = field(default_factory=list)
+    finished: dict[str, Any] | None = None
+    ledger_entries: list[dict[str, Any]] = field(default_factory=list)
+    ledger_by_step: dict[int, dict[str, Any]] = field(default_factory=dict)
+
+
+class SessionReplayIndex:
+    """Memory records and ledger entries grouped by session id, built in one pass each."""
+
+    def __init__(
+        self,
+        memory_entries: Iterable[dict[str, Any]],
+        ledger_entries: Iterable[dict[str, Any]],
+    ) -> None:
+        self._sessions: dict[str, SessionRecords] = {}
+        for entry in memory_entries:
+            session_id = entry.get("session_id")
+            if session_id is None:
+                continue
+            records = self._records(str(session_id))
+            event = entry.get("event")
+            if event == "session_started":
+                records.started = entry
+            elif event == "step_recorded":
+                records.steps.append(entry)
+            elif event == "session_finished":
+                records.finished = entry
+        for entry in ledger_entries:
+            session_id = entry.get("payload", {}).get("session_id")
+            if session_id is None:
+                continue
+            records = self._records(str(session_id))
+            records.ledger_entries.append(entry)
+            step_index = autonomy_step_index(entry["payload"].get("input_provenance", ()))
+            if step_index is not None:
+                records.ledger_by_step[step_index] = entry
+        for records in self._sessions.values():
+            records.steps.sort(key=lambda item: int(item.get("step_index", 0)))
+
+    def session_ids(self) -> tuple[str, ...]:
+        return tuple(
+            session_id
+            for session_id, records in self._sessions.items()
+            if records.started is not None
+        )
+
+    def records(self, session_id: str) -> SessionRecords:
+        records = self._sessions.get(session_id)
+        if records is None or records.started is None:
+            raise KeyError(f"unknown autonomous session: {session_id}")
+        return records
+
+    def step_records(self, session_id: str) -> tuple[dict[str, Any], ...]:
+        return tuple(self.records(session_id).steps)
+
+    def ledger_entries(self, session_id: str) -> tuple[dict[str, Any], ...]:
+        return tuple(self.records(session_id).ledger_entries)
+
+    def _records(self, session_id: str) -> SessionRecords:
+        records = self._sessions.get(session_id)
+        if records is None:
+            records = SessionRecords()
+            self._sessions[session_id] = records
+        return records
+
+
+@dataclass(frozen=True)
+class ReplayedStep:
+    step_index: int
+    trajectory_reference: str
+    rc_state: RCState
+    rc_conflict_score: float
+    decision: VerificationDecision
+    ledger_index: int | None
+
+
+@dataclass(frozen=True)
+class ReplayDivergence:
+    step_index: int
+    field: str
+    recorded: object
+    replayed: object
+
+
+@dataclass(frozen=True)
+class SessionReplay:
+    session_id: str
+    goal_text: str
+    steps: tuple[ReplayedStep, ...]
+    divergences: tuple[ReplayDivergence, ...]
+    rc_state: RCState
+    recorded_stopped_reason: str | None
+
+    @property
+    def matches_recording(self) -> bool:
+        return not self.divergences
+
+
+class AutonomousSessionReplayer:
+    """Rebuild autonomous sessions from session memory and the ledger without executing.
+
+    Each recorded step is re-verified against the runtime's current capability
+    manifest (with auditing off) and its RC posture is recomputed from the
+    recorded conflict scores, then compared with the memory record and the
+    ledger entry written for it. Consent tokens are not persisted, so a step
+    the ledger shows as committed is replayed as having presented a valid one.
+    """
+
+    def __init__(
+        self,
+        runtime: OpenClawRuntime,
+        *,
+        memory_store: AutonomousSessionMemoryStore | None = None,
+        rc_config: RCHysteresisConfig | None = None,
+    ) -> None:
+        self.runtime = runtime
+        default_memory_path = runtime.ledger.path.parent / "autonomy" / "session_memory.jsonl"
+        self.memory = memory_store or AutonomousSessionMemoryStore(default_memory_path)
+        self.rc_config = rc_config or runtime.rc_lanes.config
+        self.verifier = CapabilityVerifier(
+            runtime.verifier.compiled_manifest,
+            rc_high_threshold=runtime.verifier.rc_high_threshold,
+        )
+        self._index: SessionReplayIndex | None = None
+
+    @property
+    def index(self) -> SessionReplayIndex:
+        if self._index is None:
+            self.refresh()
+        assert self._index is not None
+        return self._index
+
+    def refresh(self) -> SessionReplayIndex:
+        self._index = SessionReplayIndex(self.memory.read_all(), self.runtime.ledger.read_all())
+        return self._index
+
+    def replay(self, session_id: str, *, until_step: int | None = None) -> SessionReplay:
+        """Replay a session, or fast-forward it through step `until_step` (inclusive)."""
+        records = self.index.records(session_id)
+        rc_state = RCState.NORMAL
+        steps: list[ReplayedStep] = []
+        divergences: list[ReplayDivergence] = []
+
+        step_records = {int(record["step_index"]): record for record in records.steps}
+        for step_index in sorted(step_records.keys() | records.ledger_by_step.keys()):
+            if until_step is not None and step_index > until_step:
+                break
+            ledger_entry = records.ledger_by_step.get(step_index)
+            ledger_payload = ledger_entry["payload"] if ledger_entry is not None else {}
+            # A step whose memory record was never written (the process died after
+            # its ledger append) is replayed from the ledger entry alone.
+            record = step_records.get(step_index, ledger_payload)
+            rc_conflict_score = float(record["rc_conflict_score"])
+            rc_state = next_rc_state(rc_state, rc_conflict_score, self.rc_config)
+            committed = ledger_payload.get("event") == "commit_executed"
+            decision = self.verifier.verify(
+                VerificationRequest(
+                    action_class=str(record["action_class"]),
+                    scope=str(record["scope"]),
+                    effect_class=EffectClass(record["effect_class"]),
+                    rc_state=rc_state,
+                    rc_conflict_score=rc_conflict_score,
+                    consent_token=self._recorded_consent(record) if committed else None,
+                    provenance={
+                        "source_class": "MODEL_INTERNAL",
+                        "source_id": "llm",
+                        "model_call_id": DEFAULT_MODEL_CALL_ID,
+                        "prompt_hash": DEFAULT_PROMPT_HASH,
+                        "input_provenance": (autonomy_step_provenance(step_index),),
+                        "timestamp": (ledger_entry or record).get("timestamp"),
+                    },
+                    provided_verifiers=self.runtime.verifier_labels,
+                )
+            )
+            steps.append(
+                ReplayedStep(
+                    step_index=step_index,
+                    trajectory_reference=str(record.get("selected_trajectory_reference", "")),
+                    rc_state=rc_state,
+                    rc_conflict_score=rc_conflict_score,
+                    decision=decision,
+                    ledger_index=ledger_entry["index"] if ledger_entry is not None else None,
+                )
+            )
+
+            expected_event = "commit_executed" if decision.allowed else "proposal_rejected"
+            if step_index in step_records:
+                comparisons: tuple[tuple[str, object, object], ...] = (
+                    ("rc_state", record.get("rc_state"), rc_state.value),
+                    ("allowed", record.get("allowed"), decision.allowed),
+                    ("reason", record.get("reason"), decision.reason),
+                    ("ledger.event", ledger_payload.get("event"), expected_event),
+                    ("ledger.rc_state", ledger_payload.get("rc_state"), rc_state.value),
+                    (
+                        "ledger.action_class",
+                        ledger_payload.get("action_class"),
+                        record["action_class"],
+                    ),
+                    ("ledger.scope", ledger_payload.get("scope"), record["scope"]),
+                )
+            else:
+                comparisons = (
+                    ("step_record", None, ledger_payload.get("event")),
+                    ("ledger.event", ledger_payload.get("event"), expected_event),
+                    ("ledger.rc_state", ledger_payload.get("rc_state"), rc_state.value),
+                )
+            for field_name, recorded, replayed in comparisons:
+                if recorded != replayed:
+                    divergences.append(
+                        ReplayDivergence(
+                            step_index=step_index,
+                            field=field_name,
+                            recorded=recorded,
+                            replayed=replayed,
+                        )
+                    )
+
+        assert records.started is not None
+        return SessionReplay(
+            session_id=session_id,
+            goal_text=str(records.started.get("goal_text", "")),
+            steps=tuple(steps),
+            divergences=tuple(divergences),
+            rc_state=rc_state,
+            recorded_stopped_reason=(
+                records.finished.get("stopped_reason") if records.finished is not None else None
+            ),
+        )
+
+    @staticmethod
+    def _recorded_consent(record: dict[str, Any]) -> ConsentToken:
+        return ConsentToken(
+            action_class=str(record["action_class"]),
+            scope=str(record["scope"]),
+            nonce="replay",
+            issued_at=str(record.get("timestamp", "")),
+        )
@@ -180,7 +180,7 @@ def _plan_demo(args: argparse.Namespace) -> int:
                 "viability_score": item.viability_score,
                 "valence_score": item.valence_score,
                 "ranking_score": round(item.ranking_score, 4),
-                "payload_type": item.candidate.envelope.payload_type.value,
+                "payload_type": item.candidate.payload_type.value,
             }
             for item in ranked
         ]
@@ -1,53 +1,210 @@
 from __future__ import annotations
 
-import hashlib
-import json
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from ree_openclaw.ledger.background import BackgroundWriter
+from ree_openclaw.ledger.codec import (
+    BINARY_MAGIC,
+    HASH_FORMAT_BINARY,
+    HASH_FORMAT_JSON,
+    RECORD_FORMATS,
+    RecordCodecError,
+    detect_record_format,
+    encode_canonical,
+    encode_json_line,
+    encode_map_header,
+    encode_str,
+    entry_hash,
+    frame,
+    iter_record_spans,
+    iter_records,
+    read_last_json_record,
+)
+
+_RECENT_SPANS = 256
 
 
 class AppendOnlyLedger:
-    def __init__(self, path: Path) -> None:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        sink: BackgroundWriter | None = None,
+        record_format: str | None = None,
+    ) -> None:
+        if record_format is not None and record_format not in RECORD_FORMATS:
+            raise ValueError(f"unknown ledger record format: {record_format!r}")
         self.path = path
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.path.touch(exist_ok=True)
+        existing_format = detect_record_format(self.path)
+        if existing_format is None:
+            self.record_format = record_format or "json"
+            if self.record_format == "binary":
+                with self.path.open("ab") as handle:
+                    handle.write(BINARY_MAGIC)
+        elif record_format is not None and record_format != existing_format:
+            raise ValueError(
+                f"ledger {self.path} is {existing_format!r}, not {record_format!r}"
+            )
+        else:
+            self.record_format = existing_format
+        self.sink = sink
+        self._lock = threading.Lock()
+        self._tail: tuple[int, int, str] | None = None
+        self._recent_spans: OrderedDict[str, tuple[int, int]] = OrderedDict()
 
     def append(self, payload: dict[str, Any]) -> dict[str, Any]:
-        entries = self.read_all()
-        previous_hash = entries[-1]["entry_hash"] if entries else "GENESIS"
-        index = len(entries)
+        if self.sink is not None:
+            return self.sink.submit(self._append_locked, payload).result()
+        return self._append_locked(payload)
+
+    def append_async(self, payload: dict[str, Any]) -> Future[dict[str, Any]]:
+        """Queue a non-critical entry; the chain is still computed in append order."""
+        if self.sink is not None:
+            return self.sink.submit(self._append_locked, payload)
+        future: Future[dict[str, Any]] = Future()
+        future.set_result(self._append_locked(payload))
+        return future
+
+    def _append_locked(self, payload: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            return self._write_entry(payload)
+
+    def _write_entry(self, payload: dict[str, Any]) -> dict[str, Any]:
+        index, previous_hash = self._tail_state()
         timestamp = datetime.now(tz=timezone.utc).isoformat()
-        material = json.dumps(
-            {"index": index, "payload": payload, "previous_hash": previous_hash},
-            sort_keys=True,
-            separators=(",", ":"),
-        )
-        entry_hash = hashlib.sha256(material.encode("utf-8")).hexdigest()
-
-        entry = {
-            "index": index,
-            "timestamp": timestamp,
-            "payload": payload,
-            "previous_hash": previous_hash,
-            "entry_hash": entry_hash,
-        }
-        with self.path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(entry, sort_keys=True) + "\n")
+        if self.record_format == "binary":
+            # The payload is encoded once and reused for hash material and the record.
+            encoded_payload = encode_canonical(payload)
+            computed_hash = entry_hash(
+                index=index,
+                payload=payload,
+                previous_hash=previous_hash,
+                hash_format=HASH_FORMAT_BINARY,
+                encoded_payload=encoded_payload,
+            )
+            entry = {
+                "index": index,
+                "timestamp": timestamp,
+                "payload": payload,
+                "previous_hash": previous_hash,
+                "entry_hash": computed_hash,
+                "hash_format": HASH_FORMAT_BINARY,
+            }
+            data = frame(
+                b"".join(
+                    (
+                        encode_map_header(6),
+                        encode_str("entry_hash"),
+                        encode_str(computed_hash),
+                        encode_str("hash_format"),
+                        encode_str(HASH_FORMAT_BINARY),
+                        encode_str("index"),
+                        encode_canonical(index),
+                        encode_str("payload"),
+                        encoded_payload,
+                        encode_str("previous_hash"),
+                        encode_str(previous_hash),
+                        encode_str("timestamp"),
+                        encode_str(timestamp),
+                    )
+                )
+            )
+        else:
+            computed_hash = entry_hash(
+                index=index,
+                payload=payload,
+                previous_hash=previous_hash,
+            )
+            entry = {
+                "index": index,
+                "timestamp": timestamp,
+                "payload": payload,
+                "previous_hash": previous_hash,
+                "entry_hash": computed_hash,
+            }
+            data = encode_json_line(entry)
+
+        with self.path.open("ab") as handle:
+            handle.write(data)
             handle.flush()
             os.fsync(handle.fileno())
+            size = handle.tell()
+        self._tail = (size, index + 1, computed_hash)
+        self._recent_spans[computed_hash] = (size - len(data), len(data))
+        if len(self._recent_spans) > _RECENT_SPANS:
+            self._recent_spans.popitem(last=False)
         return entry
 
+    def _tail_state(self) -> tuple[int, str]:
+        """Next index and previous hash, re-reading the file only if it changed size.
+
+        A json ledger is read backwards from EOF for its last line. Binary frames
+        can only be walked forwards, so a stale binary tail rescans the file;
+        `iter_spans` refreshes the cache when it reaches EOF.
+        """
+        size = self.path.stat().st_size
+        if self._tail is not None and self._tail[0] == size:
+            return self._tail[1], self._tail[2]
+        next_index = 0
+        previous_hash = "GENESIS"
+        if self.record_format == "json":
+            last = read_last_json_record(self.path)
+            if last is not None:
+                next_index = last["index"] + 1
+                previous_hash = last["entry_hash"]
+        else:
+            for entry in iter_records(self.path):
+                next_index += 1
+                previous_hash = entry["entry_hash"]
+        self._tail = (size, next_index, previous_hash)
+        return next_index, previous_hash
+
+    def tail(self) -> tuple[int, str]:
+        """Entry count and last entry hash ("GENESIS" for an empty ledger)."""
+        if self.sink is not None:
+            self.sink.drain()
+        with self._lock:
+            return self._tail_state()
+
+    def span_of(self, entry_hash: str) -> tuple[int, int] | None:
+        """Byte offset and length of a recently appended entry, if still known.
+
+        Passing the offset to `iter_spans` later re-reads that entry first.
+        """
+        with self._lock:
+            return self._recent_spans.get(entry_hash)
+
+    def iter_spans(self, offset: int = 0) -> Iterator[tuple[int, int, dict[str, Any]]]:
+        """Yield ``(offset, length, entry)`` for entries starting at byte `offset`.
+
+        `offset` should come from `span_of`. Other offsets usually raise ValueError,
+        so callers check the first entry before trusting the rest.
+        """
+        if self.sink is not None:
+            self.sink.drain()
+        last: tuple[int, int, dict[str, Any]] | None = None
+        for span in iter_record_spans(self.path, offset):
+            last = span
+            yield span
+        if last is None:
+            return
+        end = last[0] + last[1]
+        with self._lock:
+            if self.path.stat().st_size == end:
+                self._tail = (end, last[2]["index"] + 1, last[2]["entry_hash"])
+
     def read_all(self) -> list[dict[str, Any]]:
-        entries: list[dict[str, Any]] = []
-        with self.path.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                entries.append(json.loads(line))
-        return entries
+        if self.sink is not None:
+            self.sink.drain()
+        return list(iter_records(self.path))
 
     def verify_chain(self) -> bool:
         entries = self.read_all()
@@ -57,16 +214,15 @@ class AppendOnlyLedger:
                 return False
             if entry.get("previous_hash") != previous_hash:
                 return False
-            material = json.dumps(
-                {
-                    "index": index,
-                    "payload": entry.get("payload"),
-                    "previous_hash": previous_hash,
-                },
-                sort_keys=True,
-                separators=(",", ":"),
-            )
-            expected_hash = hashlib.sha256(material.encode("utf-8")).hexdigest()
+            try:
+                expected_hash = entry_hash(
+                    index=index,
+                    payload=entry.get("payload"),
+                    previous_hash=previous_hash,
+                    hash_format=entry.get("hash_format", HASH_FORMAT_JSON),
+                )
+            except RecordCodecError:
+                return False
             if entry.get("entry_hash") != expected_hash:
                 return False
             previous_hash = entry["entry_hash"]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundWriterClosed(RuntimeError):
+    """Raised when work is submitted to a closed background writer."""
+
+
+class BackgroundWriter:
+    """Single writer thread draining a bounded FIFO of write callables.
+
+    All work runs on one thread in submission order, so hash-chained writes
+    stay strictly ordered. `submit` blocks while the queue is full
+    (backpressure); with `put_timeout_seconds` set it raises `TimeoutError`
+    instead of waiting indefinitely.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        *,
+        max_queue_size: int = 1024,
+        put_timeout_seconds: float | None = None,
+        name: str = "ree-openclaw-background-writer",
+    ) -> None:
+        if max_queue_size <= 0:
+            raise ValueError("max_queue_size must be positive")
+        self.put_timeout_seconds = put_timeout_seconds
+        self.errors: list[BaseException] = []
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+        future: Future[T] = Future()
+        if self.in_writer_thread():
+            if self._closed:
+                raise BackgroundWriterClosed("background writer is closed")
+            self._execute(future, fn, args, kwargs)
+            return future
+        # The closed check and the put are atomic with respect to `close`, so no
+        # work can be queued behind the stop sentinel and left unresolved.
+        with self._close_lock:
+            if self._closed:
+                raise BackgroundWriterClosed("background writer is closed")
+            try:
+                self._queue.put((future, fn, args, kwargs), timeout=self.put_timeout_seconds)
+            except queue.Full as exc:
+                raise TimeoutError("background writer queue is full") from exc
+        return future
+
+    def in_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def drain(self) -> None:
+        """Block until every submitted write has completed."""
+        if not self.in_writer_thread():
+            self._queue.join()
+
+    def close(self) -> None:
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is self._STOP:
+                    return
+                future, fn, args, kwargs = item
+                self._execute(future, fn, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    def _execute(
+        self,
+        future: Future[Any],
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            self.errors.append(exc)
+            future.set_exception(exc)
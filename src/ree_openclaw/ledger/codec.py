@@ -0,0 +1,429 @@
+"""Record codecs for ledger and audit files.
+
+Two on-disk formats are supported:
+
+- ``json``: one ``json.dumps(sort_keys=True)`` object per line (the original format)
+- ``binary``: an 8-byte magic header followed by records framed as a 4-byte
+  big-endian length and a canonical MessagePack-compatible encoding
+
+Canonical binary form (``rcb1``): integers use the smallest MessagePack width,
+floats are always float64, map keys must be strings and are ordered by their
+UTF-8 bytes, tuples encode as arrays. The encoding is canonical per type and
+value: a given value of a given type always encodes to the same bytes, which is
+what the ledger hashes. Values that compare equal across types or signs (``1``
+and ``1.0``, ``0.0`` and ``-0.0``) encode differently.
+
+The binary format exists for interoperability with MessagePack tooling, not for
+speed. This codec is pure Python and is slower than the ``json`` format to
+encode, decode and hash; ``json`` remains the default.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator
+
+BINARY_MAGIC = b"REEREC1\n"
+RECORD_FORMATS = ("json", "binary")
+HASH_FORMAT_JSON = "json"
+HASH_FORMAT_BINARY = "rcb1"
+
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_U64 = struct.Struct(">Q")
+_I8 = struct.Struct(">b")
+_I16 = struct.Struct(">h")
+_I32 = struct.Struct(">i")
+_I64 = struct.Struct(">q")
+_F64 = struct.Struct(">d")
+
+
+class RecordCodecError(ValueError):
+    """Raised when a value cannot be encoded or a record stream is malformed."""
+
+
+def encode_canonical(value: Any) -> bytes:
+    out = bytearray()
+    _encode_into(value, out)
+    return bytes(out)
+
+
+def decode_canonical(data: bytes | memoryview) -> Any:
+    view = memoryview(data)
+    value, offset = _decode_from(view, 0)
+    if offset != len(view):
+        raise RecordCodecError("trailing bytes after canonical value")
+    return value
+
+
+def encode_map_header(size: int) -> bytes:
+    if size < 16:
+        return bytes((0x80 | size,))
+    if size < 1 << 16:
+        return b"\xde" + _U16.pack(size)
+    return b"\xdf" + _U32.pack(size)
+
+
+def encode_str(value: str) -> bytes:
+    out = bytearray()
+    _encode_str(value, out)
+    return bytes(out)
+
+
+def hash_material(
+    *,
+    index: int,
+    payload: Any,
+    previous_hash: str,
+    hash_format: str = HASH_FORMAT_JSON,
+    encoded_payload: bytes | None = None,
+) -> bytes:
+    """Bytes hashed into ``entry_hash`` for the given hash format."""
+    if hash_format == HASH_FORMAT_JSON:
+        return json.dumps(
+            {"index": index, "payload": payload, "previous_hash": previous_hash},
+            sort_keys=True,
+            separators=(",", ":"),
+        ).encode("utf-8")
+    if hash_format == HASH_FORMAT_BINARY:
+        if encoded_payload is None:
+            encoded_payload = encode_canonical(payload)
+        return b"".join(
+            (
+                encode_map_header(3),
+                encode_str("index"),
+                encode_canonical(index),
+                encode_str("payload"),
+                encoded_payload,
+                encode_str("previous_hash"),
+                encode_str(previous_hash),
+            )
+        )
+    raise RecordCodecError(f"unknown hash format: {hash_format!r}")
+
+
+def entry_hash(
+    *,
+    index: int,
+    payload: Any,
+    previous_hash: str,
+    hash_format: str = HASH_FORMAT_JSON,
+    encoded_payload: bytes | None = None,
+) -> str:
+    material = hash_material(
+        index=index,
+        payload=payload,
+        previous_hash=previous_hash,
+        hash_format=hash_format,
+        encoded_payload=encoded_payload,
+    )
+    return hashlib.sha256(material).hexdigest()
+
+
+def frame(encoded_record: bytes) -> bytes:
+    return _U32.pack(len(encoded_record)) + encoded_record
+
+
+def detect_record_format(path: Path) -> str | None:
+    """Return the record format of an existing file, or None when it is empty."""
+    with path.open("rb") as handle:
+        head = handle.read(len(BINARY_MAGIC))
+    if not head:
+        return None
+    return "binary" if head == BINARY_MAGIC else "json"
+
+
+def iter_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield records from a json or binary record file."""
+    for _, _, record in iter_record_spans(path):
+        yield record
+
+
+def iter_record_spans(path: Path, offset: int = 0) -> Iterator[tuple[int, int, dict[str, Any]]]:
+    """Yield ``(offset, length, record)`` for each record at or after byte `offset`.
+
+    `offset` must be the start of a record (or the end of the file); offset 0
+    skips the binary header.
+    """
+    with path.open("rb") as handle:
+        head = handle.read(len(BINARY_MAGIC))
+        binary = head == BINARY_MAGIC
+        position = max(offset, len(BINARY_MAGIC)) if binary else offset
+        handle.seek(position)
+        if binary:
+            yield from _iter_binary(handle, position)
+            return
+        for raw_line in handle:
+            start = position
+            position += len(raw_line)
+            line = raw_line.strip()
+            if not line:
+                continue
+            yield start, position - start, json.loads(line)
+
+
+def read_last_json_record(path: Path, *, chunk_size: int = 4096) -> dict[str, Any] | None:
+    """Return the last record of a json record file, reading backwards from EOF."""
+    with path.open("rb") as handle:
+        end = handle.seek(0, os.SEEK_END)
+        tail = b""
+        position = end
+        while position > 0:
+            step = min(chunk_size, position)
+            position -= step
+            handle.seek(position)
+            tail = handle.read(step) + tail
+            stripped = tail.rstrip()
+            if stripped and (position == 0 or b"\n" in stripped):
+                line = stripped.rsplit(b"\n", 1)[-1]
+                return json.loads(line)
+    return None
+
+
+def encode_json_line(record: dict[str, Any]) -> bytes:
+    return (json.dumps(record, sort_keys=True) + "\n").encode("utf-8")
+
+
+def encode_binary_record(record: dict[str, Any]) -> bytes:
+    return frame(encode_canonical(record))
+
+
+def write_records(path: Path, records: Iterable[dict[str, Any]], *, record_format: str) -> int:
+    if record_format not in RECORD_FORMATS:
+        raise RecordCodecError(f"unknown record format: {record_format!r}")
+    count = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as handle:
+        if record_format == "binary":
+            handle.write(BINARY_MAGIC)
+        for record in records:
+            if record_format == "binary":
+                handle.write(encode_binary_record(record))
+            else:
+                handle.write(encode_json_line(record))
+            count += 1
+    return count
+
+
+def convert_record_file(source: Path, destination: Path, *, record_format: str) -> int:
+    """Rewrite a record file in another format. Ledger hashes are preserved as-is."""
+    if source.resolve() == destination.resolve():
+        raise RecordCodecError("source and destination must differ")
+    return write_records(destination, iter_records(source), record_format=record_format)
+
+
+def _iter_binary(
+    handle: BinaryIO, position: int
+) -> Iterator[tuple[int, int, dict[str, Any]]]:
+    while True:
+        prefix = handle.read(_U32.size)
+        if not prefix:
+            return
+        if len(prefix) != _U32.size:
+            raise RecordCodecError("truncated record length prefix")
+        (length,) = _U32.unpack(prefix)
+        body = handle.read(length)
+        if len(body) != length:
+            raise RecordCodecError("truncated record body")
+        record = decode_canonical(body)
+        if not isinstance(record, dict):
+            raise RecordCodecError("binary record is not a map")
+        yield position, _U32.size + length, record
+        position += _U32.size + length
+
+
+def _encode_str(value: str, out: bytearray) -> None:
+    _encode_str_bytes(value.encode("utf-8"), out)
+
+
+def _encode_int(value: int, out: bytearray) -> None:
+    if 0 <= value < 128:
+        out.append(value)
+    elif -32 <= value < 0:
+        out.append(value & 0xFF)
+    elif 0 <= value < 1 << 8:
+        out += b"\xcc" + _U8.pack(value)
+    elif 0 <= value < 1 << 16:
+        out += b"\xcd" + _U16.pack(value)
+    elif 0 <= value < 1 << 32:
+        out += b"\xce" + _U32.pack(value)
+    elif 0 <= value < 1 << 64:
+        out += b"\xcf" + _U64.pack(value)
+    elif -(1 << 7) <= value:
+        out += b"\xd0" + _I8.pack(value)
+    elif -(1 << 15) <= value:
+        out += b"\xd1" + _I16.pack(value)
+    elif -(1 << 31) <= value:
+        out += b"\xd2" + _I32.pack(value)
+    elif -(1 << 63) <= value:
+        out += b"\xd3" + _I64.pack(value)
+    else:
+        raise RecordCodecError("integer out of 64-bit range")
+
+
+def _encode_into(value: Any, out: bytearray) -> None:
+    if value is None:
+        out.append(0xC0)
+    elif value is True:
+        out.append(0xC3)
+    elif value is False:
+        out.append(0xC2)
+    elif isinstance(value, str):
+        _encode_str(value, out)
+    elif isinstance(value, int):
+        _encode_int(value, out)
+    elif isinstance(value, float):
+        out += b"\xcb" + _F64.pack(value)
+    elif isinstance(value, (list, tuple)):
+        size = len(value)
+        if size < 16:
+            out.append(0x90 | size)
+        elif size < 1 << 16:
+            out += b"\xdc" + _U16.pack(size)
+        else:
+            out += b"\xdd" + _U32.pack(size)
+        for item in value:
+            _encode_into(item, out)
+    elif isinstance(value, dict):
+        items = []
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise RecordCodecError(f"map keys must be strings, got {type(key).__name__}")
+            items.append((key.encode("utf-8"), item))
+        items.sort(key=lambda pair: pair[0])
+        out += encode_map_header(len(items))
+        for key_bytes, item in items:
+            _encode_str_bytes(key_bytes, out)
+            _encode_into(item, out)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        size = len(data)
+        if size < 1 << 8:
+            out += b"\xc4" + _U8.pack(size)
+        elif size < 1 << 16:
+            out += b"\xc5" + _U16.pack(size)
+        else:
+            out += b"\xc6" + _U32.pack(size)
+        out += data
+    else:
+        raise RecordCodecError(f"cannot encode value of type {type(value).__name__}")
+
+
+def _encode_str_bytes(data: bytes, out: bytearray) -> None:
+    size = len(data)
+    if size < 32:
+        out.append(0xA0 | size)
+    elif size < 1 << 8:
+        out += b"\xd9" + _U8.pack(size)
+    elif size < 1 << 16:
+        out += b"\xda" + _U16.pack(size)
+    else:
+        out += b"\xdb" + _U32.pack(size)
+    out += data
+
+
+def _decode_from(view: memoryview, offset: int) -> tuple[Any, int]:
+    try:
+        marker = view[offset]
+    except IndexError as exc:
+        raise RecordCodecError("truncated canonical value") from exc
+    offset += 1
+    if marker < 0x80:
+        return marker, offset
+    if marker >= 0xE0:
+        return marker - 0x100, offset
+    if 0xA0 <= marker <= 0xBF:
+        return _decode_str(view, offset, marker & 0x1F)
+    if 0x90 <= marker <= 0x9F:
+        return _decode_array(view, offset, marker & 0x0F)
+    if 0x80 <= marker <= 0x8F:
+        return _decode_map(view, offset, marker & 0x0F)
+    if marker == 0xC0:
+        return None, offset
+    if marker == 0xC2:
+        return False, offset
+    if marker == 0xC3:
+        return True, offset
+    fixed = _FIXED_WIDTH.get(marker)
+    if fixed is not None:
+        if offset + fixed.size > len(view):
+            raise RecordCodecError("truncated fixed-width value")
+        (value,) = fixed.unpack_from(view, offset)
+        return value, offset + fixed.size
+    sized = _SIZED.get(marker)
+    if sized is not None:
+        length_struct, kind = sized
+        if offset + length_struct.size > len(view):
+            raise RecordCodecError("truncated length prefix")
+        (size,) = length_struct.unpack_from(view, offset)
+        offset += length_struct.size
+        if kind == "str":
+            return _decode_str(view, offset, size)
+        if kind == "bin":
+            end = offset + size
+            if end > len(view):
+                raise RecordCodecError("truncated binary value")
+            return bytes(view[offset:end]), end
+        if kind == "array":
+            return _decode_array(view, offset, size)
+        return _decode_map(view, offset, size)
+    raise RecordCodecError(f"unsupported marker byte 0x{marker:02x}")
+
+
+def _decode_str(view: memoryview, offset: int, size: int) -> tuple[str, int]:
+    end = offset + size
+    if end > len(view):
+        raise RecordCodecError("truncated string value")
+    try:
+        return str(view[offset:end], "utf-8"), end
+    except UnicodeDecodeError as exc:
+        raise RecordCodecError(f"invalid utf-8 string value: {exc}") from exc
+
+
+def _decode_array(view: memoryview, offset: int, size: int) -> tuple[list[Any], int]:
+    items = []
+    for _ in range(size):
+        item, offset = _decode_from(view, offset)
+        items.append(item)
+    return items, offset
+
+
+def _decode_map(view: memoryview, offset: int, size: int) -> tuple[dict[str, Any], int]:
+    result: dict[str, Any] = {}
+    for _ in range(size):
+        key, offset = _decode_from(view, offset)
+        if not isinstance(key, str):
+            raise RecordCodecError("map keys must be strings")
+        result[key], offset = _decode_from(view, offset)
+    return result, offset
+
+
+_FIXED_WIDTH = {
+    0xCC: _U8,
+    0xCD: _U16,
+    0xCE: _U32,
+    0xCF: _U64,
+    0xD0: _I8,
+    0xD1: _I16,
+    0xD2: _I32,
+    0xD3: _I64,
+    0xCB: _F64,
+}
+
+_SIZED = {
+    0xD9: (_U8, "str"),
+    0xDA: (_U16, "str"),
+    0xDB: (_U32, "str"),
+    0xC4: (_U8, "bin"),
+    0xC5: (_U16, "bin"),
+    0xC6: (_U32, "bin"),
+    0xDC: (_U16, "array"),
+    0xDD: (_U32, "array"),
+    0xDE: (_U16, "map"),
+    0xDF: (_U32, "map"),
+}
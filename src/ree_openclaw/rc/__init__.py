@@ -1,13 +1,26 @@
 """RC conflict lane package."""
 
 from ree_openclaw.rc.hysteresis import RCHysteresis, RCHysteresisConfig, RCState
+from ree_openclaw.rc.lanes import RCLaneRegistry
 from ree_openclaw.rc.scoring import RCConflictScorer, RCConflictSignals, RCConflictWeights
+from ree_openclaw.rc.signals import RCSignalExtractionConfig, RCSignalExtractor
+from ree_openclaw.rc.simulation import (
+    HysteresisSweepResult,
+    HysteresisTrajectoryStats,
+    simulate_hysteresis,
+)
 
 __all__ = [
+    "HysteresisSweepResult",
+    "HysteresisTrajectoryStats",
     "RCHysteresis",
     "RCHysteresisConfig",
+    "RCLaneRegistry",
     "RCState",
     "RCConflictScorer",
     "RCConflictSignals",
     "RCConflictWeights",
+    "RCSignalExtractionConfig",
+    "RCSignalExtractor",
+    "simulate_hysteresis",
 ]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from ree_openclaw.rc.hysteresis import RCHysteresis, RCState
+from ree_openclaw.rc.lanes import RCLaneRegistry
+
+
+class RCPostureCheckpoint:
+    """Small on-disk snapshot of RC posture for warm restarts.
+
+    Only non-NORMAL lanes are written, since absent lanes restore as NORMAL.
+    Each snapshot records the ledger entry it was taken after, including its byte
+    span when known, so a restore can detect a ledger that moved on (or was
+    rewritten) since the snapshot and replay only what follows that entry.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def save(
+        self,
+        *,
+        global_lane: RCHysteresis,
+        lanes: RCLaneRegistry,
+        ledger_index: int | None,
+        ledger_entry_hash: str | None,
+        ledger_span: tuple[int, int] | None = None,
+    ) -> None:
+        self.write(
+            self.snapshot(
+                global_lane=global_lane,
+                lanes=lanes,
+                ledger_index=ledger_index,
+                ledger_entry_hash=ledger_entry_hash,
+                ledger_span=ledger_span,
+            )
+        )
+
+    def snapshot(
+        self,
+        *,
+        global_lane: RCHysteresis,
+        lanes: RCLaneRegistry,
+        ledger_index: int | None,
+        ledger_entry_hash: str | None,
+        ledger_span: tuple[int, int] | None = None,
+    ) -> dict[str, Any]:
+        """Capture posture now; `write` may persist it later from another thread."""
+        return {
+            "global_state": global_lane.state.value,
+            "lanes": {
+                lane_id: lane
+                for lane_id, lane in lanes.snapshot()["lanes"].items()
+                if lane["state"] != RCState.NORMAL.value
+            },
+            "ledger_index": ledger_index,
+            "ledger_entry_hash": ledger_entry_hash,
+            "ledger_offset": ledger_span[0] if ledger_span is not None else None,
+            "ledger_length": ledger_span[1] if ledger_span is not None else None,
+            "written_at": datetime.now(tz=timezone.utc).isoformat(),
+        }
+
+    def write(self, snapshot: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+        with self._lock:
+            with temporary.open("w", encoding="utf-8") as handle:
+                handle.write(json.dumps(snapshot, sort_keys=True))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, self.path)
+
+    def load(self) -> dict[str, Any] | None:
+        try:
+            snapshot = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            return None
+        if not isinstance(snapshot, dict):
+            return None
+        return snapshot
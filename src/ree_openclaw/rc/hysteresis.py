@@ -10,6 +10,9 @@ class RCState(str, Enum):
     LOCKDOWN = "LOCKDOWN"
 
 
+RC_STATE_ORDER = (RCState.NORMAL, RCState.VERIFY, RCState.LOCKDOWN)
+
+
 @dataclass(frozen=True)
 class RCHysteresisConfig:
     t_low: float = 0.35
@@ -28,24 +31,24 @@ class RCHysteresis:
         self.state = RCState.NORMAL
 
     def update(self, score: float) -> RCState:
-        if score < 0.0 or score > 1.0:
-            raise ValueError("score must be in [0, 1]")
+        self.state = next_rc_state(self.state, score, self.config)
+        return self.state
 
-        if score >= self.config.t_lock:
-            self.state = RCState.LOCKDOWN
-            return self.state
 
-        if self.state == RCState.NORMAL and score >= self.config.t_high:
-            self.state = RCState.VERIFY
-            return self.state
+def next_rc_state(state: RCState, score: float, config: RCHysteresisConfig) -> RCState:
+    if score < 0.0 or score > 1.0:
+        raise ValueError("score must be in [0, 1]")
 
-        if self.state in {RCState.VERIFY, RCState.LOCKDOWN} and score <= self.config.t_low:
-            self.state = RCState.NORMAL
-            return self.state
+    if score >= config.t_lock:
+        return RCState.LOCKDOWN
 
-        if self.state == RCState.LOCKDOWN and self.config.t_low < score < self.config.t_lock:
-            self.state = RCState.VERIFY
-            return self.state
+    if state == RCState.NORMAL and score >= config.t_high:
+        return RCState.VERIFY
 
-        return self.state
+    if state in {RCState.VERIFY, RCState.LOCKDOWN} and score <= config.t_low:
+        return RCState.NORMAL
+
+    if state == RCState.LOCKDOWN and config.t_low < score < config.t_lock:
+        return RCState.VERIFY
 
+    return state
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from ree_openclaw.rc.hysteresis import (
+    RC_STATE_ORDER,
+    RCHysteresisConfig,
+    RCState,
+    next_rc_state,
+)
+
+_NORMAL_CODE = RC_STATE_ORDER.index(RCState.NORMAL)
+
+
+class RCLaneRegistry:
+    """RC hysteresis posture per session or tenant id.
+
+    Each lane is stored as a state code (index into `RC_STATE_ORDER`) and the
+    wall-clock time of its last update. Unknown lanes start in NORMAL, so LRU
+    eviction only ever drops NORMAL lanes; VERIFY and LOCKDOWN lanes are kept
+    even past `max_lanes` rather than silently relaxing their posture.
+    """
+
+    def __init__(
+        self,
+        config: RCHysteresisConfig | None = None,
+        *,
+        max_lanes: int = 10_000,
+    ) -> None:
+        if max_lanes <= 0:
+            raise ValueError("max_lanes must be positive")
+        self.config = config or RCHysteresisConfig()
+        self.config.validate()
+        self.max_lanes = max_lanes
+        self._lanes: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lanes)
+
+    def __contains__(self, lane_id: object) -> bool:
+        return lane_id in self._lanes
+
+    def state(self, lane_id: str) -> RCState:
+        lane = self._lanes.get(lane_id)
+        return RC_STATE_ORDER[lane[0]] if lane is not None else RCState.NORMAL
+
+    def update(self, lane_id: str, score: float) -> RCState:
+        with self._lock:
+            lane = self._lanes.get(lane_id)
+            current = RC_STATE_ORDER[lane[0]] if lane is not None else RCState.NORMAL
+            state = next_rc_state(current, score, self.config)
+            self._lanes[lane_id] = (RC_STATE_ORDER.index(state), time.time())
+            self._lanes.move_to_end(lane_id)
+            self._evict()
+            return state
+
+    def set_state(self, lane_id: str, state: RCState, *, updated_at: float | None = None) -> None:
+        with self._lock:
+            self._lanes[lane_id] = (
+                RC_STATE_ORDER.index(state),
+                time.time() if updated_at is None else updated_at,
+            )
+            self._lanes.move_to_end(lane_id)
+            self._evict()
+
+    def discard(self, lane_id: str) -> None:
+        with self._lock:
+            self._lanes.pop(lane_id, None)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "lanes": {
+                    lane_id: {"state": RC_STATE_ORDER[code].value, "updated_at": updated_at}
+                    for lane_id, (code, updated_at) in self._lanes.items()
+                },
+            }
+
+    def restore(self, snapshot: dict[str, Any]) -> None:
+        lanes: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        ordered = sorted(
+            snapshot.get("lanes", {}).items(),
+            key=lambda item: float(item[1]["updated_at"]),
+        )
+        for lane_id, lane in ordered:
+            lanes[str(lane_id)] = (
+                RC_STATE_ORDER.index(RCState(lane["state"])),
+                float(lane["updated_at"]),
+            )
+        with self._lock:
+            self._lanes = lanes
+            self._evict()
+
+    def _evict(self) -> None:
+        overflow = len(self._lanes) - self.max_lanes
+        if overflow <= 0:
+            return
+        victims: list[str] = []
+        for lane_id, (code, _) in self._lanes.items():
+            if code == _NORMAL_CODE:
+                victims.append(lane_id)
+                if len(victims) == overflow:
+                    break
+        for lane_id in victims:
+            del self._lanes[lane_id]
@@ -1,6 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Sequence
+
+from ree_openclaw._optional import require_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SIGNAL_FIELDS = (
+    "provenance_mismatch",
+    "identity_capability_inconsistency",
+    "temporal_discontinuity",
+    "tool_output_inconsistency",
+)
 
 
 @dataclass(frozen=True)
@@ -66,3 +79,39 @@ class RCConflictScorer:
         )
         score = weighted_sum / self.weights.total_weight
         return min(max(score, 0.0), 1.0)
+
+    def score_batch(self, signals: np.ndarray | Sequence[RCConflictSignals]) -> np.ndarray:
+        """Score an (N, 4) array or a sequence of signals in one vectorized pass.
+
+        Columns follow `SIGNAL_FIELDS`. Results are bit-identical to `score`
+        because the weighted sum is accumulated in the same order.
+        """
+        numpy = require_numpy()
+        matrix = self._signal_matrix(numpy, signals)
+        out_of_range = (matrix < 0.0) | (matrix > 1.0)
+        if out_of_range.any():
+            row, column = numpy.argwhere(out_of_range)[0]
+            raise ValueError(f"{SIGNAL_FIELDS[column]} must be in [0, 1] (row {row})")
+        weighted_sum = (
+            matrix[:, 0] * self.weights.provenance_mismatch
+            + matrix[:, 1] * self.weights.identity_capability_inconsistency
+            + matrix[:, 2] * self.weights.temporal_discontinuity
+            + matrix[:, 3] * self.weights.tool_output_inconsistency
+        )
+        return numpy.clip(weighted_sum / self.weights.total_weight, 0.0, 1.0)
+
+    @staticmethod
+    def _signal_matrix(numpy: Any, signals: Any) -> np.ndarray:
+        if not isinstance(signals, numpy.ndarray):
+            signals = [
+                tuple(getattr(item, name) for name in SIGNAL_FIELDS)
+                if isinstance(item, RCConflictSignals)
+                else item
+                for item in signals
+            ]
+        matrix = numpy.asarray(signals, dtype=numpy.float64)
+        if matrix.size == 0:
+            return matrix.reshape(0, len(SIGNAL_FIELDS))
+        if matrix.ndim != 2 or matrix.shape[1] != len(SIGNAL_FIELDS):
+            raise ValueError(f"signals must have shape (N, {len(SIGNAL_FIELDS)})")
+        return matrix
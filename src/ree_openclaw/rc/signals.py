@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from ree_openclaw.rc.scoring import RCConflictSignals
+
+
+@dataclass(frozen=True)
+class RCSignalExtractionConfig:
+    gap_smoothing: float = 0.2
+    gap_ratio_ceiling: float = 10.0
+    failure_streak_saturation: int = 3
+    output_change_signal: float = 0.5
+    tracked_commands_per_session: int = 64
+
+    def validate(self) -> None:
+        if not (0.0 < self.gap_smoothing <= 1.0):
+            raise ValueError("gap_smoothing must be in (0, 1]")
+        if self.gap_ratio_ceiling <= 1.0:
+            raise ValueError("gap_ratio_ceiling must be greater than 1")
+        if self.failure_streak_saturation <= 0:
+            raise ValueError("failure_streak_saturation must be positive")
+        if not (0.0 <= self.output_change_signal <= 1.0):
+            raise ValueError("output_change_signal must be in [0, 1]")
+        if self.tracked_commands_per_session <= 0:
+            raise ValueError("tracked_commands_per_session must be positive")
+
+
+class _SessionStats:
+    __slots__ = ("last_timestamp", "gap_ewma", "failure_streak", "output_changed", "outputs")
+
+    def __init__(self) -> None:
+        self.last_timestamp: float | None = None
+        self.gap_ewma: float | None = None
+        self.failure_streak = 0
+        self.output_changed = False
+        self.outputs: OrderedDict[str, str] = OrderedDict()
+
+
+class RCSignalExtractor:
+    """Rolling per-session statistics that derive RC signals from ledger entries.
+
+    `observe_entry` folds one ledger entry into its session's running state and
+    `signals` reads that state, both in O(1); history is never re-read.
+
+    - temporal_discontinuity: how far the gap since the session's last entry
+      exceeds its smoothed typical gap (1.0 if timestamps go backwards)
+    - tool_output_inconsistency: non-zero return-code streaks, or an identical
+      command producing different output than last time
+    """
+
+    def __init__(
+        self,
+        config: RCSignalExtractionConfig | None = None,
+        *,
+        max_sessions: int = 10_000,
+    ) -> None:
+        if max_sessions <= 0:
+            raise ValueError("max_sessions must be positive")
+        self.config = config or RCSignalExtractionConfig()
+        self.config.validate()
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str | None, _SessionStats] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe_entry(self, entry: dict[str, Any]) -> None:
+        payload = entry.get("payload", {})
+        timestamp = _epoch_seconds(entry.get("timestamp"))
+        with self._lock:
+            stats = self._stats(payload.get("session_id"))
+            if timestamp is not None:
+                if stats.last_timestamp is not None:
+                    gap = timestamp - stats.last_timestamp
+                    if gap >= 0.0:
+                        alpha = self.config.gap_smoothing
+                        stats.gap_ewma = (
+                            gap
+                            if stats.gap_ewma is None
+                            else alpha * gap + (1.0 - alpha) * stats.gap_ewma
+                        )
+                stats.last_timestamp = timestamp
+
+            execution = payload.get("execution")
+            if payload.get("event") != "commit_executed" or not isinstance(execution, dict):
+                return
+            if execution.get("returncode") == 0:
+                stats.failure_streak = 0
+            else:
+                stats.failure_streak += 1
+            command_key = repr(payload.get("command"))
+            output_hash = hashlib.sha256(
+                str(execution.get("stdout", "")).encode("utf-8")
+            ).hexdigest()
+            previous_hash = stats.outputs.get(command_key)
+            stats.output_changed = previous_hash is not None and previous_hash != output_hash
+            stats.outputs[command_key] = output_hash
+            stats.outputs.move_to_end(command_key)
+            if len(stats.outputs) > self.config.tracked_commands_per_session:
+                stats.outputs.popitem(last=False)
+
+    def signals(
+        self, session_id: str | None = None, *, now: float | None = None
+    ) -> RCConflictSignals:
+        """Signals for the session's next cycle; `now` is a POSIX timestamp."""
+        stats = self._sessions.get(session_id)
+        if stats is None:
+            return RCConflictSignals()
+
+        temporal = 0.0
+        if now is not None and stats.last_timestamp is not None:
+            gap = now - stats.last_timestamp
+            if gap < 0.0:
+                temporal = 1.0
+            elif stats.gap_ewma:
+                ratio = gap / stats.gap_ewma
+                temporal = (ratio - 1.0) / (self.config.gap_ratio_ceiling - 1.0)
+                temporal = min(max(temporal, 0.0), 1.0)
+
+        tool_output = min(stats.failure_streak / self.config.failure_streak_saturation, 1.0)
+        if stats.output_changed:
+            tool_output = max(tool_output, self.config.output_change_signal)
+        return RCConflictSignals(
+            temporal_discontinuity=temporal,
+            tool_output_inconsistency=tool_output,
+        )
+
+    def _stats(self, session_id: str | None) -> _SessionStats:
+        stats = self._sessions.get(session_id)
+        if stats is None:
+            stats = _SessionStats()
+            self._sessions[session_id] = stats
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return stats
+
+
+def combine_signals(*signals: RCConflictSignals) -> RCConflictSignals:
+    """Field-wise maximum, so extracted evidence can only raise caller-supplied signals."""
+    return RCConflictSignals(
+        provenance_mismatch=max(item.provenance_mismatch for item in signals),
+        identity_capability_inconsistency=max(
+            item.identity_capability_inconsistency for item in signals
+        ),
+        temporal_discontinuity=max(item.temporal_discontinuity for item in signals),
+        tool_output_inconsistency=max(item.tool_output_inconsistency for item in signals),
+    )
+
+
+def _epoch_seconds(timestamp: object) -> float | None:
+    if not isinstance(timestamp, str):
+        return None
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except ValueError:
+        return None
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Sequence
+
+from ree_openclaw._optional import require_numpy
+from ree_openclaw.rc.hysteresis import RC_STATE_ORDER, RCHysteresisConfig, RCState
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclass(frozen=True)
+class HysteresisTrajectoryStats:
+    config: RCHysteresisConfig
+    time_in_state: dict[RCState, int]
+    transition_count: int
+    transitions: dict[tuple[RCState, RCState], int]
+    lockdown_episodes: int
+    lockdown_max_dwell: int
+    lockdown_mean_dwell: float
+
+
+@dataclass(frozen=True)
+class HysteresisSweepResult:
+    configs: tuple[RCHysteresisConfig, ...]
+    stats: tuple[HysteresisTrajectoryStats, ...]
+    states: np.ndarray | None
+    """(len(configs), len(scores)) uint8 state codes indexing `RC_STATE_ORDER`."""
+
+
+def simulate_hysteresis(
+    scores: Sequence[float] | np.ndarray,
+    configs: Sequence[RCHysteresisConfig],
+    *,
+    initial_state: RCState = RCState.NORMAL,
+    keep_states: bool = True,
+) -> HysteresisSweepResult:
+    """Replay `RCHysteresis.update` over a score series for a grid of configs.
+
+    Outside the (t_low, t_high) hold band the next state depends only on the
+    score; inside it the lane keeps NORMAL if the last decisive state was
+    NORMAL and is VERIFY otherwise. That lets each trajectory be computed with
+    a forward fill instead of a per-step Python loop.
+    """
+    numpy = require_numpy()
+    series = numpy.asarray(scores, dtype=numpy.float64)
+    if series.ndim != 1:
+        raise ValueError("scores must be one-dimensional")
+    if series.size and ((series < 0.0) | (series > 1.0)).any():
+        raise ValueError("score must be in [0, 1]")
+    for config in configs:
+        config.validate()
+
+    initial_code = RC_STATE_ORDER.index(initial_state)
+    trajectories = []
+    stats = []
+    for config in configs:
+        states = _trajectory(numpy, series, config, initial_code)
+        stats.append(_summarize(numpy, states, config, initial_code))
+        if keep_states:
+            trajectories.append(states)
+
+    state_matrix = None
+    if keep_states:
+        state_matrix = (
+            numpy.stack(trajectories)
+            if trajectories
+            else numpy.empty((0, series.size), dtype=numpy.uint8)
+        )
+    return HysteresisSweepResult(
+        configs=tuple(configs),
+        stats=tuple(stats),
+        states=state_matrix,
+    )
+
+
+def _trajectory(
+    numpy: Any, series: np.ndarray, config: RCHysteresisConfig, initial_code: int
+) -> np.ndarray:
+    decisive = numpy.full(series.size, -1, dtype=numpy.int8)
+    decisive[series <= config.t_low] = 0
+    decisive[(series >= config.t_high) & (series < config.t_lock)] = 1
+    decisive[series >= config.t_lock] = 2
+
+    positions = numpy.where(decisive >= 0, numpy.arange(series.size), -1)
+    numpy.maximum.accumulate(positions, out=positions)
+    last_decisive = numpy.where(
+        positions >= 0,
+        decisive[numpy.maximum(positions, 0)],
+        initial_code,
+    )
+    held = numpy.where(last_decisive == 0, 0, 1)
+    return numpy.where(decisive >= 0, decisive, held).astype(numpy.uint8)
+
+
+def _summarize(
+    numpy: Any, states: np.ndarray, config: RCHysteresisConfig, initial_code: int
+) -> HysteresisTrajectoryStats:
+    counts = numpy.bincount(states, minlength=len(RC_STATE_ORDER))
+    previous = numpy.empty_like(states)
+    if states.size:
+        previous[0] = initial_code
+        previous[1:] = states[:-1]
+    changed = previous != states
+    pair_counts = numpy.bincount(
+        previous[changed].astype(numpy.int64) * len(RC_STATE_ORDER) + states[changed],
+        minlength=len(RC_STATE_ORDER) ** 2,
+    )
+    transitions = {
+        (RC_STATE_ORDER[code // 3], RC_STATE_ORDER[code % 3]): int(count)
+        for code, count in enumerate(pair_counts)
+        if count
+    }
+
+    lockdown_code = RC_STATE_ORDER.index(RCState.LOCKDOWN)
+    in_lockdown = numpy.concatenate(([False], states == lockdown_code, [False]))
+    edges = numpy.diff(in_lockdown.astype(numpy.int8))
+    dwell = numpy.flatnonzero(edges == -1) - numpy.flatnonzero(edges == 1)
+
+    return HysteresisTrajectoryStats(
+        config=config,
+        time_in_state={state: int(counts[code]) for code, state in enumerate(RC_STATE_ORDER)},
+        transition_count=int(changed.sum()),
+        transitions=transitions,
+        lockdown_episodes=int(dwell.size),
+        lockdown_max_dwell=int(dwell.max()) if dwell.size else 0,
+        lockdown_mean_dwell=float(dwell.mean()) if dwell.size else 0.0,
+    )
@@ -1,8 +1,17 @@
 """Rollout planning and ranking interfaces."""
 
+from ree_openclaw.rollout.beam import (
+    BeamPlan,
+    BeamSearchConfig,
+    BeamSearchPlanner,
+    BeamSearchResult,
+    RolloutExpansion,
+)
 from ree_openclaw.rollout.planner import (
     RolloutCandidate,
     RolloutEvaluation,
+    RolloutEvaluationRun,
+    RolloutEvaluator,
     RolloutPlanner,
     RolloutProposal,
     RolloutSignals,
@@ -10,8 +19,15 @@ from ree_openclaw.rollout.planner import (
 )
 
 __all__ = [
+    "BeamPlan",
+    "BeamSearchConfig",
+    "BeamSearchPlanner",
+    "BeamSearchResult",
     "RolloutCandidate",
     "RolloutEvaluation",
+    "RolloutEvaluationRun",
+    "RolloutEvaluator",
+    "RolloutExpansion",
     "RolloutPlanner",
     "RolloutProposal",
     "RolloutSignals",
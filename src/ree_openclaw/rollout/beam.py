@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from ree_openclaw.rollout.planner import (
+    RolloutCandidate,
+    RolloutPlanner,
+    RolloutProposal,
+    RolloutSignals,
+)
+
+RolloutExpansion = Callable[
+    [tuple[RolloutProposal, ...]],
+    Sequence[tuple[RolloutProposal, RolloutSignals]],
+]
+"""Maps a plan prefix to scored next-step proposals; an empty result ends the plan."""
+
+
+@dataclass(frozen=True)
+class BeamSearchConfig:
+    beam_width: int = 4
+    max_depth: int = 3
+
+    def validate(self) -> None:
+        if self.beam_width <= 0:
+            raise ValueError("beam_width must be positive")
+        if self.max_depth <= 0:
+            raise ValueError("max_depth must be positive")
+
+
+@dataclass(frozen=True)
+class BeamPlan:
+    candidates: tuple[RolloutCandidate, ...]
+    step_scores: tuple[float, ...]
+    score: float
+
+    @property
+    def trajectory_references(self) -> tuple[str, ...]:
+        return tuple(candidate.trajectory_reference for candidate in self.candidates)
+
+
+@dataclass(frozen=True)
+class BeamSearchResult:
+    plans: tuple[BeamPlan, ...]
+    expansions: int
+
+    @property
+    def best(self) -> BeamPlan | None:
+        return self.plans[0] if self.plans else None
+
+
+@dataclass(frozen=True)
+class _Beam:
+    proposals: tuple[RolloutProposal, ...]
+    step_scores: tuple[float, ...]
+    score: float
+    terminal: bool = False
+
+
+class BeamSearchPlanner:
+    """Multi-step pre-commit planning by beam search over rollout proposals.
+
+    A plan's score is the sum of its step scores, each being the planner's
+    viability/valence ranking score plus the memory bias of the step's
+    trajectory. Prefix scores are carried with each beam, so extending a beam
+    only scores the new step. Nothing is executed or written to the ledger.
+    """
+
+    def __init__(
+        self,
+        planner: RolloutPlanner,
+        config: BeamSearchConfig | None = None,
+        *,
+        memory_bias: Callable[[str], float] | None = None,
+    ) -> None:
+        self.planner = planner
+        self.config = config or BeamSearchConfig()
+        self.config.validate()
+        self.memory_bias = memory_bias
+
+    def search(self, expand: RolloutExpansion) -> BeamSearchResult:
+        self.planner.router.check_llm_output("rollout")
+        bias_cache: dict[str, float] = {}
+        score_cache: dict[RolloutSignals, float] = {}
+        beams = [_Beam(proposals=(), step_scores=(), score=0.0)]
+        expansions = 0
+
+        for _ in range(self.config.max_depth):
+            extended: list[_Beam] = []
+            for beam in beams:
+                if beam.terminal:
+                    extended.append(beam)
+                    continue
+                children = expand(beam.proposals)
+                expansions += 1
+                if not children:
+                    if beam.proposals:
+                        extended.append(
+                            _Beam(beam.proposals, beam.step_scores, beam.score, terminal=True)
+                        )
+                    continue
+                for proposal, signals in children:
+                    step_score = score_cache.get(signals)
+                    if step_score is None:
+                        signals.validate()
+                        step_score = self.planner.ranking_score(signals)
+                        score_cache[signals] = step_score
+                    step_score += self._bias(proposal.trajectory_reference, bias_cache)
+                    extended.append(
+                        _Beam(
+                            proposals=beam.proposals + (proposal,),
+                            step_scores=beam.step_scores + (step_score,),
+                            score=beam.score + step_score,
+                        )
+                    )
+            if not extended:
+                break
+            beams = heapq.nlargest(
+                self.config.beam_width, extended, key=lambda item: item.score
+            )
+            if all(beam.terminal for beam in beams):
+                break
+
+        plans = tuple(
+            BeamPlan(
+                candidates=self.planner.build_candidates(beam.proposals),
+                step_scores=beam.step_scores,
+                score=beam.score,
+            )
+            for beam in beams
+            if beam.proposals
+        )
+        return BeamSearchResult(plans=plans, expansions=expansions)
+
+    def _bias(self, trajectory_reference: str, cache: dict[str, float]) -> float:
+        if self.memory_bias is None:
+            return 0.0
+        bias = cache.get(trajectory_reference)
+        if bias is None:
+            bias = self.memory_bias(trajectory_reference)
+            cache[trajectory_reference] = bias
+        return bias
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Sequence
+import heapq
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from functools import cached_property, partial
+from operator import itemgetter
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence
 
-from ree_openclaw.adapter.routing import TypedBoundaryRouter
-from ree_openclaw.types import EffectClass, Envelope
+from ree_openclaw._optional import require_numpy
+from ree_openclaw.adapter.routing import TypedBoundaryRouter, build_llm_envelope
+from ree_openclaw.types import EffectClass, Envelope, PayloadType
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 @dataclass(frozen=True)
@@ -20,14 +29,41 @@ class RolloutProposal:
     input_provenance: tuple[str, ...] = ()
 
 
+CandidateKey = tuple[str, str, EffectClass, tuple[str, ...]]
+
+
 @dataclass(frozen=True)
 class RolloutCandidate:
-    envelope: Envelope
+    """A boundary-checked rollout candidate.
+
+    The untrusted envelope is built on first access of `envelope`, so candidates
+    that are ranked but never selected do not allocate one.
+    """
+
     action_class: str
     scope: str
     effect_class: EffectClass
     command: tuple[str, ...]
     trajectory_reference: str
+    payload_type: PayloadType
+    envelope_factory: Callable[[], Envelope] = field(compare=False, repr=False)
+
+    @cached_property
+    def envelope(self) -> Envelope:
+        return self.envelope_factory()
+
+    @property
+    def canonical_key(self) -> CandidateKey:
+        """Identity of the action itself; candidates sharing it are evaluated once."""
+        return (self.action_class, self.scope, self.effect_class, self.command)
+
+    @property
+    def envelope_materialized(self) -> bool:
+        """True once this candidate's envelope exists, even if a duplicate sharing it built it."""
+        if "envelope" in self.__dict__:
+            return True
+        factory = self.envelope_factory
+        return isinstance(factory, _SharedEnvelope) and factory.built
 
 
 @dataclass(frozen=True)
@@ -66,6 +102,58 @@ class RolloutEvaluation:
     ranking_score: float
 
 
+_CandidateGroup = list[tuple[int, RolloutCandidate]]
+
+
+class _SharedEnvelope:
+    """Builds one envelope on first call; each caller gets a copy with its own payload.
+
+    Provenance is frozen and shared. The payload is a mutable dict, so it is copied
+    to keep an edit through one duplicate candidate from reaching the others.
+    """
+
+    __slots__ = ("_build", "_envelope")
+
+    def __init__(self, build: Callable[[], Envelope]) -> None:
+        self._build = build
+        self._envelope: Envelope | None = None
+
+    @property
+    def built(self) -> bool:
+        return self._envelope is not None
+
+    def __call__(self) -> Envelope:
+        if self._envelope is None:
+            self._envelope = self._build()
+        return replace(self._envelope, payload=dict(self._envelope.payload))
+
+
+RolloutEvaluator = Callable[[RolloutCandidate], RolloutSignals]
+
+_START_POLL_SECONDS = 0.01
+"""How often `evaluate_candidates` checks whether queued evaluations have started."""
+
+
+@dataclass(frozen=True)
+class RolloutEvaluationRun:
+    """Outcome of `RolloutPlanner.evaluate_candidates`.
+
+    `evaluations` ranks every candidate whose evaluator finished in time. The
+    other fields list trajectory references that timed out, raised (with the
+    error), or were never started because the deadline was reached.
+    """
+
+    evaluations: tuple[RolloutEvaluation, ...]
+    timed_out: tuple[str, ...] = ()
+    failed: dict[str, str] = field(default_factory=dict)
+    not_started: tuple[str, ...] = ()
+    deadline_reached: bool = False
+
+    @property
+    def best(self) -> RolloutEvaluation | None:
+        return self.evaluations[0] if self.evaluations else None
+
+
 class RolloutPlanner:
     def __init__(
         self,
@@ -82,49 +170,300 @@ class RolloutPlanner:
         proposals: Sequence[RolloutProposal],
     ) -> tuple[RolloutCandidate, ...]:
         candidates: list[RolloutCandidate] = []
+        payload_type = self.router.check_llm_output("rollout")
+        envelopes: dict[tuple[object, ...], _SharedEnvelope] = {}
         for proposal in proposals:
-            envelope = self.router.route_llm_output(
+            envelope_key = (
                 proposal.proposal_text,
-                role="rollout",
-                model_call_id=proposal.model_call_id,
-                prompt_hash=proposal.prompt_hash,
-                input_provenance=proposal.input_provenance,
-                proposed_effect_class=proposal.effect_class,
+                proposal.model_call_id,
+                proposal.prompt_hash,
+                proposal.input_provenance,
+                proposal.effect_class,
             )
+            envelope_factory = envelopes.get(envelope_key)
+            if envelope_factory is None:
+                envelope_factory = _SharedEnvelope(
+                    partial(
+                        build_llm_envelope,
+                        proposal.proposal_text,
+                        payload_type=payload_type,
+                        role="rollout",
+                        model_call_id=proposal.model_call_id,
+                        prompt_hash=proposal.prompt_hash,
+                        input_provenance=proposal.input_provenance,
+                        proposed_effect_class=proposal.effect_class,
+                    )
+                )
+                envelopes[envelope_key] = envelope_factory
             candidates.append(
                 RolloutCandidate(
-                    envelope=envelope,
                     action_class=proposal.action_class,
                     scope=proposal.scope,
                     effect_class=proposal.effect_class,
                     command=proposal.command,
                     trajectory_reference=proposal.trajectory_reference,
+                    payload_type=payload_type,
+                    envelope_factory=envelope_factory,
                 )
             )
         return tuple(candidates)
 
     def rank_candidates(
         self,
-        candidates: Sequence[RolloutCandidate],
+        candidates: Iterable[RolloutCandidate],
         *,
         signal_overrides: dict[str, RolloutSignals] | None = None,
+        k: int | None = None,
+        min_score: float | None = None,
     ) -> list[RolloutEvaluation]:
+        """Rank candidates best-first; ties keep input order.
+
+        With `k`, only the top `k` are kept (streaming, via a bounded heap) and
+        `candidates` may be any iterable. Candidates scoring below `min_score` are
+        dropped. Evaluations are only built for candidates that are returned.
+        """
+        if k is not None and k < 0:
+            raise ValueError("k cannot be negative")
         signal_overrides = signal_overrides or {}
-        ranked: list[RolloutEvaluation] = []
-        for candidate in candidates:
-            signals = signal_overrides.get(candidate.trajectory_reference, RolloutSignals())
-            signals.validate()
-            ranking_score = (
-                signals.viability * self.weights.viability
-                + signals.valence * self.weights.valence
-            ) / self.weights.total
-            ranked.append(
+        scored = self._scored(candidates, signal_overrides, min_score)
+        if k is None:
+            top = sorted(scored, key=itemgetter(0), reverse=True)
+        else:
+            top = heapq.nlargest(k, scored, key=itemgetter(0))
+        return [
+            RolloutEvaluation(
+                candidate=candidate,
+                viability_score=signals.viability,
+                valence_score=signals.valence,
+                ranking_score=ranking_score,
+            )
+            for ranking_score, candidate, signals in top
+        ]
+
+    def evaluate_candidates(
+        self,
+        candidates: Iterable[RolloutCandidate],
+        evaluator: RolloutEvaluator,
+        *,
+        executor: Executor | None = None,
+        max_workers: int = 4,
+        candidate_timeout_seconds: float | None = None,
+        deadline_seconds: float | None = None,
+    ) -> RolloutEvaluationRun:
+        """Score candidates with `evaluator` concurrently and rank the results.
+
+        At most `max_workers` evaluations run at once, counting timed-out ones
+        that are still running, and a candidate's timeout starts when its
+        evaluation starts. Pass a `ProcessPoolExecutor` for CPU-bound
+        evaluators (evaluator and candidates must then be picklable); by default a
+        private thread pool is used. When `deadline_seconds` elapses the ranking
+        of everything finished so far is returned. Evaluations still running are
+        abandoned, not interrupted. `candidates` is read only as workers free up;
+        a duplicate (same `canonical_key`) joins its key's evaluation, or takes
+        its result, instead of being evaluated again.
+        """
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        owned_executor = executor is None
+        pool = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="rollout-eval"
+        )
+        started_at = time.monotonic()
+        deadline = None if deadline_seconds is None else started_at + deadline_seconds
+        source = enumerate(candidates)
+        in_flight: dict[Future[RolloutSignals], tuple[_CandidateGroup, float | None]] = {}
+        abandoned: set[Future[RolloutSignals]] = set()
+        exhausted = False
+        in_flight_groups: dict[CandidateKey, _CandidateGroup] = {}
+        signals_by_key: dict[CandidateKey, RolloutSignals] = {}
+        errors_by_key: dict[CandidateKey, str] = {}
+        timed_out_keys: set[CandidateKey] = set()
+        finished: list[tuple[int, RolloutCandidate, RolloutSignals]] = []
+        timed_out: list[str] = []
+        failed: dict[str, str] = {}
+        deadline_reached = False
+
+        def settle_duplicate(index: int, candidate: RolloutCandidate) -> bool:
+            """Attach a candidate to its key's evaluation if one was already submitted."""
+            key = candidate.canonical_key
+            group = in_flight_groups.get(key)
+            if group is not None:
+                group.append((index, candidate))
+            elif key in signals_by_key:
+                finished.append((index, candidate, signals_by_key[key]))
+            elif key in errors_by_key:
+                failed[candidate.trajectory_reference] = errors_by_key[key]
+            elif key in timed_out_keys:
+                timed_out.append(candidate.trajectory_reference)
+            else:
+                return False
+            return True
+
+        def abandon(future: Future[RolloutSignals], group: _CandidateGroup) -> None:
+            # A running evaluation cannot be interrupted; it keeps its worker, and
+            # that slot stays taken until the evaluation returns.
+            if not future.cancel():
+                abandoned.add(future)
+            key = group[0][1].canonical_key
+            del in_flight_groups[key]
+            timed_out_keys.add(key)
+            timed_out.extend(candidate.trajectory_reference for _, candidate in group)
+
+        try:
+            while True:
+                abandoned = {future for future in abandoned if not future.done()}
+                while len(in_flight) + len(abandoned) < max_workers and not exhausted:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        break
+                    item = next(source, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    index, candidate = item
+                    if settle_duplicate(index, candidate):
+                        continue
+                    group = [(index, candidate)]
+                    future = pool.submit(evaluator, candidate)
+                    in_flight[future] = (group, None)
+                    in_flight_groups[candidate.canonical_key] = group
+                if not in_flight and (exhausted or not abandoned):
+                    break
+
+                # A candidate's timeout counts from when its evaluation starts running,
+                # not from submission, so queueing behind a busy worker is not charged.
+                now = time.monotonic()
+                for future, (group, started) in list(in_flight.items()):
+                    if started is None and (future.running() or future.done()):
+                        in_flight[future] = (group, now)
+                wake_at = deadline
+                if candidate_timeout_seconds is not None and in_flight:
+                    start_times = [started for _, started in in_flight.values()]
+                    if None in start_times:
+                        expires_at = now + _START_POLL_SECONDS
+                    else:
+                        expires_at = min(start_times) + candidate_timeout_seconds
+                    wake_at = expires_at if wake_at is None else min(wake_at, expires_at)
+                wait_seconds = None if wake_at is None else max(wake_at - now, 0.0)
+                done, _ = wait(
+                    set(in_flight) | abandoned, timeout=wait_seconds, return_when=FIRST_COMPLETED
+                )
+
+                for future in done:
+                    if future not in in_flight:
+                        continue
+                    group, _ = in_flight.pop(future)
+                    key = group[0][1].canonical_key
+                    del in_flight_groups[key]
+                    try:
+                        signals = future.result()
+                        signals.validate()
+                    except Exception as exc:
+                        errors_by_key[key] = f"{type(exc).__name__}: {exc}"
+                        for _, candidate in group:
+                            failed[candidate.trajectory_reference] = errors_by_key[key]
+                        continue
+                    signals_by_key[key] = signals
+                    finished.extend((index, candidate, signals) for index, candidate in group)
+
+                now = time.monotonic()
+                if candidate_timeout_seconds is not None:
+                    for future, (group, started) in list(in_flight.items()):
+                        if started is not None and now - started >= candidate_timeout_seconds:
+                            del in_flight[future]
+                            abandon(future, group)
+                if deadline is not None and now >= deadline:
+                    deadline_reached = True
+                    for future, (group, _) in in_flight.items():
+                        abandon(future, group)
+                    in_flight.clear()
+                    break
+        finally:
+            if owned_executor:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        # Candidates left unread when the deadline hit still share their key's outcome.
+        not_started = tuple(
+            candidate.trajectory_reference
+            for index, candidate in source
+            if not settle_duplicate(index, candidate)
+        )
+        finished.sort(key=itemgetter(0))
+        ranked = sorted(
+            (
                 RolloutEvaluation(
                     candidate=candidate,
                     viability_score=signals.viability,
                     valence_score=signals.valence,
-                    ranking_score=ranking_score,
+                    ranking_score=self.ranking_score(signals),
                 )
-            )
-        ranked.sort(key=lambda item: item.ranking_score, reverse=True)
-        return ranked
+                for _, candidate, signals in finished
+            ),
+            key=lambda evaluation: evaluation.ranking_score,
+            reverse=True,
+        )
+        return RolloutEvaluationRun(
+            evaluations=tuple(ranked),
+            timed_out=tuple(timed_out),
+            failed=failed,
+            not_started=not_started,
+            deadline_reached=deadline_reached or bool(not_started),
+        )
+
+    def ranking_score(self, signals: RolloutSignals) -> float:
+        return (
+            signals.viability * self.weights.viability + signals.valence * self.weights.valence
+        ) / self.weights.total
+
+    def score_columns(
+        self,
+        viability: np.ndarray | Sequence[float],
+        valence: np.ndarray | Sequence[float],
+        memory_bias: np.ndarray | Sequence[float] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Score candidate columns in one vectorized pass.
+
+        Returns `(scores, order)` where `order` indexes `scores` best-first with
+        ties in input order. Scores are bit-identical to `ranking_score`, plus
+        `memory_bias` when given.
+        """
+        numpy = require_numpy()
+        columns = {
+            "viability": numpy.asarray(viability, dtype=numpy.float64),
+            "valence": numpy.asarray(valence, dtype=numpy.float64),
+        }
+        for name, column in columns.items():
+            if column.ndim != 1:
+                raise ValueError(f"{name} must be one-dimensional")
+            out_of_range = (column < 0.0) | (column > 1.0)
+            if out_of_range.any():
+                row = int(numpy.flatnonzero(out_of_range)[0])
+                raise ValueError(f"{name} must be in [0, 1] (row {row})")
+        if columns["viability"].shape != columns["valence"].shape:
+            raise ValueError("viability and valence must have the same length")
+
+        scores = (
+            columns["viability"] * self.weights.viability
+            + columns["valence"] * self.weights.valence
+        ) / self.weights.total
+        if memory_bias is not None:
+            bias = numpy.asarray(memory_bias, dtype=numpy.float64)
+            if bias.shape != scores.shape:
+                raise ValueError("memory_bias must have the same length as viability")
+            scores = scores + bias
+        order = numpy.argsort(-scores, kind="stable")
+        return scores, order
+
+    def _scored(
+        self,
+        candidates: Iterable[RolloutCandidate],
+        signal_overrides: dict[str, RolloutSignals],
+        min_score: float | None,
+    ) -> Iterator[tuple[float, RolloutCandidate, RolloutSignals]]:
+        default_signals = RolloutSignals()
+        for candidate in candidates:
+            signals = signal_overrides.get(candidate.trajectory_reference, default_signals)
+            signals.validate()
+            ranking_score = self.ranking_score(signals)
+            if min_score is not None and ranking_score < min_score:
+                continue
+            yield ranking_score, candidate, signals
@@ -1,30 +1,55 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, Callable, Iterator, Sequence
 
 from ree_openclaw.adapter.routing import TypedBoundaryRouter
 from ree_openclaw.commit.token import CommitToken, mint_commit_token
 from ree_openclaw.ledger.append_only import AppendOnlyLedger
+from ree_openclaw.ledger.background import BackgroundWriter
 from ree_openclaw.offline.consolidation import ConsolidationResult, OfflineConsolidator
-from ree_openclaw.rc.hysteresis import RCHysteresis, RCHysteresisConfig, RCState
+from ree_openclaw.rc.checkpoint import RCPostureCheckpoint
+from ree_openclaw.rc.hysteresis import (
+    RCHysteresis,
+    RCHysteresisConfig,
+    RCState,
+    next_rc_state,
+)
+from ree_openclaw.rc.lanes import RCLaneRegistry
 from ree_openclaw.rc.scoring import RCConflictScorer, RCConflictSignals
+from ree_openclaw.rc.signals import RCSignalExtractor, combine_signals
+from ree_openclaw.rollout.beam import (
+    BeamSearchConfig,
+    BeamSearchPlanner,
+    BeamSearchResult,
+    RolloutExpansion,
+)
 from ree_openclaw.rollout.planner import (
     RolloutEvaluation,
+    RolloutEvaluationRun,
+    RolloutEvaluator,
     RolloutPlanner,
     RolloutProposal,
     RolloutSignals,
 )
 from ree_openclaw.sandbox.harness import SandboxPolicy, SandboxResult, SandboxedExecutor
 from ree_openclaw.types import EffectClass, Envelope
-from ree_openclaw.verifier.capability_manifest import load_capabilities
+from ree_openclaw.verifier.audit import AuditLogWriter
+from ree_openclaw.verifier.capability_manifest import load_manifest
 from ree_openclaw.verifier.verifier import (
     CapabilityVerifier,
     ConsentToken,
     VerificationDecision,
     VerificationRequest,
 )
+from ree_openclaw.verifier.reload import ManifestReloader
+
+
+DEFAULT_MODEL_CALL_ID = "local-model-call"
+DEFAULT_PROMPT_HASH = "local-prompt-hash"
 
 
 @dataclass(frozen=True)
@@ -38,11 +63,12 @@ class ProposalCycleInput:
     rc_conflict_score: float | None = None
     rc_signals: RCConflictSignals = field(default_factory=RCConflictSignals)
     llm_role: str = "rollout"
-    model_call_id: str = "local-model-call"
-    prompt_hash: str = "local-prompt-hash"
+    model_call_id: str = DEFAULT_MODEL_CALL_ID
+    prompt_hash: str = DEFAULT_PROMPT_HASH
     input_provenance: tuple[str, ...] = ()
     trajectory_reference: str = "local-trajectory"
     consent_token: ConsentToken | None = None
+    session_id: str | None = None
 
 
 @dataclass(frozen=True)
@@ -56,6 +82,21 @@ class ProposalCycleResult:
     execution_result: SandboxResult | None
     ledger_entry: dict[str, Any]
 
+    def compact(self) -> ProposalCycleResult:
+        """Copy without command output or ledger payload; both are persisted in the ledger."""
+        execution_result = self.execution_result
+        if execution_result is not None:
+            execution_result = replace(execution_result, stdout="", stderr="")
+        return replace(
+            self,
+            execution_result=execution_result,
+            ledger_entry={
+                key: self.ledger_entry[key]
+                for key in ("index", "timestamp", "entry_hash")
+                if key in self.ledger_entry
+            },
+        )
+
 
 class OpenClawRuntime:
     _IMPLEMENTED_VERIFIER_LABELS = (
@@ -65,6 +106,11 @@ class OpenClawRuntime:
         "provenance_verifier",
     )
 
+    @property
+    def verifier_labels(self) -> tuple[str, ...]:
+        """Verifier labels the runtime presents with every verification request."""
+        return self._IMPLEMENTED_VERIFIER_LABELS
+
     def __init__(
         self,
         *,
@@ -75,15 +121,35 @@ class OpenClawRuntime:
         rc_scorer: RCConflictScorer | None = None,
         sandbox_policy: SandboxPolicy | None = None,
         audit_log_path: Path | None = None,
+        audit_writer: AuditLogWriter | None = None,
+        background_writer: BackgroundWriter | None = None,
+        max_rc_lanes: int = 10_000,
+        rc_snapshot_path: Path | None = None,
+        signal_extractor: RCSignalExtractor | None = None,
     ) -> None:
         self.router = TypedBoundaryRouter()
         self.rollout_planner = RolloutPlanner(router=self.router)
         self.rc_lane = RCHysteresis(rc_config)
+        self.rc_lanes = RCLaneRegistry(rc_config, max_lanes=max_rc_lanes)
         self.rc_scorer = rc_scorer or RCConflictScorer()
-        self.verifier = CapabilityVerifier(capabilities, audit_log_path=audit_log_path)
-        self.ledger = AppendOnlyLedger(ledger_path)
+        self.signal_extractor = signal_extractor
+        self.verifier = CapabilityVerifier(
+            capabilities,
+            audit_log_path=audit_log_path,
+            audit_writer=audit_writer,
+            audit_sink=background_writer,
+        )
+        self.background_writer = background_writer
+        self.ledger = AppendOnlyLedger(ledger_path, sink=background_writer)
         self.offline = OfflineConsolidator(self.ledger, ledger_path.parent / "offline")
         self.executor = SandboxedExecutor(sandbox_root, policy=sandbox_policy)
+        self.manifest_path: Path | None = None
+        self.manifest_reloader: ManifestReloader | None = None
+        self.rc_checkpoint = (
+            RCPostureCheckpoint(rc_snapshot_path) if rc_snapshot_path is not None else None
+        )
+        if self.rc_checkpoint is not None:
+            self._restore_rc_posture()
 
     @classmethod
     def from_manifest(
@@ -96,9 +162,14 @@ class OpenClawRuntime:
         rc_scorer: RCConflictScorer | None = None,
         sandbox_policy: SandboxPolicy | None = None,
         audit_log_path: Path | None = None,
+        audit_writer: AuditLogWriter | None = None,
+        background_writer: BackgroundWriter | None = None,
+        max_rc_lanes: int = 10_000,
+        rc_snapshot_path: Path | None = None,
+        signal_extractor: RCSignalExtractor | None = None,
     ) -> OpenClawRuntime:
-        capabilities = load_capabilities(manifest_path)
-        return cls(
+        capabilities = load_manifest(manifest_path)
+        runtime = cls(
             capabilities=capabilities,
             ledger_path=ledger_path,
             sandbox_root=sandbox_root,
@@ -106,7 +177,54 @@ class OpenClawRuntime:
             rc_scorer=rc_scorer,
             sandbox_policy=sandbox_policy,
             audit_log_path=audit_log_path,
+            audit_writer=audit_writer,
+            background_writer=background_writer,
+            max_rc_lanes=max_rc_lanes,
+            rc_snapshot_path=rc_snapshot_path,
+            signal_extractor=signal_extractor,
+        )
+        runtime.manifest_path = manifest_path
+        return runtime
+
+    def watch_manifest(
+        self,
+        manifest_path: Path | None = None,
+        *,
+        poll_interval_seconds: float = 1.0,
+        start: bool = True,
+    ) -> ManifestReloader:
+        """Hot-reload capabilities from the manifest, keeping RC and ledger state."""
+        path = manifest_path or self.manifest_path
+        if path is None:
+            raise ValueError("manifest_path is required when runtime was not built from a manifest")
+        if self.manifest_reloader is not None:
+            self.manifest_reloader.stop()
+        self.manifest_reloader = ManifestReloader(
+            self.verifier,
+            path,
+            ledger=self.ledger,
+            poll_interval_seconds=poll_interval_seconds,
         )
+        if start:
+            self.manifest_reloader.start()
+        return self.manifest_reloader
+
+    def close(self) -> None:
+        """Stop background work, drain queued writes and flush buffered audit records."""
+        if self.manifest_reloader is not None:
+            self.manifest_reloader.stop()
+            self.manifest_reloader = None
+        if self.background_writer is not None:
+            self.background_writer.drain()
+        self.verifier.close()
+        if self.background_writer is not None:
+            self.background_writer.close()
+
+    def __enter__(self) -> OpenClawRuntime:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def run_cycle(self, proposal: ProposalCycleInput) -> ProposalCycleResult:
         if not proposal.command:
@@ -124,9 +242,28 @@ class OpenClawRuntime:
 
         rc_conflict_score = proposal.rc_conflict_score
         if rc_conflict_score is None:
-            rc_conflict_score = self.rc_scorer.score(proposal.rc_signals)
+            rc_signals = proposal.rc_signals
+            if self.signal_extractor is not None:
+                rc_signals = combine_signals(
+                    rc_signals,
+                    self.signal_extractor.signals(proposal.session_id, now=time.time()),
+                )
+            rc_conflict_score = self.rc_scorer.score(rc_signals)
 
-        rc_state = self.rc_lane.update(rc_conflict_score)
+        if proposal.session_id is None:
+            previous_rc_state = self.rc_lane.state
+            rc_state = self.rc_lane.update(rc_conflict_score)
+        else:
+            previous_rc_state = self.rc_lanes.state(proposal.session_id)
+            rc_state = self.rc_lanes.update(proposal.session_id, rc_conflict_score)
+        session_fields = (
+            {}
+            if proposal.session_id is None
+            else {
+                "session_id": proposal.session_id,
+                "input_provenance": list(proposal.input_provenance),
+            }
+        )
         verification = self.verifier.verify(
             VerificationRequest(
                 action_class=proposal.action_class,
@@ -158,8 +295,10 @@ class OpenClawRuntime:
                     "rc_conflict_score": rc_conflict_score,
                     "reason": verification.reason,
                     "proposal_type": proposal_envelope.payload_type.value,
+                    **session_fields,
                 }
             )
+            self._after_ledger_append(ledger_entry, rc_changed=rc_state != previous_rc_state)
             return ProposalCycleResult(
                 user_envelope=user_envelope,
                 proposal_envelope=proposal_envelope,
@@ -196,8 +335,10 @@ class OpenClawRuntime:
                     "stdout": execution_result.stdout,
                     "stderr": execution_result.stderr,
                 },
+                **session_fields,
             }
         )
+        self._after_ledger_append(ledger_entry, rc_changed=rc_state != previous_rc_state)
         return ProposalCycleResult(
             user_envelope=user_envelope,
             proposal_envelope=proposal_envelope,
@@ -209,19 +350,172 @@ class OpenClawRuntime:
             ledger_entry=ledger_entry,
         )
 
+    def _after_ledger_append(self, ledger_entry: dict[str, Any], *, rc_changed: bool) -> None:
+        if self.signal_extractor is not None:
+            self.signal_extractor.observe_entry(ledger_entry)
+        if rc_changed:
+            self._checkpoint_rc_posture(ledger_entry)
+
+    def _checkpoint_rc_posture(
+        self,
+        ledger_entry: dict[str, Any],
+        ledger_span: tuple[int, int] | None = None,
+    ) -> None:
+        if self.rc_checkpoint is None:
+            return
+        snapshot = self.rc_checkpoint.snapshot(
+            global_lane=self.rc_lane,
+            lanes=self.rc_lanes,
+            ledger_index=ledger_entry["index"],
+            ledger_entry_hash=ledger_entry["entry_hash"],
+            ledger_span=ledger_span or self.ledger.span_of(ledger_entry["entry_hash"]),
+        )
+        if self.background_writer is not None:
+            # The snapshot is taken on the commit path; its fsync'd write is not.
+            # Restore reconciles a stale snapshot against the ledger.
+            self.background_writer.submit(self.rc_checkpoint.write, snapshot)
+            return
+        self.rc_checkpoint.write(snapshot)
+
+    def _restore_rc_posture(self) -> None:
+        """Restore RC posture from the snapshot, reconciling it against the ledger.
+
+        The snapshot's entry is re-read at its recorded byte span. If it is still
+        there, the snapshot is applied and only the entries after it are read,
+        with their recorded `rc_state` applied on top. If the entry is missing or
+        differs, the snapshot is discarded and posture is rebuilt by replaying
+        the whole ledger.
+        """
+        assert self.rc_checkpoint is not None
+        snapshot = self.rc_checkpoint.load()
+        if snapshot is not None:
+            offset = snapshot.get("ledger_offset")
+            length = snapshot.get("ledger_length")
+            if isinstance(offset, int) and isinstance(length, int):
+                spans = self.ledger.iter_spans(offset)
+                try:
+                    first = next(spans, None)
+                except ValueError:
+                    first = None
+                if (
+                    first is not None
+                    and first[:2] == (offset, length)
+                    and first[2].get("index") == snapshot.get("ledger_index")
+                    and first[2].get("entry_hash") == snapshot.get("ledger_entry_hash")
+                ):
+                    self._apply_rc_snapshot(snapshot)
+                    self._replay_rc_posture(spans)
+                    return
+        self._replay_rc_posture(self.ledger.iter_spans())
+
+    def _replay_rc_posture(
+        self, spans: Iterator[tuple[int, int, dict[str, Any]]]
+    ) -> None:
+        last: tuple[int, int, dict[str, Any]] | None = None
+        for last in spans:
+            payload = last[2].get("payload", {})
+            recorded_state = payload.get("rc_state")
+            if recorded_state is None:
+                continue
+            state = RCState(recorded_state)
+            session_id = payload.get("session_id")
+            if session_id is None:
+                self.rc_lane.state = state
+            else:
+                self.rc_lanes.set_state(str(session_id), state)
+        if last is not None:
+            offset, length, entry = last
+            self._checkpoint_rc_posture(entry, (offset, length))
+
+    def _apply_rc_snapshot(self, snapshot: dict[str, Any]) -> None:
+        self.rc_lane.state = RCState(snapshot.get("global_state", RCState.NORMAL.value))
+        self.rc_lanes.restore({"lanes": snapshot.get("lanes", {})})
+
+    def prime_verification(
+        self,
+        *,
+        action_class: str,
+        scope: str,
+        effect_class: EffectClass,
+        rc_signals: RCConflictSignals | None = None,
+        session_id: str | None = None,
+        rc_state: RCState | None = None,
+    ) -> None:
+        """Pre-compute the verifier's static decision for a likely upcoming cycle.
+
+        The RC state is predicted from `rc_signals` and the lane's current (or
+        given) state. Cached decisions are keyed by RC band, so a prediction
+        invalidated by an intervening cycle is never used.
+        """
+        if rc_state is None:
+            rc_state = (
+                self.rc_lane.state if session_id is None else self.rc_lanes.state(session_id)
+            )
+        rc_conflict_score = self.rc_scorer.score(rc_signals or RCConflictSignals())
+        self.verifier.prime(
+            VerificationRequest(
+                action_class=action_class,
+                scope=scope,
+                effect_class=effect_class,
+                rc_state=next_rc_state(rc_state, rc_conflict_score, self.rc_lanes.config),
+                rc_conflict_score=rc_conflict_score,
+                provided_verifiers=self._IMPLEMENTED_VERIFIER_LABELS,
+            )
+        )
+
     def plan_rollouts(
         self,
         proposals: Sequence[RolloutProposal],
         *,
         signal_overrides: dict[str, RolloutSignals] | None = None,
+        k: int | None = None,
+        min_score: float | None = None,
     ) -> list[RolloutEvaluation]:
         """Build and rank pre-commit rollout candidates without executing actions."""
         candidates = self.rollout_planner.build_candidates(proposals)
         return self.rollout_planner.rank_candidates(
             candidates,
             signal_overrides=signal_overrides,
+            k=k,
+            min_score=min_score,
+        )
+
+    def evaluate_rollouts(
+        self,
+        proposals: Sequence[RolloutProposal],
+        evaluator: RolloutEvaluator,
+        *,
+        executor: Executor | None = None,
+        max_workers: int = 4,
+        candidate_timeout_seconds: float | None = None,
+        deadline_seconds: float | None = None,
+    ) -> RolloutEvaluationRun:
+        """Score pre-commit rollout candidates with `evaluator` concurrently."""
+        candidates = self.rollout_planner.build_candidates(proposals)
+        return self.rollout_planner.evaluate_candidates(
+            candidates,
+            evaluator,
+            executor=executor,
+            max_workers=max_workers,
+            candidate_timeout_seconds=candidate_timeout_seconds,
+            deadline_seconds=deadline_seconds,
         )
 
+    def plan_rollout_sequence(
+        self,
+        expand: RolloutExpansion,
+        *,
+        beam_width: int = 4,
+        max_depth: int = 3,
+        memory_bias: Callable[[str], float] | None = None,
+    ) -> BeamSearchResult:
+        """Beam-search multi-step rollout plans without executing actions."""
+        return BeamSearchPlanner(
+            self.rollout_planner,
+            BeamSearchConfig(beam_width=beam_width, max_depth=max_depth),
+            memory_bias=memory_bias,
+        ).search(expand)
+
     def run_offline_consolidation(self, *, trigger_source: str = "operator_cli") -> ConsolidationResult:
         return self.offline.consolidate(trigger_source=trigger_source)
 
@@ -237,11 +531,12 @@ class OpenClawRuntime:
         rc_conflict_score: float | None = None,
         rc_signals: RCConflictSignals | None = None,
         llm_role: str = "rollout",
-        model_call_id: str = "local-model-call",
-        prompt_hash: str = "local-prompt-hash",
+        model_call_id: str = DEFAULT_MODEL_CALL_ID,
+        prompt_hash: str = DEFAULT_PROMPT_HASH,
         input_provenance: tuple[str, ...] = (),
         trajectory_reference: str = "local-trajectory",
         consent_token: ConsentToken | None = None,
+        session_id: str | None = None,
     ) -> ProposalCycleResult:
         return self.run_cycle(
             ProposalCycleInput(
@@ -259,5 +554,6 @@ class OpenClawRuntime:
                 input_provenance=input_provenance,
                 trajectory_reference=trajectory_reference,
                 consent_token=consent_token,
+                session_id=session_id,
             )
         )
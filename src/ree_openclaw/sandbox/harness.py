@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import mmap
 import subprocess
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Sequence
+from typing import Iterable, Iterator, Mapping, Sequence
+
+BinaryData = bytes | bytearray | memoryview
 
 
 @dataclass(frozen=True)
 class SandboxPolicy:
     allowed_commands: tuple[str, ...] = ("echo", "python3")
     max_runtime_seconds: int = 5
+    io_chunk_size: int = 1024 * 1024
 
 
 @dataclass(frozen=True)
@@ -42,6 +47,80 @@ class SandboxedExecutor:
         source = self._resolve(relative_path)
         return source.read_text(encoding="utf-8")
 
+    def write_bytes(self, relative_path: str, content: BinaryData) -> Path:
+        destination = self._resolve(relative_path)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with destination.open("wb") as handle:
+            handle.write(memoryview(content))
+        return destination
+
+    def read_bytes(self, relative_path: str) -> bytes:
+        source = self._resolve(relative_path)
+        return source.read_bytes()
+
+    def write_chunks(self, relative_path: str, chunks: Iterable[BinaryData]) -> Path:
+        """Stream chunks into a sandbox file without joining them in memory."""
+        destination = self._resolve(relative_path)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with destination.open("wb") as handle:
+            for chunk in chunks:
+                handle.write(memoryview(chunk))
+        return destination
+
+    def iter_chunks(self, relative_path: str, chunk_size: int | None = None) -> Iterator[bytes]:
+        """Stream a sandbox file in `chunk_size` pieces (default `policy.io_chunk_size`).
+
+        The size and path are checked when this is called, not on first iteration.
+        """
+        size = self.policy.io_chunk_size if chunk_size is None else chunk_size
+        if size <= 0:
+            raise ValueError("chunk_size must be positive")
+        return self._read_chunks(self._resolve(relative_path), size)
+
+    @staticmethod
+    def _read_chunks(source: Path, size: int) -> Iterator[bytes]:
+        with source.open("rb") as handle:
+            while True:
+                chunk = handle.read(size)
+                if not chunk:
+                    return
+                yield chunk
+
+    @contextmanager
+    def map_bytes(self, relative_path: str) -> Iterator[memoryview]:
+        """Expose a read-only memory map of a sandbox file.
+
+        The view is released when the context exits; slices taken from it must
+        not outlive the block.
+        """
+        source = self._resolve(relative_path)
+        with source.open("rb") as handle:
+            if source.stat().st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def write_many(self, files: Mapping[str, str | BinaryData]) -> tuple[Path, ...]:
+        """Write several files after checking every destination stays in the sandbox."""
+        resolved = [
+            (self._resolve(relative_path), content) for relative_path, content in files.items()
+        ]
+        written: list[Path] = []
+        for destination, content in resolved:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, str):
+                destination.write_text(content, encoding="utf-8")
+            else:
+                with destination.open("wb") as handle:
+                    handle.write(memoryview(content))
+            written.append(destination)
+        return tuple(written)
+
     def run(self, command: Sequence[str], timeout: int | None = None) -> SandboxResult:
         if not command:
             raise ValueError("command cannot be empty")
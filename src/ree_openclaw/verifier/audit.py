@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any
+
+from ree_openclaw.ledger.codec import (
+    BINARY_MAGIC,
+    RECORD_FORMATS,
+    detect_record_format,
+    encode_binary_record,
+    encode_json_line,
+)
+
+
+class AuditLogWriter:
+    """Persistent writer for verifier audit records (JSONL or framed binary).
+
+    The file handle stays open across records. In durable mode every record is
+    flushed and fsynced before `write` returns; otherwise records are buffered
+    and written once `flush_interval_seconds` has elapsed since the last flush
+    (0 writes through on every record). A flush thread also writes buffered
+    records every interval, so they reach disk during quiet periods without
+    waiting for the next record. Rotation happens by size and/or age,
+    keeping `backup_count` numbered backups (`audit.jsonl.1` is the newest).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        durable: bool = False,
+        flush_interval_seconds: float = 0.0,
+        max_bytes: int | None = None,
+        rotate_interval_seconds: float | None = None,
+        backup_count: int = 5,
+        record_format: str = "json",
+    ) -> None:
+        if record_format not in RECORD_FORMATS:
+            raise ValueError(f"unknown audit record format: {record_format!r}")
+        if flush_interval_seconds < 0.0:
+            raise ValueError("flush_interval_seconds cannot be negative")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if rotate_interval_seconds is not None and rotate_interval_seconds <= 0.0:
+            raise ValueError("rotate_interval_seconds must be positive")
+        if backup_count < 0:
+            raise ValueError("backup_count cannot be negative")
+        self.path = path
+        self.durable = durable
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_bytes = max_bytes
+        self.rotate_interval_seconds = rotate_interval_seconds
+        self.backup_count = backup_count
+        self.record_format = record_format
+        self._lock = threading.Lock()
+        self._handle: IO[bytes] | None = None
+        self._buffer: list[bytes] = []
+        self._size = 0
+        self._opened_at = 0.0
+        self._last_flush = 0.0
+        self._flusher: threading.Thread | None = None
+        self._flusher_stop = threading.Event()
+
+    def write(self, record: dict[str, Any]) -> None:
+        if self.record_format == "binary":
+            data = encode_binary_record(record)
+        else:
+            data = encode_json_line(record)
+        with self._lock:
+            if self._handle is None:
+                self._open()
+                self._start_flusher()
+            elif self._should_rotate(len(data)):
+                self._rotate()
+            self._buffer.append(data)
+            self._size += len(data)
+            now = time.monotonic()
+            if self.durable or now - self._last_flush >= self.flush_interval_seconds:
+                self._flush_locked(fsync=self.durable)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked(fsync=self.durable)
+
+    def close(self) -> None:
+        with self._lock:
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._flusher_stop.set()
+            flusher.join()
+        with self._lock:
+            if self._handle is None:
+                return
+            self._flush_locked(fsync=True)
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> AuditLogWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _start_flusher(self) -> None:
+        if self.durable or self.flush_interval_seconds == 0.0 or self._flusher is not None:
+            return
+        self._flusher_stop = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(self._flusher_stop,),
+            name="ree-openclaw-audit-flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _flush_periodically(self, stop: threading.Event) -> None:
+        while not stop.wait(self.flush_interval_seconds):
+            with self._lock:
+                if self._buffer:
+                    self._flush_locked(fsync=False)
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            existing_format = detect_record_format(self.path)
+            if existing_format not in {None, self.record_format}:
+                raise ValueError(
+                    f"audit log {self.path} is {existing_format!r}, not {self.record_format!r}"
+                )
+        self._handle = self.path.open("ab")
+        if self.record_format == "binary" and self._handle.tell() == 0:
+            self._handle.write(BINARY_MAGIC)
+        self._size = self._handle.tell()
+        self._opened_at = time.monotonic()
+        self._last_flush = self._opened_at
+
+    def _should_rotate(self, incoming_bytes: int) -> bool:
+        if self._size <= (len(BINARY_MAGIC) if self.record_format == "binary" else 0):
+            return False
+        if self.max_bytes is not None and self._size + incoming_bytes > self.max_bytes:
+            return True
+        return (
+            self.rotate_interval_seconds is not None
+            and time.monotonic() - self._opened_at >= self.rotate_interval_seconds
+        )
+
+    def _rotate(self) -> None:
+        self._flush_locked(fsync=self.durable)
+        assert self._handle is not None
+        self._handle.close()
+        self._handle = None
+        if self.backup_count == 0:
+            self.path.unlink(missing_ok=True)
+        else:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self._backup_path(index)
+                if source.exists():
+                    os.replace(source, self._backup_path(index + 1))
+            os.replace(self.path, self._backup_path(1))
+        self._open()
+
+    def _backup_path(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{index}")
+
+    def _flush_locked(self, *, fsync: bool) -> None:
+        if self._handle is None:
+            return
+        if self._buffer:
+            self._handle.write(b"".join(self._buffer))
+            self._buffer.clear()
+        self._handle.flush()
+        if fsync:
+            os.fsync(self._handle.fileno())
+        self._last_flush = time.monotonic()
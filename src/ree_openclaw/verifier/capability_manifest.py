@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Iterable
 
 from ree_openclaw.types import EffectClass
+from ree_openclaw.verifier.scopes import ScopeIndex
+
+COMPILED_MANIFEST_FORMAT = "ree_openclaw.compiled_capabilities.v1"
 
 
 @dataclass(frozen=True)
@@ -17,8 +23,121 @@ class Capability:
     provenance_bindings: tuple[str, ...]
 
 
+@dataclass(frozen=True)
+class CompiledCapability:
+    action_class: str
+    effect_class: EffectClass
+    requires_consent: bool
+    allowed_scopes: frozenset[str]
+    required_verifier_mask: int
+    provenance_bindings: tuple[str, ...]
+    scope_index: ScopeIndex = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "scope_index", ScopeIndex(self.allowed_scopes))
+
+
+@dataclass(frozen=True)
+class CompiledManifest:
+    """Lookup-table form of a capability manifest.
+
+    Verifier labels are assigned one bit each so required-verifier coverage is a
+    single mask test instead of per-label membership checks.
+    """
+
+    verifier_labels: tuple[str, ...]
+    capabilities: dict[str, CompiledCapability]
+    source_sha256: str | None = None
+    verifier_bits: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "verifier_bits",
+            {label: 1 << bit for bit, label in enumerate(self.verifier_labels)},
+        )
+
+    def verifier_mask(self, labels: Iterable[str]) -> int:
+        bits = self.verifier_bits
+        mask = 0
+        for label in labels:
+            mask |= bits.get(label, 0)
+        return mask
+
+    def to_capabilities(self) -> dict[str, Capability]:
+        return {
+            action_class: Capability(
+                action_class=compiled.action_class,
+                effect_class=compiled.effect_class,
+                requires_consent=compiled.requires_consent,
+                allowed_scopes=tuple(sorted(compiled.allowed_scopes)),
+                required_verifiers=tuple(
+                    label
+                    for bit, label in enumerate(self.verifier_labels)
+                    if compiled.required_verifier_mask & (1 << bit)
+                ),
+                provenance_bindings=compiled.provenance_bindings,
+            )
+            for action_class, compiled in self.capabilities.items()
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": COMPILED_MANIFEST_FORMAT,
+            "source_sha256": self.source_sha256,
+            "verifier_labels": list(self.verifier_labels),
+            "capabilities": [
+                {
+                    "action_class": compiled.action_class,
+                    "effect_class": compiled.effect_class.value,
+                    "requires_consent": compiled.requires_consent,
+                    "allowed_scopes": sorted(compiled.allowed_scopes),
+                    "required_verifier_mask": compiled.required_verifier_mask,
+                    "provenance_bindings": list(compiled.provenance_bindings),
+                }
+                for compiled in self.capabilities.values()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CompiledManifest:
+        if data.get("format") != COMPILED_MANIFEST_FORMAT:
+            raise ValueError(f"unsupported compiled manifest format: {data.get('format')!r}")
+        verifier_labels = tuple(sys.intern(label) for label in data["verifier_labels"])
+        full_mask = (1 << len(verifier_labels)) - 1
+        capabilities: dict[str, CompiledCapability] = {}
+        for item in data.get("capabilities", []):
+            mask = int(item["required_verifier_mask"])
+            if mask < 0 or mask & ~full_mask:
+                raise ValueError(
+                    f"verifier mask out of range for action_class={item['action_class']!r}"
+                )
+            compiled = CompiledCapability(
+                action_class=sys.intern(item["action_class"]),
+                effect_class=EffectClass(item["effect_class"]),
+                requires_consent=bool(item["requires_consent"]),
+                allowed_scopes=frozenset(sys.intern(scope) for scope in item["allowed_scopes"]),
+                required_verifier_mask=mask,
+                provenance_bindings=tuple(
+                    sys.intern(binding) for binding in item["provenance_bindings"]
+                ),
+            )
+            capabilities[compiled.action_class] = compiled
+        return cls(
+            verifier_labels=verifier_labels,
+            capabilities=capabilities,
+            source_sha256=data.get("source_sha256"),
+        )
+
+
 def load_capabilities(path: Path) -> dict[str, Capability]:
     data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("format") == COMPILED_MANIFEST_FORMAT:
+        raise ValueError(f"{path} is a compiled manifest; use load_manifest")
+    return _capabilities_from_dict(data)
+
+
+def _capabilities_from_dict(data: dict[str, Any]) -> dict[str, Capability]:
     capabilities: dict[str, Capability] = {}
     for item in data.get("capabilities", []):
         capability = Capability(
@@ -32,3 +151,69 @@ def load_capabilities(path: Path) -> dict[str, Capability]:
         capabilities[capability.action_class] = capability
     return capabilities
 
+
+def compile_capabilities(
+    capabilities: dict[str, Capability],
+    *,
+    source_sha256: str | None = None,
+) -> CompiledManifest:
+    verifier_labels: list[str] = []
+    verifier_bits: dict[str, int] = {}
+    for capability in capabilities.values():
+        for label in capability.required_verifiers:
+            if label not in verifier_bits:
+                verifier_bits[label] = 1 << len(verifier_labels)
+                verifier_labels.append(sys.intern(label))
+
+    compiled: dict[str, CompiledCapability] = {}
+    for capability in capabilities.values():
+        mask = 0
+        for label in capability.required_verifiers:
+            mask |= verifier_bits[label]
+        action_class = sys.intern(capability.action_class)
+        compiled[action_class] = CompiledCapability(
+            action_class=action_class,
+            effect_class=capability.effect_class,
+            requires_consent=capability.requires_consent,
+            allowed_scopes=frozenset(sys.intern(scope) for scope in capability.allowed_scopes),
+            required_verifier_mask=mask,
+            provenance_bindings=tuple(
+                sys.intern(binding) for binding in capability.provenance_bindings
+            ),
+        )
+    return CompiledManifest(
+        verifier_labels=tuple(verifier_labels),
+        capabilities=compiled,
+        source_sha256=source_sha256,
+    )
+
+
+def compile_manifest_file(source_path: Path, output_path: Path) -> CompiledManifest:
+    source_sha256 = hashlib.sha256(source_path.read_bytes()).hexdigest()
+    compiled = compile_capabilities(
+        load_capabilities(source_path),
+        source_sha256=source_sha256,
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(
+        json.dumps(compiled.to_dict(), sort_keys=True, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    return compiled
+
+
+def load_compiled_manifest(path: Path) -> CompiledManifest:
+    return CompiledManifest.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def load_manifest(path: Path) -> dict[str, Capability] | CompiledManifest:
+    """Load either a source manifest or its compiled form."""
+    return parse_manifest(path.read_bytes())
+
+
+def parse_manifest(raw: bytes) -> dict[str, Capability] | CompiledManifest:
+    """Parse manifest file contents, either a source manifest or its compiled form."""
+    data = json.loads(raw.decode("utf-8"))
+    if data.get("format") == COMPILED_MANIFEST_FORMAT:
+        return CompiledManifest.from_dict(data)
+    return _capabilities_from_dict(data)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from pathlib import Path
+
+from ree_openclaw.ledger.append_only import AppendOnlyLedger
+from ree_openclaw.verifier.capability_manifest import (
+    compile_capabilities,
+    parse_manifest,
+)
+from ree_openclaw.verifier.verifier import CapabilityVerifier
+
+
+class ManifestReloader:
+    """Poll a capability manifest and swap it into a live verifier.
+
+    Parsing and compiling happen on the polling thread; the verifier only sees a
+    single attribute swap, so in-flight verifications finish on the table they
+    started with. A manifest that fails to load leaves the current table active.
+    Any other error raised while polling is kept in `last_error` and polling
+    continues.
+    """
+
+    def __init__(
+        self,
+        verifier: CapabilityVerifier,
+        manifest_path: Path,
+        *,
+        ledger: AppendOnlyLedger | None = None,
+        poll_interval_seconds: float = 1.0,
+    ) -> None:
+        if poll_interval_seconds <= 0.0:
+            raise ValueError("poll_interval_seconds must be positive")
+        self.verifier = verifier
+        self.manifest_path = manifest_path
+        self.ledger = ledger
+        self.poll_interval_seconds = poll_interval_seconds
+        self._fingerprint = self._stat_fingerprint()
+        raw = self._read_manifest()
+        self._digest = hashlib.sha256(raw).hexdigest() if raw is not None else None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.last_error: Exception | None = None
+
+    def check_once(self) -> bool:
+        """Reload if the manifest changed on disk. Returns True when a swap happened."""
+        with self._lock:
+            fingerprint = self._stat_fingerprint()
+            if fingerprint == self._fingerprint:
+                return False
+            self._fingerprint = fingerprint
+            # The digest and the parsed table come from the same read, so a write
+            # racing the poll cannot pair one version's hash with another's rules.
+            raw = self._read_manifest()
+            digest = hashlib.sha256(raw).hexdigest() if raw is not None else None
+            if digest == self._digest:
+                return False
+            try:
+                if raw is None:
+                    raise FileNotFoundError(f"manifest unreadable: {self.manifest_path}")
+                loaded = parse_manifest(raw)
+                compiled = (
+                    loaded
+                    if not isinstance(loaded, dict)
+                    else compile_capabilities(loaded, source_sha256=digest)
+                )
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                self._log(
+                    {
+                        "event": "capability_manifest_reload_failed",
+                        "manifest_path": str(self.manifest_path),
+                        "manifest_sha256": digest,
+                        "error": f"{type(exc).__name__}: {exc}",
+                    }
+                )
+                return False
+            previous_digest = self._digest
+            self.verifier.capabilities = compiled
+            self._digest = digest
+            self._log(
+                {
+                    "event": "capability_manifest_reloaded",
+                    "manifest_path": str(self.manifest_path),
+                    "manifest_sha256": digest,
+                    "previous_manifest_sha256": previous_digest,
+                    "action_classes": sorted(compiled.capabilities),
+                }
+            )
+            return True
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._poll_loop,
+            name="ree-openclaw-manifest-reloader",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.poll_interval_seconds):
+            try:
+                self.check_once()
+            except Exception as exc:
+                self.last_error = exc
+
+    def _stat_fingerprint(self) -> tuple[int, int] | None:
+        try:
+            stat = self.manifest_path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_manifest(self) -> bytes | None:
+        try:
+            return self.manifest_path.read_bytes()
+        except OSError:
+            return None
+
+    def _log(self, payload: dict[str, object]) -> None:
+        if self.ledger is not None:
+            self.ledger.append_async(payload)
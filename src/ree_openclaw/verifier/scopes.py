@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+_SEPARATOR_PATTERN = re.compile(r"([:/])")
+_SINGLE_SEGMENT = "*"
+_ANY_DEPTH = "**"
+
+
+def split_scope(scope: str) -> tuple[str, ...]:
+    """Split a scope into segments, keeping `:` and `/` separators as tokens."""
+    return tuple(token for token in _SEPARATOR_PATTERN.split(scope) if token)
+
+
+class _ScopeNode:
+    __slots__ = ("children", "single", "terminal", "any_depth")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _ScopeNode] = {}
+        self.single: _ScopeNode | None = None
+        self.terminal = False
+        self.any_depth = False
+
+
+class ScopeIndex:
+    """Segment trie over allowed-scope patterns.
+
+    Pattern segments are literal, `*` (exactly one segment) or a trailing `**`
+    (one or more further tokens). Matching walks the scope once, so cost grows
+    with scope depth rather than the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        literals: set[str] = set()
+        self._root: _ScopeNode | None = None
+        for pattern in patterns:
+            tokens = split_scope(pattern)
+            if not any(_SINGLE_SEGMENT in token for token in tokens):
+                literals.add(pattern)
+                continue
+            self._insert(pattern, tokens)
+        self._literals = frozenset(literals)
+
+    def matches(self, scope: str) -> bool:
+        if scope in self._literals:
+            return True
+        if self._root is None or _SINGLE_SEGMENT in scope:
+            return False
+        tokens = split_scope(scope)
+        active = [self._root]
+        for token in tokens:
+            following: list[_ScopeNode] = []
+            is_separator = token in {":", "/"}
+            for node in active:
+                if node.any_depth and not is_separator:
+                    return True
+                child = node.children.get(token)
+                if child is not None:
+                    following.append(child)
+                if node.single is not None and not is_separator:
+                    following.append(node.single)
+            if not following:
+                return False
+            active = following
+        return any(node.terminal for node in active)
+
+    def _insert(self, pattern: str, tokens: tuple[str, ...]) -> None:
+        if self._root is None:
+            self._root = _ScopeNode()
+        node = self._root
+        for position, token in enumerate(tokens):
+            if token == _ANY_DEPTH:
+                if position != len(tokens) - 1 or position == 0:
+                    raise ValueError(
+                        f"'**' must be the final segment of a scope pattern: {pattern!r}"
+                    )
+                node.any_depth = True
+                return
+            if token == _SINGLE_SEGMENT:
+                if node.single is None:
+                    node.single = _ScopeNode()
+                node = node.single
+                continue
+            if _SINGLE_SEGMENT in token:
+                raise ValueError(f"wildcards must span a whole scope segment: {pattern!r}")
+            node = node.children.setdefault(token, _ScopeNode())
+        node.terminal = True
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-import json
+import threading
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 
+from ree_openclaw.ledger.background import BackgroundWriter
 from ree_openclaw.rc.hysteresis import RCState
 from ree_openclaw.types import EffectClass
-from ree_openclaw.verifier.capability_manifest import Capability
+from ree_openclaw.verifier.audit import AuditLogWriter
+from ree_openclaw.verifier.capability_manifest import (
+    Capability,
+    CompiledManifest,
+    compile_capabilities,
+)
 
 
 @dataclass(frozen=True)
@@ -49,128 +58,247 @@ class VerificationDecision:
     strict_mode: bool
 
 
+@dataclass(frozen=True)
+class DecisionCacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+@dataclass(frozen=True)
+class _StaticDecision:
+    """Outcome of the request-independent part of the rule chain.
+
+    Depends only on (action_class, effect_class, scope, provided_verifiers, RC band);
+    consent tokens and provenance bindings are always checked live.
+    """
+
+    rejection: VerificationDecision | None
+    provenance_bindings: tuple[str, ...] = ()
+    requires_consent: bool = False
+    strict_mode: bool = False
+    lockdown_block: bool = False
+    destructive_block: bool = False
+
+
 class CapabilityVerifier:
     def __init__(
         self,
-        capabilities: dict[str, Capability],
+        capabilities: Mapping[str, Capability] | CompiledManifest,
         *,
         rc_high_threshold: float = 0.65,
         audit_log_path: Path | None = None,
+        audit_writer: AuditLogWriter | None = None,
+        audit_sink: BackgroundWriter | None = None,
+        decision_cache_size: int = 1024,
     ) -> None:
-        self.capabilities = capabilities
+        if decision_cache_size < 0:
+            raise ValueError("decision_cache_size cannot be negative")
+        if audit_writer is None and audit_log_path is not None:
+            audit_writer = AuditLogWriter(audit_log_path)
         self.rc_high_threshold = rc_high_threshold
-        self.audit_log_path = audit_log_path
+        self.audit_writer = audit_writer
+        self.audit_sink = audit_sink
+        self.audit_log_path = audit_writer.path if audit_writer is not None else None
+        self.decision_cache_size = decision_cache_size
+        self._static_cache: OrderedDict[tuple[object, ...], _StaticDecision] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self.capabilities = capabilities
+
+    @property
+    def capabilities(self) -> Mapping[str, Capability]:
+        """Read-only view of the active capabilities; assign a new mapping to change them.
+
+        Cached decisions are cleared only on assignment, so the view cannot be
+        edited in place.
+        """
+        return self._capabilities
+
+    @capabilities.setter
+    def capabilities(self, capabilities: Mapping[str, Capability] | CompiledManifest) -> None:
+        if isinstance(capabilities, CompiledManifest):
+            compiled = capabilities
+            snapshot = compiled.to_capabilities()
+        else:
+            snapshot = dict(capabilities)
+            compiled = compile_capabilities(snapshot)
+        with self._cache_lock:
+            self._capabilities = MappingProxyType(snapshot)
+            self._compiled = compiled
+            self._static_cache.clear()
+
+    @property
+    def compiled_manifest(self) -> CompiledManifest:
+        return self._compiled
 
     def verify(self, request: VerificationRequest) -> VerificationDecision:
-        capability = self.capabilities.get(request.action_class)
-        if capability is None:
-            decision = VerificationDecision(
-                allowed=False,
-                reason="unknown_action_class",
-                requires_consent=False,
-                strict_mode=False,
-            )
-            self._audit(request, decision)
-            return decision
+        static = self._static_decision(request)
+        if static.rejection is not None:
+            return self._decide(request, static.rejection)
 
-        if capability.effect_class != request.effect_class:
-            decision = VerificationDecision(
-                allowed=False,
-                reason="effect_class_mismatch",
-                requires_consent=False,
-                strict_mode=False,
+        missing_bindings = self._missing_provenance_bindings(
+            static.provenance_bindings, request.provenance
+        )
+        if missing_bindings:
+            return self._decide(
+                request,
+                VerificationDecision(
+                    allowed=False,
+                    reason="provenance_binding_missing",
+                    requires_consent=False,
+                    strict_mode=False,
+                ),
             )
-            self._audit(request, decision)
-            return decision
-
-        if request.scope not in capability.allowed_scopes:
-            decision = VerificationDecision(
-                allowed=False,
-                reason="scope_not_allowed",
-                requires_consent=False,
-                strict_mode=False,
+
+        if static.lockdown_block:
+            return self._decide(
+                request,
+                VerificationDecision(
+                    allowed=False,
+                    reason="lockdown_posture_block",
+                    requires_consent=static.requires_consent,
+                    strict_mode=True,
+                ),
             )
-            self._audit(request, decision)
-            return decision
-
-        provided_verifiers = set(request.provided_verifiers)
-        missing_verifiers = [
-            label for label in capability.required_verifiers if label not in provided_verifiers
-        ]
-        if missing_verifiers:
-            decision = VerificationDecision(
-                allowed=False,
-                reason="required_verifier_missing",
-                requires_consent=False,
-                strict_mode=False,
+
+        if static.requires_consent:
+            token = request.consent_token
+            if token is None or not token.is_valid_for(request.action_class, request.scope):
+                return self._decide(
+                    request,
+                    VerificationDecision(
+                        allowed=False,
+                        reason="consent_required",
+                        requires_consent=True,
+                        strict_mode=static.strict_mode,
+                    ),
+                )
+
+        if static.destructive_block:
+            return self._decide(
+                request,
+                VerificationDecision(
+                    allowed=False,
+                    reason="destructive_blocked_in_strict_mode",
+                    requires_consent=static.requires_consent,
+                    strict_mode=True,
+                ),
             )
-            self._audit(request, decision)
-            return decision
 
-        missing_bindings = self._missing_provenance_bindings(
-            capability.provenance_bindings, request.provenance
+        return self._decide(
+            request,
+            VerificationDecision(
+                allowed=True,
+                reason="allowed",
+                requires_consent=static.requires_consent,
+                strict_mode=static.strict_mode,
+            ),
         )
-        if missing_bindings:
-            decision = VerificationDecision(
-                allowed=False,
-                reason="provenance_binding_missing",
-                requires_consent=False,
-                strict_mode=False,
+
+    def decision_cache_info(self) -> DecisionCacheInfo:
+        """Static-decision cache statistics, in the style of `functools.lru_cache`."""
+        with self._cache_lock:
+            return DecisionCacheInfo(
+                hits=self._cache_hits,
+                misses=self._cache_misses,
+                maxsize=self.decision_cache_size,
+                currsize=len(self._static_cache),
             )
-            self._audit(request, decision)
-            return decision
 
+    def prime(self, request: VerificationRequest) -> None:
+        """Warm the static-decision cache for `request` without deciding or auditing."""
+        self._static_decision(request)
+
+    def _decide(
+        self, request: VerificationRequest, decision: VerificationDecision
+    ) -> VerificationDecision:
+        self._audit(request, decision)
+        return decision
+
+    def _static_decision(self, request: VerificationRequest) -> _StaticDecision:
         strict_mode = (
             request.rc_conflict_score >= self.rc_high_threshold
             or request.rc_state in {RCState.VERIFY, RCState.LOCKDOWN}
         )
-        requires_consent = capability.requires_consent or (
-            strict_mode and request.effect_class != EffectClass.NONE
+        lockdown = request.rc_state == RCState.LOCKDOWN
+        compiled = self._compiled
+        provided_mask = compiled.verifier_mask(request.provided_verifiers)
+        if self.decision_cache_size == 0:
+            return self._evaluate_static(request, strict_mode, lockdown, compiled, provided_mask)
+
+        key = (
+            request.action_class,
+            request.scope,
+            request.effect_class,
+            provided_mask,
+            strict_mode,
+            lockdown,
         )
+        with self._cache_lock:
+            if compiled is self._compiled:
+                cached = self._static_cache.get(key)
+                if cached is not None:
+                    self._cache_hits += 1
+                    self._static_cache.move_to_end(key)
+                    return cached
+                self._cache_misses += 1
 
-        if request.rc_state == RCState.LOCKDOWN and request.effect_class in {
-            EffectClass.PRIVILEGED,
-            EffectClass.DESTRUCTIVE,
-        }:
-            decision = VerificationDecision(
-                allowed=False,
-                reason="lockdown_posture_block",
-                requires_consent=requires_consent,
-                strict_mode=True,
-            )
-            self._audit(request, decision)
-            return decision
+        static = self._evaluate_static(request, strict_mode, lockdown, compiled, provided_mask)
+        with self._cache_lock:
+            # Drop results computed against a capability set swapped out meanwhile.
+            if compiled is self._compiled:
+                self._static_cache[key] = static
+                if len(self._static_cache) > self.decision_cache_size:
+                    self._static_cache.popitem(last=False)
+        return static
 
-        if requires_consent:
-            token = request.consent_token
-            if token is None or not token.is_valid_for(request.action_class, request.scope):
-                decision = VerificationDecision(
-                    allowed=False,
-                    reason="consent_required",
-                    requires_consent=True,
-                    strict_mode=strict_mode,
-                )
-                self._audit(request, decision)
-                return decision
-
-        if strict_mode and request.effect_class == EffectClass.DESTRUCTIVE:
-            decision = VerificationDecision(
-                allowed=False,
-                reason="destructive_blocked_in_strict_mode",
-                requires_consent=requires_consent,
-                strict_mode=True,
+    def _evaluate_static(
+        self,
+        request: VerificationRequest,
+        strict_mode: bool,
+        lockdown: bool,
+        compiled: CompiledManifest,
+        provided_mask: int,
+    ) -> _StaticDecision:
+        capability = compiled.capabilities.get(request.action_class)
+        if capability is None:
+            return _StaticDecision(rejection=self._static_rejection("unknown_action_class"))
+
+        if capability.effect_class != request.effect_class:
+            return _StaticDecision(rejection=self._static_rejection("effect_class_mismatch"))
+
+        if not capability.scope_index.matches(request.scope):
+            return _StaticDecision(rejection=self._static_rejection("scope_not_allowed"))
+
+        if capability.required_verifier_mask & ~provided_mask:
+            return _StaticDecision(
+                rejection=self._static_rejection("required_verifier_missing")
             )
-            self._audit(request, decision)
-            return decision
 
-        decision = VerificationDecision(
-            allowed=True,
-            reason="allowed",
+        requires_consent = capability.requires_consent or (
+            strict_mode and request.effect_class != EffectClass.NONE
+        )
+        return _StaticDecision(
+            rejection=None,
+            provenance_bindings=capability.provenance_bindings,
             requires_consent=requires_consent,
             strict_mode=strict_mode,
+            lockdown_block=lockdown
+            and request.effect_class in {EffectClass.PRIVILEGED, EffectClass.DESTRUCTIVE},
+            destructive_block=strict_mode and request.effect_class == EffectClass.DESTRUCTIVE,
+        )
+
+    @staticmethod
+    def _static_rejection(reason: str) -> VerificationDecision:
+        return VerificationDecision(
+            allowed=False,
+            reason=reason,
+            requires_consent=False,
+            strict_mode=False,
         )
-        self._audit(request, decision)
-        return decision
 
     @staticmethod
     def _missing_provenance_bindings(
@@ -194,7 +322,7 @@ class CapabilityVerifier:
         return missing
 
     def _audit(self, request: VerificationRequest, decision: VerificationDecision) -> None:
-        if self.audit_log_path is None:
+        if self.audit_writer is None:
             return
         record = {
             "timestamp": datetime.now(tz=timezone.utc).isoformat(),
@@ -209,6 +337,14 @@ class CapabilityVerifier:
             },
             "decision": asdict(decision),
         }
-        self.audit_log_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.audit_log_path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(record, sort_keys=True) + "\n")
+        if self.audit_sink is not None:
+            self.audit_sink.submit(self.audit_writer.write, record)
+            return
+        self.audit_writer.write(record)
+
+    def close(self) -> None:
+        if self.audit_writer is None:
+            return
+        if self.audit_sink is not None:
+            self.audit_sink.drain()
+        self.audit_writer.close()
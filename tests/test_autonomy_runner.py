@@ -1,3 +1,7 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -6,8 +10,15 @@ from ree_openclaw.agent.autonomy import (
     AutonomousCandidatePlan,
     AutonomousPolicy,
     AutonomousSessionRunner,
+    AutonomousSessionState,
     AutonomousStep,
+    autonomy_step_provenance,
 )
+from ree_openclaw.agent.executor import AutonomousSessionExecutor, AutonomousSessionSpec
+from ree_openclaw.agent.memory import AutonomousSessionMemoryStore
+from ree_openclaw.agent.replay import AutonomousSessionReplayer
+from ree_openclaw.rc.hysteresis import RCState
+from ree_openclaw.rc.scoring import RCConflictSignals
 from ree_openclaw.runtime.pipeline import OpenClawRuntime
 from ree_openclaw.types import EffectClass
 
@@ -281,3 +292,561 @@ def test_autonomy_persists_session_memory_and_replay_keeps_verifier_guards(
     step_records = [entry for entry in entries if entry.get("event") == "step_recorded"]
     assert len(session_started) >= 2
     assert len(step_records) >= 2
+
+
+def test_memory_bias_table_updates_incrementally_and_tracks_external_writes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "memory.jsonl"
+    store = AutonomousSessionMemoryStore(path)
+    other_writer = AutonomousSessionMemoryStore(path)
+
+    def record(writer: AutonomousSessionMemoryStore, reference: str, allowed: bool) -> None:
+        writer.append_step_record(
+            session_id="s",
+            step_index=0,
+            user_intent="intent",
+            selected_trajectory_reference=reference,
+            selected_ranking_score=0.5,
+            memory_bias_applied=0.0,
+            action_class="WRITE_FILE",
+            scope="workspace:project",
+            effect_class="reversible",
+            allowed=allowed,
+            reason="allowed" if allowed else "consent_required",
+            rc_state="NORMAL",
+            rc_conflict_score=0.0,
+            commit_id=None,
+        )
+
+    assert store.trajectory_bias("traj/a") == 0.0
+    record(store, "traj/a", True)
+    table = store.trajectory_bias_table()
+    assert table["traj/a"] == 0.05
+    record(store, "traj/a", False)
+    record(store, "traj/b", False)
+    assert table["traj/a"] == 0.0
+    assert table["traj/b"] == -0.05
+
+    # External appends are indexed from where the index left off, never by a full re-read.
+    monkeypatch.setattr(store, "read_all", lambda: pytest.fail("memory file was re-read"))
+    other_writer.start_session(goal_text="external", policy_snapshot={})
+    record(other_writer, "traj/b", True)
+    record(other_writer, "traj/b", True)
+    assert store.trajectory_bias("traj/b") == pytest.approx(0.05 / 3)
+    record(store, "traj/a", True)
+    summary = store.summarize()
+    assert summary.trajectory_bias == dict(store.trajectory_bias_table())
+    assert summary.trajectory_bias["traj/a"] == pytest.approx(0.05 / 3)
+    assert (summary.total_sessions, summary.total_step_records) == (1, 6)
+
+    path.write_text("", encoding="utf-8")
+    assert store.summarize().total_step_records == 0
+    assert dict(store.trajectory_bias_table()) == {}
+
+
+def test_session_executor_runs_sessions_concurrently_with_per_session_budgets(
+    tmp_path: Path,
+) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    runner = AutonomousSessionRunner(runtime, speculative_planning=True)
+    executor = AutonomousSessionExecutor(runner, max_concurrency=3, max_active_sessions=4)
+    # The caller's runner keeps its own speculation pool size.
+    assert runner.speculation_workers == 1
+
+    def step(name: str) -> AutonomousStep:
+        return AutonomousStep(
+            user_intent=f"Run {name}",
+            candidates=(
+                AutonomousCandidatePlan(
+                    proposal_text=f"Candidate {name}",
+                    action_class="WRITE_FILE",
+                    scope="workspace:project",
+                    effect_class=EffectClass.REVERSIBLE,
+                    command=("echo", name),
+                    trajectory_reference=f"exec/{name}",
+                ),
+            ),
+        )
+
+    specs = [
+        AutonomousSessionSpec(
+            goal_text=f"Session {number}",
+            steps=tuple(step(f"{number}-{index}") for index in range(3)),
+            policy=AutonomousPolicy(max_steps=3, max_command_count=1 + number % 3),
+        )
+        for number in range(6)
+    ]
+
+    results = executor.run_all(specs)
+
+    assert [result.goal_text for result in results] == [spec.goal_text for spec in specs]
+    for number, result in enumerate(results):
+        expected_steps = 1 + number % 3
+        assert result.steps_executed == expected_steps
+        assert [item.step_index for item in result.step_results] == list(range(expected_steps))
+    assert len({result.session_id for result in results}) == 6
+
+    entries = runtime.ledger.read_all()
+    assert len(entries) == sum(result.steps_executed for result in results)
+    assert runtime.ledger.verify_chain()
+    memory_records = runner.memory.read_all()
+    finished = [entry for entry in memory_records if entry["event"] == "session_finished"]
+    assert len(finished) == 6
+    assert runner.speculation_workers == 1
+    assert not any(
+        thread.name.startswith("autonomy-speculation") for thread in threading.enumerate()
+    )
+    for result in results:
+        session_steps = [
+            entry["step_index"]
+            for entry in memory_records
+            if entry["event"] == "step_recorded" and entry["session_id"] == result.session_id
+        ]
+        assert session_steps == list(range(result.steps_executed))
+
+
+def test_replay_rebuilds_session_decisions_without_executing(tmp_path: Path) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    runner = AutonomousSessionRunner(runtime)
+
+    def plan(name: str, effect_class: EffectClass = EffectClass.REVERSIBLE) -> AutonomousStep:
+        privileged = effect_class == EffectClass.PRIVILEGED
+        return AutonomousStep(
+            user_intent=f"Run {name}",
+            candidates=(
+                AutonomousCandidatePlan(
+                    proposal_text=f"Candidate {name}",
+                    action_class="SEND_EMAIL" if privileged else "WRITE_FILE",
+                    scope="mailbox:primary" if privileged else "workspace:project",
+                    effect_class=effect_class,
+                    command=("echo", name),
+                    trajectory_reference=f"replay/{name}",
+                ),
+            ),
+        )
+
+    result = runner.run(
+        goal_text="Replay me.",
+        steps=(plan("a"), plan("b"), plan("c", EffectClass.PRIVILEGED)),
+        policy=AutonomousPolicy(max_steps=3, stop_on_reject=True),
+    )
+    assert result.stopped_reason == "rejected_step"
+    ledger_size = runtime.ledger.path.stat().st_size
+
+    replayer = AutonomousSessionReplayer(runtime, memory_store=runner.memory)
+    replay = replayer.replay(result.session_id)
+
+    assert replay.matches_recording
+    assert [step.trajectory_reference for step in replay.steps] == [
+        "replay/a",
+        "replay/b",
+        "replay/c",
+    ]
+    assert [step.decision.reason for step in replay.steps] == [
+        item.cycle_result.verification.reason for item in result.step_results
+    ]
+    assert replay.recorded_stopped_reason == "rejected_step"
+    assert replayer.replay(result.session_id, until_step=1).steps[-1].step_index == 1
+    assert runtime.ledger.path.stat().st_size == ledger_size
+
+    tampered = [dict(entry) for entry in runner.memory.read_all()]
+    for entry in tampered:
+        if entry.get("event") == "step_recorded" and entry["step_index"] == 1:
+            entry["rc_conflict_score"] = 0.95
+    tampered_store = AutonomousSessionMemoryStore(tmp_path / "tampered.jsonl")
+    tampered_store.path.write_text(
+        "".join(json.dumps(entry) + "\n" for entry in tampered), encoding="utf-8"
+    )
+    diverged = AutonomousSessionReplayer(runtime, memory_store=tampered_store).replay(
+        result.session_id
+    )
+    assert not diverged.matches_recording
+    assert {item.field for item in diverged.divergences if item.step_index == 1} >= {
+        "rc_state",
+        "ledger.rc_state",
+    }
+
+
+def test_resume_continues_after_last_committed_step(tmp_path: Path) -> None:
+    def make_runner() -> AutonomousSessionRunner:
+        runtime = OpenClawRuntime.from_manifest(
+            manifest_path=_manifest_path(),
+            ledger_path=tmp_path / "ledger.jsonl",
+            sandbox_root=tmp_path / "sandbox",
+        )
+        return AutonomousSessionRunner(runtime)
+
+    steps = tuple(
+        AutonomousStep(
+            user_intent=f"Step {index}",
+            candidates=(
+                AutonomousCandidatePlan(
+                    proposal_text=f"Candidate {index}",
+                    action_class="WRITE_FILE",
+                    scope="workspace:project",
+                    effect_class=EffectClass.REVERSIBLE,
+                    command=("echo", f"resume_{index}"),
+                    trajectory_reference=f"resume/{index}",
+                ),
+            ),
+        )
+        for index in range(5)
+    )
+    crashed = make_runner()
+    state = crashed.begin_session(
+        goal_text="Survive a crash.",
+        steps=steps,
+        policy=AutonomousPolicy(max_steps=5, checkpoint_interval_steps=2),
+    )
+    assert crashed.run_step(state)
+    assert crashed.run_step(state)
+    # Step 2 reached the ledger but the process died before its memory record.
+    crashed.runtime.run_command_cycle(
+        user_text="Step 2",
+        proposal_text="Candidate 2",
+        action_class="WRITE_FILE",
+        scope="workspace:project",
+        effect_class=EffectClass.REVERSIBLE,
+        command=("echo", "resume_2"),
+        input_provenance=("autonomy-step-2",),
+        session_id=state.session_id,
+    )
+    checkpoints = [
+        entry
+        for entry in crashed.memory.session_records(state.session_id)
+        if entry["event"] == "session_checkpoint"
+    ]
+    assert [entry["next_step_index"] for entry in checkpoints] == [2]
+    assert checkpoints[0]["selected_trajectory_references"] == ["resume/0", "resume/1"]
+    # Session entries without a step tag do not count as completed steps.
+    crashed.runtime.ledger.append({"event": "operator_note", "session_id": state.session_id})
+
+    resumed = make_runner().resume(state.session_id, steps=steps)
+
+    assert resumed.resumed_steps == 3
+    assert resumed.steps_executed == 5
+    assert [item.step_index for item in resumed.step_results] == [3, 4]
+    assert resumed.stopped_reason == "completed"
+    session_entries = [
+        entry
+        for entry in crashed.runtime.ledger.read_all()
+        if entry["payload"].get("session_id") == state.session_id
+        and entry["payload"]["event"] == "commit_executed"
+    ]
+    assert [entry["payload"]["command"][1] for entry in session_entries] == [
+        f"resume_{index}" for index in range(5)
+    ]
+    finished = crashed.memory.session_records(state.session_id)[-1]
+    assert finished["event"] == "session_finished"
+    assert finished["steps_executed"] == 5
+    with pytest.raises(ValueError, match="already finished"):
+        make_runner().resume(state.session_id, steps=steps)
+
+
+def test_resume_without_checkpoints_keeps_the_spent_wall_clock_budget(tmp_path: Path) -> None:
+    def make_runner() -> AutonomousSessionRunner:
+        runtime = OpenClawRuntime.from_manifest(
+            manifest_path=_manifest_path(),
+            ledger_path=tmp_path / "ledger.jsonl",
+            sandbox_root=tmp_path / "sandbox",
+        )
+        return AutonomousSessionRunner(runtime)
+
+    steps = tuple(
+        AutonomousStep(
+            user_intent=f"Step {index}",
+            candidates=(
+                AutonomousCandidatePlan(
+                    proposal_text=f"Candidate {index}",
+                    action_class="WRITE_FILE",
+                    scope="workspace:project",
+                    effect_class=EffectClass.REVERSIBLE,
+                    command=("echo", f"budget_{index}"),
+                    trajectory_reference=f"budget/{index}",
+                ),
+            ),
+        )
+        for index in range(3)
+    )
+    crashed = make_runner()
+    state = crashed.begin_session(
+        goal_text="Spend most of the budget, then crash.",
+        steps=steps,
+        policy=AutonomousPolicy(max_steps=3, max_wall_clock_seconds=600.0),
+    )
+    assert crashed.run_step(state)
+    # Backdate the session start: step 0 finished 15 minutes into a 10 minute budget.
+    records = crashed.memory.read_all()
+    started = next(item for item in records if item["event"] == "session_started")
+    started["timestamp"] = (
+        datetime.fromisoformat(started["timestamp"]) - timedelta(minutes=15)
+    ).isoformat()
+    crashed.memory.path.write_text(
+        "".join(json.dumps(item) + "\n" for item in records), encoding="utf-8"
+    )
+
+    resumed = make_runner().resume(state.session_id, steps=steps)
+
+    assert resumed.resumed_steps == 1
+    assert resumed.step_results == ()
+    assert resumed.stopped_reason == "max_wall_clock_reached"
+
+
+def test_iter_run_streams_step_results_and_compacts_retained_copies(tmp_path: Path) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    runner = AutonomousSessionRunner(runtime)
+    steps = tuple(
+        AutonomousStep(
+            user_intent=f"Step {index}",
+            candidates=(
+                AutonomousCandidatePlan(
+                    proposal_text=f"Candidate {index}",
+                    action_class="WRITE_FILE",
+                    scope="workspace:project",
+                    effect_class=EffectClass.REVERSIBLE,
+                    command=("echo", f"stream_{index}"),
+                    trajectory_reference=f"stream/{index}",
+                ),
+            ),
+        )
+        for index in range(3)
+    )
+
+    stream = runner.iter_run(goal_text="Stream.", steps=steps, compact_results=True)
+    streamed = []
+    for step_result in stream:
+        assert stream.result is None
+        assert step_result.cycle_result.execution_result.stdout.strip() == (
+            f"stream_{step_result.step_index}"
+        )
+        streamed.append(step_result.step_index)
+
+    assert streamed == [0, 1, 2]
+    assert stream.result is not None
+    assert stream.result.stopped_reason == "completed"
+    assert stream.result.steps_executed == 3
+    retained = stream.result.step_results[0].cycle_result
+    assert retained.execution_result.stdout == ""
+    assert retained.execution_result.returncode == 0
+    assert set(retained.ledger_entry) == {"index", "timestamp", "entry_hash"}
+
+    async def consume() -> tuple[list[int], str]:
+        async_stream = runner.iter_run(goal_text="Stream async.", steps=steps[:2])
+        indices = [item.step_index async for item in async_stream]
+        assert async_stream.result is not None
+        return indices, async_stream.result.stopped_reason
+
+    assert asyncio.run(consume()) == ([0, 1], "completed")
+
+
+def _speculation_steps() -> tuple[AutonomousStep, ...]:
+    # Step 0 moves the lane to VERIFY; step 1 keeps it there, so step 1's decision
+    # is only primed correctly if step 0's own transition is predicted.
+    return (
+        AutonomousStep(
+            user_intent="Write",
+            candidates=(
+                AutonomousCandidatePlan(
+                    proposal_text="Write under conflict.",
+                    action_class="WRITE_FILE",
+                    scope="workspace:project",
+                    effect_class=EffectClass.REVERSIBLE,
+                    command=("echo", "spec_0"),
+                    trajectory_reference="spec/0",
+                    rc_signals=RCConflictSignals(
+                        provenance_mismatch=1.0,
+                        identity_capability_inconsistency=1.0,
+                        temporal_discontinuity=1.0,
+                    ),
+                ),
+            ),
+        ),
+        AutonomousStep(
+            user_intent="Read",
+            candidates=(
+                AutonomousCandidatePlan(
+                    proposal_text="Read back.",
+                    action_class="READ_FILE",
+                    scope="workspace:readonly",
+                    effect_class=EffectClass.NONE,
+                    command=("echo", "spec_1"),
+                    trajectory_reference="spec/1",
+                    rc_signals=RCConflictSignals(
+                        provenance_mismatch=1.0,
+                        identity_capability_inconsistency=0.5,
+                    ),
+                ),
+            ),
+        ),
+    )
+
+
+def _run_speculative_steps(
+    monkeypatch: pytest.MonkeyPatch,
+    runner: AutonomousSessionRunner,
+    *,
+    reset_rc_after_first_step: bool = False,
+) -> tuple[AutonomousSessionState, int, int]:
+    runtime = runner.runtime
+    state = runner.begin_session(
+        goal_text="Speculate.",
+        steps=_speculation_steps(),
+        policy=AutonomousPolicy(max_steps=2, stop_on_reject=False),
+    )
+    append_step_record = runner.memory.append_step_record
+
+    def record_after_prefetch(**kwargs):
+        # Runs once step 0's cycle is done; its prefetch was submitted before the cycle.
+        assert state.prefetched is not None
+        state.prefetched[1].result(timeout=5)
+        if reset_rc_after_first_step:
+            runtime.rc_lanes.set_state(state.session_id, RCState.NORMAL)
+        return append_step_record(**kwargs)
+
+    monkeypatch.setattr(runner.memory, "append_step_record", record_after_prefetch)
+    assert runner.run_step(state)
+    primed = runtime.verifier.decision_cache_info()
+    monkeypatch.setattr(runner.memory, "append_step_record", append_step_record)
+    assert not runner.run_step(state)
+    after = runtime.verifier.decision_cache_info()
+    return state, primed.currsize, after.hits - primed.hits
+
+
+def test_speculative_planning_primes_next_step_in_its_predicted_rc_band(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    runner = AutonomousSessionRunner(runtime, speculative_planning=True)
+    state, cached_after_first_step, step_one_hits = _run_speculative_steps(monkeypatch, runner)
+    result = runner.finish_session(state)
+
+    assert [item.cycle_result.rc_state.value for item in result.step_results] == [
+        "VERIFY",
+        "VERIFY",
+    ]
+    assert state.prefetched_steps == 1
+    # Step 0's own decision plus the one primed for step 1, which step 1 then hit.
+    assert cached_after_first_step == 2
+    assert step_one_hits == 1
+    assert not any(
+        thread.name.startswith("autonomy-speculation") for thread in threading.enumerate()
+    )
+
+
+def test_speculative_planning_discards_primed_decisions_after_a_band_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    with AutonomousSessionRunner(runtime, speculative_planning=True) as runner:
+        state, _, step_one_hits = _run_speculative_steps(
+            monkeypatch, runner, reset_rc_after_first_step=True
+        )
+        result = runner.finish_session(state)
+
+    # The RC-independent ranking is still reused; the decision primed for VERIFY is not.
+    assert state.prefetched_steps == 1
+    assert step_one_hits == 0
+    assert result.step_results[1].cycle_result.rc_state.value == "NORMAL"
+
+
+def test_stream_abandons_the_session_when_a_step_raises(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    runner = AutonomousSessionRunner(runtime, speculative_planning=True)
+    stream = runner.iter_run(goal_text="Fail mid-stream.", steps=_speculation_steps())
+
+    def fail_to_record(**kwargs):
+        raise OSError("memory store unavailable")
+
+    monkeypatch.setattr(runner.memory, "append_step_record", fail_to_record)
+    with pytest.raises(OSError, match="memory store unavailable"):
+        next(stream)
+
+    assert not stream.state.speculating
+    assert stream.state.prefetched is None
+    assert not any(
+        thread.name.startswith("autonomy-speculation") for thread in threading.enumerate()
+    )
+    events = [item["event"] for item in runner.memory.session_records(stream.state.session_id)]
+    assert "session_finished" not in events
+
+
+def test_replay_matches_ledger_entries_by_step_not_position(tmp_path: Path) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    runner = AutonomousSessionRunner(runtime)
+    steps = tuple(
+        AutonomousStep(
+            user_intent=f"Step {index}",
+            candidates=(
+                AutonomousCandidatePlan(
+                    proposal_text=f"Candidate {index}",
+                    action_class="WRITE_FILE",
+                    scope="workspace:project",
+                    effect_class=EffectClass.REVERSIBLE,
+                    command=("echo", f"match_{index}"),
+                    trajectory_reference=f"match/{index}",
+                ),
+            ),
+        )
+        for index in range(3)
+    )
+    state = runner.begin_session(goal_text="Match by step.", steps=steps)
+
+    def cycle(text: str, input_provenance: tuple[str, ...]) -> None:
+        runtime.run_command_cycle(
+            user_text=text,
+            proposal_text=text,
+            action_class="WRITE_FILE",
+            scope="workspace:project",
+            effect_class=EffectClass.REVERSIBLE,
+            command=("echo", text),
+            input_provenance=input_provenance,
+            session_id=state.session_id,
+        )
+
+    # A session-tagged entry that belongs to no autonomy step comes first.
+    cycle("operator note", ("operator",))
+    assert runner.run_step(state)
+    assert runner.run_step(state)
+    # Step 2 reached the ledger, but its memory record was never written.
+    cycle("Candidate 2", (autonomy_step_provenance(2),))
+
+    replay = AutonomousSessionReplayer(runtime, memory_store=runner.memory).replay(
+        state.session_id
+    )
+
+    assert [step.step_index for step in replay.steps] == [0, 1, 2]
+    assert [step.decision.allowed for step in replay.steps] == [True, True, True]
+    assert [(item.step_index, item.field) for item in replay.divergences] == [
+        (2, "step_record")
+    ]
@@ -1,7 +1,19 @@
 import json
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 
+import pytest
+
+from ree_openclaw.ledger import append_only
 from ree_openclaw.ledger.append_only import AppendOnlyLedger
+from ree_openclaw.ledger.background import BackgroundWriter, BackgroundWriterClosed
+from ree_openclaw.ledger.codec import (
+    RecordCodecError,
+    convert_record_file,
+    decode_canonical,
+    encode_canonical,
+)
 
 
 def test_append_only_chain_verification(tmp_path: Path) -> None:
@@ -25,3 +37,113 @@ def test_chain_tamper_detection(tmp_path: Path) -> None:
 
     assert not ledger.verify_chain()
 
+
+def test_json_tail_reads_only_the_last_record(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "ledger.jsonl"
+    writer = AppendOnlyLedger(path)
+    for step in range(3):
+        writer.append({"event": "step", "step": step, "note": "x" * 5000})
+    last = writer.append({"event": "outcome", "status": "ok"})
+
+    monkeypatch.setattr(append_only, "iter_records", None)
+    reopened = AppendOnlyLedger(path)
+    assert reopened.tail() == (4, last["entry_hash"])
+    offset, length = writer.span_of(last["entry_hash"])
+    assert [span[:2] for span in reopened.iter_spans(offset)] == [(offset, length)]
+    assert reopened.append({"event": "next"})["previous_hash"] == last["entry_hash"]
+    monkeypatch.undo()
+    assert reopened.verify_chain()
+
+
+def test_background_sink_keeps_chain_order_across_sync_and_async_appends(
+    tmp_path: Path,
+) -> None:
+    sink = BackgroundWriter(max_queue_size=4)
+    ledger = AppendOnlyLedger(tmp_path / "ledger.jsonl", sink=sink)
+    pending = [ledger.append_async({"event": "note", "n": n}) for n in range(10)]
+    committed = ledger.append({"event": "commit", "commit_id": "c1"})
+    sink.close()
+
+    assert [future.result()["index"] for future in pending] == list(range(10))
+    assert committed["index"] == 10
+    assert ledger.verify_chain()
+    with pytest.raises(BackgroundWriterClosed):
+        ledger.append_async({"event": "late"})
+
+
+def test_background_writer_never_strands_work_submitted_during_close() -> None:
+    sink = BackgroundWriter()
+    entered_put = threading.Event()
+    release_put = threading.Event()
+    real_put = sink._queue.put
+
+    def _slow_put(item: object, *args: object, **kwargs: object) -> None:
+        if item is not BackgroundWriter._STOP:
+            entered_put.set()
+            release_put.wait()
+        real_put(item, *args, **kwargs)
+
+    sink._queue.put = _slow_put  # type: ignore[method-assign]
+    late: list[Future[str]] = []
+    submitter = threading.Thread(target=lambda: late.append(sink.submit(lambda: "late")))
+    submitter.start()
+    assert entered_put.wait(timeout=1)
+
+    # close() runs while the submit sits between its closed check and its put.
+    closer = threading.Thread(target=sink.close)
+    closer.start()
+    closer.join(timeout=0.05)
+    release_put.set()
+    submitter.join()
+    closer.join()
+
+    assert late[0].result(timeout=1) == "late"
+
+
+def test_canonical_binary_codec_roundtrip_is_order_independent() -> None:
+    value = {
+        "b": [1, -1, -200, 70000, 2**40, -(2**40), 0.25, None, True, False],
+        "a": {"nested": "text", "bytes": b"\x00\xff", "big": "x" * 300},
+    }
+    reordered = {"a": dict(reversed(list(value["a"].items()))), "b": value["b"]}
+    encoded = encode_canonical(value)
+    assert encoded == encode_canonical(reordered)
+    assert decode_canonical(encoded) == value
+
+
+def test_canonical_decode_rejects_truncated_values() -> None:
+    for value in (70000, 2**40, -(2**40), 0.25, "x" * 300, b"\x00" * 300, [0] * 20):
+        encoded = encode_canonical(value)
+        for cut in range(len(encoded)):
+            with pytest.raises(RecordCodecError):
+                decode_canonical(encoded[:cut])
+    with pytest.raises(RecordCodecError):
+        decode_canonical(b"\xa2\xff\xfe")
+
+
+def test_binary_ledger_chain_and_conversion_preserve_hashes(tmp_path: Path) -> None:
+    json_path = tmp_path / "ledger.jsonl"
+    json_ledger = AppendOnlyLedger(json_path)
+    json_ledger.append({"event": "commit", "commit_id": "c1"})
+    json_ledger.append({"event": "outcome", "status": "ok", "command": ("echo", "x")})
+
+    binary_path = tmp_path / "ledger.bin"
+    assert convert_record_file(json_path, binary_path, record_format="binary") == 2
+    binary_ledger = AppendOnlyLedger(binary_path)
+    assert binary_ledger.record_format == "binary"
+    appended = binary_ledger.append({"event": "commit", "commit_id": "c2"})
+    assert appended["index"] == 2
+    assert appended["hash_format"] == "rcb1"
+    assert binary_ledger.verify_chain()
+
+    entries = binary_ledger.read_all()
+    assert [entry["entry_hash"] for entry in entries[:2]] == [
+        entry["entry_hash"] for entry in json_ledger.read_all()
+    ]
+    assert entries[2] == appended
+
+    roundtrip_path = tmp_path / "roundtrip.jsonl"
+    convert_record_file(binary_path, roundtrip_path, record_format="json")
+    assert AppendOnlyLedger(roundtrip_path).verify_chain()
@@ -1,4 +1,13 @@
-from ree_openclaw.rc.hysteresis import RCHysteresis, RCState
+import pytest
+
+from ree_openclaw.rc.hysteresis import (
+    RC_STATE_ORDER,
+    RCHysteresis,
+    RCHysteresisConfig,
+    RCState,
+)
+from ree_openclaw.rc.lanes import RCLaneRegistry
+from ree_openclaw.rc.simulation import simulate_hysteresis
 
 
 def test_hysteresis_state_flow() -> None:
@@ -10,3 +19,55 @@ def test_hysteresis_state_flow() -> None:
     assert lane.update(0.7) == RCState.VERIFY
     assert lane.update(0.2) == RCState.NORMAL
 
+
+
+def test_vectorized_hysteresis_simulation_matches_state_machine() -> None:
+    numpy = pytest.importorskip("numpy")
+    rng = numpy.random.default_rng(11)
+    scores = numpy.round(rng.random(5000), 2)
+    configs = (
+        RCHysteresisConfig(),
+        RCHysteresisConfig(t_low=0.2, t_high=0.5, t_lock=0.8),
+        RCHysteresisConfig(t_low=0.4, t_high=0.45, t_lock=0.99),
+    )
+
+    result = simulate_hysteresis(scores, configs, initial_state=RCState.VERIFY)
+
+    assert result.states is not None
+    for row, (config, stats) in enumerate(zip(configs, result.stats)):
+        lane = RCHysteresis(config)
+        lane.state = RCState.VERIFY
+        expected = [lane.update(score) for score in scores.tolist()]
+        assert [RC_STATE_ORDER[code] for code in result.states[row]] == expected
+
+        assert sum(stats.time_in_state.values()) == len(scores)
+        assert stats.time_in_state[RCState.LOCKDOWN] == expected.count(RCState.LOCKDOWN)
+        changes = sum(
+            1 for before, after in zip([RCState.VERIFY] + expected, expected) if before != after
+        )
+        assert stats.transition_count == changes == sum(stats.transitions.values())
+        if stats.lockdown_episodes:
+            assert stats.lockdown_max_dwell >= stats.lockdown_mean_dwell >= 1.0
+
+
+def test_hysteresis_simulation_rejects_out_of_range_scores() -> None:
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        simulate_hysteresis([0.2, 1.2], (RCHysteresisConfig(),))
+
+
+def test_lane_registry_isolates_sessions_and_never_evicts_raised_posture() -> None:
+    registry = RCLaneRegistry(max_lanes=2)
+    assert registry.update("tenant-a", 0.95) == RCState.LOCKDOWN
+    assert registry.update("tenant-b", 0.1) == RCState.NORMAL
+    assert registry.update("tenant-c", 0.7) == RCState.VERIFY
+
+    assert "tenant-b" not in registry
+    assert registry.state("tenant-a") == RCState.LOCKDOWN
+    assert registry.state("tenant-c") == RCState.VERIFY
+    assert registry.state("tenant-b") == RCState.NORMAL
+
+    restored = RCLaneRegistry(max_lanes=2)
+    restored.restore(registry.snapshot())
+    assert restored.state("tenant-a") == RCState.LOCKDOWN
+    assert restored.update("tenant-a", 0.7) == RCState.VERIFY
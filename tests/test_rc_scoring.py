@@ -1,6 +1,9 @@
+from datetime import datetime, timezone
+
 import pytest
 
 from ree_openclaw.rc.scoring import RCConflictScorer, RCConflictSignals, RCConflictWeights
+from ree_openclaw.rc.signals import RCSignalExtractionConfig, RCSignalExtractor, combine_signals
 
 
 def test_rc_conflict_scorer_weighted_average() -> None:
@@ -34,3 +37,66 @@ def test_rc_conflict_scorer_rejects_out_of_range_signal() -> None:
                 tool_output_inconsistency=0.0,
             )
         )
+
+
+def test_rc_conflict_batch_scoring_matches_scalar_exactly() -> None:
+    numpy = pytest.importorskip("numpy")
+    scorer = RCConflictScorer()
+    matrix = numpy.random.default_rng(7).random((500, 4))
+    matrix[0] = (0.0, 0.0, 0.0, 0.0)
+    matrix[1] = (1.0, 1.0, 1.0, 1.0)
+    batch = scorer.score_batch(matrix)
+    expected = [scorer.score(RCConflictSignals(*row)) for row in matrix.tolist()]
+    assert batch.tolist() == expected
+
+    signals = [RCConflictSignals(*row) for row in matrix[:3].tolist()]
+    assert scorer.score_batch(signals).tolist() == expected[:3]
+
+
+def test_rc_conflict_batch_scoring_rejects_out_of_range_signal() -> None:
+    numpy = pytest.importorskip("numpy")
+    scorer = RCConflictScorer()
+    matrix = numpy.zeros((3, 4))
+    matrix[2, 3] = 1.5
+    with pytest.raises(ValueError, match="tool_output_inconsistency"):
+        scorer.score_batch(matrix)
+
+
+def test_rc_signal_extractor_tracks_gaps_streaks_and_output_changes() -> None:
+    extractor = RCSignalExtractor(RCSignalExtractionConfig(gap_ratio_ceiling=5.0))
+
+    def entry(timestamp: float, returncode: int, stdout: str) -> dict:
+        return {
+            "timestamp": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(),
+            "payload": {
+                "event": "commit_executed",
+                "session_id": "s1",
+                "command": ["echo", "x"],
+                "execution": {"returncode": returncode, "stdout": stdout, "stderr": ""},
+            },
+        }
+
+    for offset in range(4):
+        extractor.observe_entry(entry(1000.0 + offset, 0, "x\n"))
+    steady = extractor.signals("s1", now=1004.0)
+    assert steady.temporal_discontinuity == 0.0
+    assert steady.tool_output_inconsistency == 0.0
+    assert extractor.signals("s1", now=1003.0 + 5.0).temporal_discontinuity == 1.0
+    assert extractor.signals("s1", now=999.0).temporal_discontinuity == 1.0
+    assert extractor.signals("other", now=1004.0) == RCConflictSignals()
+
+    extractor.observe_entry(entry(1004.0, 0, "y\n"))
+    assert extractor.signals("s1").tool_output_inconsistency == 0.5
+    extractor.observe_entry(entry(1005.0, 1, "y\n"))
+    extractor.observe_entry(entry(1006.0, 1, "y\n"))
+    extractor.observe_entry(entry(1007.0, 1, "y\n"))
+    assert extractor.signals("s1").tool_output_inconsistency == 1.0
+    extractor.observe_entry(entry(1008.0, 0, "y\n"))
+    assert extractor.signals("s1").tool_output_inconsistency == 0.0
+
+    merged = combine_signals(
+        RCConflictSignals(provenance_mismatch=0.3, tool_output_inconsistency=0.2),
+        RCConflictSignals(tool_output_inconsistency=0.6),
+    )
+    assert merged.provenance_mismatch == 0.3
+    assert merged.tool_output_inconsistency == 0.6
@@ -1,7 +1,16 @@
+import threading
+import time
 from pathlib import Path
 
+import pytest
+
 from ree_openclaw.runtime.pipeline import OpenClawRuntime
-from ree_openclaw.rollout.planner import RolloutProposal, RolloutSignals
+from ree_openclaw.rollout.planner import (
+    RolloutCandidate,
+    RolloutPlanner,
+    RolloutProposal,
+    RolloutSignals,
+)
 from ree_openclaw.types import EffectClass, PayloadType
 
 
@@ -74,3 +83,320 @@ def test_rollout_planning_does_not_write_ledger(tmp_path: Path) -> None:
     )
 
     assert runtime.ledger.read_all() == []
+
+
+def test_rank_candidates_top_k_matches_full_sort(tmp_path: Path) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    planner = runtime.rollout_planner
+    candidates = planner.build_candidates(
+        tuple(
+            RolloutProposal(
+                proposal_text=f"Plan {index}.",
+                action_class="WRITE_FILE",
+                scope="workspace:project",
+                effect_class=EffectClass.REVERSIBLE,
+                command=("echo", str(index)),
+                trajectory_reference=f"traj/{index}",
+            )
+            for index in range(40)
+        )
+    )
+    overrides = {
+        f"traj/{index}": RolloutSignals(viability=(index * 7 % 5) / 4, valence=0.5)
+        for index in range(40)
+    }
+
+    full = planner.rank_candidates(candidates, signal_overrides=overrides)
+    top = planner.rank_candidates(iter(candidates), signal_overrides=overrides, k=6)
+    assert top == full[:6]
+
+    bounded = planner.rank_candidates(candidates, signal_overrides=overrides, min_score=0.7)
+    assert bounded == [item for item in full if item.ranking_score >= 0.7]
+    assert planner.rank_candidates(candidates, signal_overrides=overrides, k=0) == []
+
+
+def test_score_columns_matches_scalar_ranking() -> None:
+    numpy = pytest.importorskip("numpy")
+    planner = RolloutPlanner()
+    rng = numpy.random.default_rng(3)
+    viability = numpy.round(rng.random(300), 1)
+    valence = numpy.round(rng.random(300), 1)
+    bias = rng.choice([0.0, 0.05, -0.05], size=300)
+
+    scores, order = planner.score_columns(viability, valence, bias)
+
+    expected = [
+        planner.ranking_score(RolloutSignals(viability=float(v), valence=float(w))) + float(b)
+        for v, w, b in zip(viability, valence, bias)
+    ]
+    assert scores.tolist() == expected
+    assert order.tolist() == sorted(range(300), key=lambda index: -expected[index])
+    with pytest.raises(ValueError, match="valence must be in"):
+        planner.score_columns([0.5], [1.5])
+
+
+def test_rollout_candidates_build_envelopes_lazily() -> None:
+    planner = RolloutPlanner()
+    candidates = planner.build_candidates(
+        (
+            RolloutProposal(
+                proposal_text="Plan lazy.",
+                action_class="WRITE_FILE",
+                scope="workspace:project",
+                effect_class=EffectClass.REVERSIBLE,
+                command=("echo", "lazy"),
+                trajectory_reference="traj/lazy",
+                input_provenance=("user-msg",),
+            ),
+        )
+    )
+    ranked = planner.rank_candidates(candidates)
+    candidate = ranked[0].candidate
+
+    assert candidate.payload_type == PayloadType.TRAJ
+    assert not candidate.envelope_materialized
+    envelope = candidate.envelope
+    assert candidate.envelope_materialized
+    assert candidate.envelope is envelope
+    assert envelope.payload == {"content": "Plan lazy.", "role": "rollout"}
+    assert envelope.provenance.source_class == "MODEL_INTERNAL"
+    assert envelope.provenance.input_provenance == ("user-msg",)
+    assert envelope.effect_class == EffectClass.REVERSIBLE
+
+
+def test_evaluate_candidates_handles_timeouts_failures_and_deadline() -> None:
+    planner = RolloutPlanner()
+    candidates = planner.build_candidates(
+        tuple(
+            RolloutProposal(
+                proposal_text=f"Plan {name}.",
+                action_class="WRITE_FILE",
+                scope="workspace:project",
+                effect_class=EffectClass.REVERSIBLE,
+                command=("echo", name),
+                trajectory_reference=f"traj/{name}",
+            )
+            for name in ("fast", "better", "slow", "broken")
+        )
+    )
+    release = threading.Event()
+
+    def evaluator(candidate: RolloutCandidate) -> RolloutSignals:
+        name = candidate.trajectory_reference
+        if name == "traj/slow":
+            release.wait(5.0)
+        if name == "traj/broken":
+            raise RuntimeError("dry run failed")
+        viability = 0.9 if name == "traj/better" else 0.3
+        return RolloutSignals(viability=viability, valence=0.5)
+
+    run = planner.evaluate_candidates(
+        candidates, evaluator, max_workers=4, candidate_timeout_seconds=0.2
+    )
+    release.set()
+
+    assert [item.candidate.trajectory_reference for item in run.evaluations] == [
+        "traj/better",
+        "traj/fast",
+    ]
+    assert run.best is not None and run.best.ranking_score == planner.ranking_score(
+        RolloutSignals(viability=0.9, valence=0.5)
+    )
+    assert run.timed_out == ("traj/slow",)
+    assert run.failed == {"traj/broken": "RuntimeError: dry run failed"}
+    assert not run.deadline_reached
+
+    release.clear()
+    run = planner.evaluate_candidates(
+        candidates, evaluator, max_workers=1, deadline_seconds=0.2
+    )
+    release.set()
+    assert [item.candidate.trajectory_reference for item in run.evaluations] == [
+        "traj/better",
+        "traj/fast",
+    ]
+    assert run.timed_out == ("traj/slow",)
+    assert run.not_started == ("traj/broken",)
+    assert run.deadline_reached
+
+
+def test_candidate_timeout_counts_from_start_and_keeps_the_slow_worker_busy() -> None:
+    planner = RolloutPlanner()
+    candidates = planner.build_candidates(
+        tuple(
+            RolloutProposal(
+                proposal_text=f"Plan {index}.",
+                action_class="WRITE_FILE",
+                scope="workspace:project",
+                effect_class=EffectClass.REVERSIBLE,
+                command=("echo", str(index)),
+                trajectory_reference=f"t{index}",
+            )
+            for index in range(4)
+        )
+    )
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def evaluator(candidate: RolloutCandidate) -> RolloutSignals:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.5 if candidate.trajectory_reference == "t0" else 0.05)
+        with lock:
+            running -= 1
+        return RolloutSignals()
+
+    run = planner.evaluate_candidates(
+        candidates, evaluator, max_workers=1, candidate_timeout_seconds=0.2
+    )
+
+    # The fast candidates queue behind the abandoned slow one without being charged for it.
+    assert run.timed_out == ("t0",)
+    assert sorted(item.candidate.trajectory_reference for item in run.evaluations) == [
+        "t1",
+        "t2",
+        "t3",
+    ]
+    assert peak == 1
+
+
+def test_beam_search_finds_plan_greedy_selection_misses(tmp_path: Path) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+
+    def proposal(name: str) -> RolloutProposal:
+        return RolloutProposal(
+            proposal_text=f"Plan {name}.",
+            action_class="WRITE_FILE",
+            scope="workspace:project",
+            effect_class=EffectClass.REVERSIBLE,
+            command=("echo", name),
+            trajectory_reference=f"traj/{name}",
+        )
+
+    tree = {
+        (): [("a", 0.9), ("b", 0.6)],
+        ("traj/a",): [("a1", 0.1)],
+        ("traj/b",): [("b1", 1.0), ("b2", 0.2)],
+    }
+    expanded: list[tuple[str, ...]] = []
+
+    def expand(prefix: tuple[RolloutProposal, ...]) -> list[tuple[RolloutProposal, RolloutSignals]]:
+        key = tuple(item.trajectory_reference for item in prefix)
+        expanded.append(key)
+        return [
+            (proposal(name), RolloutSignals(viability=viability, valence=viability))
+            for name, viability in tree.get(key, [])
+        ]
+
+    result = runtime.plan_rollout_sequence(
+        expand,
+        beam_width=2,
+        max_depth=3,
+        memory_bias=lambda reference: 0.05 if reference == "traj/b2" else 0.0,
+    )
+
+    assert result.best is not None
+    assert result.best.trajectory_references == ("traj/b", "traj/b1")
+    assert result.best.score == sum(result.best.step_scores)
+    assert [plan.trajectory_references for plan in result.plans] == [
+        ("traj/b", "traj/b1"),
+        ("traj/a", "traj/a1"),
+    ]
+    assert not result.best.candidates[0].envelope_materialized
+    assert result.expansions == len(expanded)
+    assert runtime.ledger.read_all() == []
+
+
+def test_duplicate_candidates_share_envelopes_and_evaluations() -> None:
+    planner = RolloutPlanner()
+    proposals = tuple(
+        RolloutProposal(
+            proposal_text=f"Plan {command}.",
+            action_class="WRITE_FILE",
+            scope="workspace:project",
+            effect_class=EffectClass.REVERSIBLE,
+            command=("echo", command),
+            trajectory_reference=f"traj/{index}",
+        )
+        for index, command in enumerate(("x", "y", "x", "x", "y"))
+    )
+    candidates = planner.build_candidates(proposals)
+    assert not candidates[3].envelope_materialized
+    assert candidates[0].envelope.provenance is candidates[2].envelope.provenance
+    # The envelope candidate 3 shares was built through candidate 0.
+    assert candidates[3].envelope_materialized
+    assert candidates[0].envelope.provenance is not candidates[1].envelope.provenance
+    # Each duplicate gets its own payload, so an edit through one stays local.
+    candidates[0].envelope.payload["content"] = "edited"
+    assert candidates[2].envelope.payload == {"content": "Plan x.", "role": "rollout"}
+    assert candidates[3].envelope.payload["content"] == "Plan x."
+    assert candidates[0].canonical_key == candidates[3].canonical_key
+
+    calls: list[tuple[str, ...]] = []
+    lock = threading.Lock()
+
+    def evaluator(candidate: RolloutCandidate) -> RolloutSignals:
+        with lock:
+            calls.append(candidate.command)
+        viability = 0.8 if candidate.command == ("echo", "y") else 0.4
+        return RolloutSignals(viability=viability, valence=0.5)
+
+    run = planner.evaluate_candidates(candidates, evaluator, max_workers=2)
+
+    assert sorted(calls) == [("echo", "x"), ("echo", "y")]
+    assert [item.candidate.trajectory_reference for item in run.evaluations] == [
+        "traj/1",
+        "traj/4",
+        "traj/0",
+        "traj/2",
+        "traj/3",
+    ]
+
+
+def test_evaluate_candidates_reads_candidates_only_as_workers_free_up() -> None:
+    planner = RolloutPlanner()
+    candidates = planner.build_candidates(
+        tuple(
+            RolloutProposal(
+                proposal_text="Plan.",
+                action_class="WRITE_FILE",
+                scope="workspace:project",
+                effect_class=EffectClass.REVERSIBLE,
+                command=("echo", command),
+                trajectory_reference=f"traj/{index}",
+            )
+            for index, command in enumerate(("x", "x", "y", "x", "z"))
+        )
+    )
+    pulled: list[int] = []
+
+    def stream():
+        for index, candidate in enumerate(candidates):
+            pulled.append(index)
+            yield candidate
+
+    pulled_at_call: list[int] = []
+
+    def evaluator(candidate: RolloutCandidate) -> RolloutSignals:
+        pulled_at_call.append(len(pulled))
+        return RolloutSignals()
+
+    run = planner.evaluate_candidates(stream(), evaluator, max_workers=1)
+
+    # Each evaluation starts before the next distinct candidate is read; duplicates
+    # read later reuse the finished result.
+    assert pulled_at_call == [1, 3, 5]
+    assert sorted(item.candidate.trajectory_reference for item in run.evaluations) == [
+        f"traj/{index}" for index in range(5)
+    ]
@@ -1,6 +1,15 @@
+import hashlib
+import json
+import os
+import threading
 from pathlib import Path
 
+import pytest
+
+from ree_openclaw.ledger import append_only
+from ree_openclaw.ledger.background import BackgroundWriter
 from ree_openclaw.rc.scoring import RCConflictSignals
+from ree_openclaw.rc.signals import RCSignalExtractionConfig, RCSignalExtractor
 from ree_openclaw.runtime.pipeline import OpenClawRuntime
 from ree_openclaw.types import EffectClass
 from ree_openclaw.verifier.verifier import ConsentToken
@@ -155,3 +164,289 @@ def test_runtime_uses_signal_scoring_for_lockdown(tmp_path: Path) -> None:
     assert result.rc_state.value == "LOCKDOWN"
     assert not result.verification.allowed
     assert result.verification.reason == "lockdown_posture_block"
+
+
+def test_manifest_hot_reload_swaps_capabilities_and_logs_to_ledger(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    manifest = json.loads(_manifest_path().read_text(encoding="utf-8"))
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=manifest_path,
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    runtime.rc_lane.update(0.7)
+    reloader = runtime.watch_manifest(start=False)
+
+    for capability in manifest["capabilities"]:
+        if capability["action_class"] == "WRITE_FILE":
+            capability["allowed_scopes"].append("workspace:scratch")
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    os.utime(manifest_path, ns=(1, 1))
+    assert reloader.check_once()
+    assert "workspace:scratch" in runtime.verifier.capabilities["WRITE_FILE"].allowed_scopes
+    assert runtime.rc_lane.state.value == "VERIFY"
+
+    manifest_path.write_text("{not json", encoding="utf-8")
+    os.utime(manifest_path, ns=(2, 2))
+    assert not reloader.check_once()
+    assert "WRITE_FILE" in runtime.verifier.capabilities
+
+    events = [entry["payload"]["event"] for entry in runtime.ledger.read_all()]
+    assert events == ["capability_manifest_reloaded", "capability_manifest_reload_failed"]
+    assert runtime.ledger.verify_chain()
+    runtime.close()
+
+
+def test_manifest_reload_hashes_the_same_bytes_it_parses(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    manifest = json.loads(_manifest_path().read_text(encoding="utf-8"))
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=manifest_path,
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    reloader = runtime.watch_manifest(start=False)
+
+    for capability in manifest["capabilities"]:
+        if capability["action_class"] == "WRITE_FILE":
+            capability["allowed_scopes"].append("workspace:scratch")
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    os.utime(manifest_path, ns=(1, 1))
+    polled_bytes = manifest_path.read_bytes()
+    original_read_bytes = Path.read_bytes
+
+    def read_then_overwrite(path: Path) -> bytes:
+        data = original_read_bytes(path)
+        if path == manifest_path:
+            # Another writer replaces the manifest right after the poll reads it.
+            manifest_path.write_text("{not json", encoding="utf-8")
+        return data
+
+    monkeypatch.setattr(Path, "read_bytes", read_then_overwrite)
+    assert reloader.check_once()
+    monkeypatch.undo()
+
+    assert "workspace:scratch" in runtime.verifier.capabilities["WRITE_FILE"].allowed_scopes
+    compiled = runtime.verifier.compiled_manifest
+    assert compiled.source_sha256 == hashlib.sha256(polled_bytes).hexdigest()
+    reloaded = runtime.ledger.read_all()[-1]["payload"]
+    assert reloaded["manifest_sha256"] == compiled.source_sha256
+    runtime.close()
+
+
+def test_manifest_poll_thread_survives_check_errors(tmp_path: Path) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+    reloader = runtime.watch_manifest(poll_interval_seconds=0.01, start=False)
+    polled_again = threading.Event()
+    calls = 0
+
+    def flaky_check_once() -> bool:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise PermissionError("manifest directory unreadable")
+        polled_again.set()
+        return False
+
+    reloader.check_once = flaky_check_once  # type: ignore[method-assign]
+    reloader.start()
+    assert polled_again.wait(timeout=5.0)
+    assert isinstance(reloader.last_error, PermissionError)
+    runtime.close()
+
+
+def test_runtime_background_writer_drains_audit_and_ledger_on_close(tmp_path: Path) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+        audit_log_path=tmp_path / "audit.jsonl",
+        background_writer=BackgroundWriter(max_queue_size=8),
+    )
+    with runtime:
+        for marker in ("bg_one", "bg_two"):
+            result = runtime.run_command_cycle(
+                user_text="Run a safe action.",
+                proposal_text="Reversible sandbox action.",
+                action_class="WRITE_FILE",
+                scope="workspace:project",
+                effect_class=EffectClass.REVERSIBLE,
+                command=("echo", marker),
+                rc_conflict_score=0.1,
+                input_provenance=("test-user-message",),
+            )
+            assert result.verification.allowed
+
+    audit_lines = (tmp_path / "audit.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(audit_lines) == 2
+    assert [entry["index"] for entry in runtime.ledger.read_all()] == [0, 1]
+    assert runtime.ledger.verify_chain()
+
+
+def test_session_lanes_keep_rc_posture_separate(tmp_path: Path) -> None:
+    runtime = OpenClawRuntime.from_manifest(
+        manifest_path=_manifest_path(),
+        ledger_path=tmp_path / "ledger.jsonl",
+        sandbox_root=tmp_path / "sandbox",
+    )
+
+    def _cycle(session_id: str, score: float):
+        return runtime.run_command_cycle(
+            user_text="Run safe action.",
+            proposal_text="Reversible write.",
+            action_class="WRITE_FILE",
+            scope="workspace:project",
+            effect_class=EffectClass.REVERSIBLE,
+            command=("echo", session_id),
+            rc_conflict_score=score,
+            input_provenance=("test-user-message",),
+            session_id=session_id,
+        )
+
+    locked = _cycle("session-a", 0.95)
+    calm = _cycle("session-b", 0.1)
+
+    assert locked.rc_state.value == "LOCKDOWN"
+    assert calm.rc_state.value == "NORMAL"
+    assert calm.verification.allowed
+    assert calm.ledger_entry["payload"]["session_id"] == "session-b"
+    assert runtime.rc_lane.state.value == "NORMAL"
+
+
+def test_rc_posture_snapshot_survives_restart_and_reconciles_with_ledger(
+    tmp_path: Path,
+) -> None:
+    def _runtime() -> OpenClawRuntime:
+        return OpenClawRuntime.from_manifest(
+            manifest_path=_manifest_path(),
+            ledger_path=tmp_path / "ledger.jsonl",
+            sandbox_root=tmp_path / "sandbox",
+            rc_snapshot_path=tmp_path / "rc_posture.json",
+        )
+
+    first = _runtime()
+    first.run_command_cycle(
+        user_text="Suspicious request.",
+        proposal_text="Privileged send.",
+        action_class="SEND_EMAIL",
+        scope="mailbox:primary",
+        effect_class=EffectClass.PRIVILEGED,
+        command=("echo", "blocked"),
+        rc_conflict_score=0.95,
+        input_provenance=("test-user-message",),
+        session_id="session-a",
+    )
+
+    restarted = _runtime()
+    assert restarted.rc_lanes.state("session-a").value == "LOCKDOWN"
+
+    # An entry appended behind the snapshot's back is reconciled on restart.
+    restarted.ledger.append({"event": "proposal_rejected", "rc_state": "VERIFY"})
+    reconciled = _runtime()
+    assert reconciled.rc_lanes.state("session-a").value == "LOCKDOWN"
+    assert reconciled.rc_lane.state.value == "VERIFY"
+
+
+def test_rc_posture_restore_reads_only_entries_after_the_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def _runtime() -> OpenClawRuntime:
+        return OpenClawRuntime.from_manifest(
+            manifest_path=_manifest_path(),
+            ledger_path=tmp_path / "ledger.jsonl",
+            sandbox_root=tmp_path / "sandbox",
+            rc_snapshot_path=tmp_path / "rc_posture.json",
+        )
+
+    first = _runtime()
+    for _ in range(3):
+        first.ledger.append({"event": "filler"})
+    first.run_command_cycle(
+        user_text="Suspicious request.",
+        proposal_text="Privileged send.",
+        action_class="SEND_EMAIL",
+        scope="mailbox:primary",
+        effect_class=EffectClass.PRIVILEGED,
+        command=("echo", "blocked"),
+        rc_conflict_score=0.95,
+        input_provenance=("test-user-message",),
+        session_id="session-a",
+    )
+    snapshot = json.loads((tmp_path / "rc_posture.json").read_text(encoding="utf-8"))
+    assert snapshot["ledger_offset"] > 0
+    first.ledger.append({"event": "proposal_rejected", "rc_state": "VERIFY"})
+
+    read_from: list[int] = []
+    original = append_only.iter_record_spans
+
+    def _recording(path: Path, offset: int = 0):
+        read_from.append(offset)
+        return original(path, offset)
+
+    monkeypatch.setattr(append_only, "iter_record_spans", _recording)
+    monkeypatch.setattr(append_only, "iter_records", None)
+    restarted = _runtime()
+    assert read_from == [snapshot["ledger_offset"]]
+    assert restarted.rc_lanes.state("session-a").value == "LOCKDOWN"
+    assert restarted.rc_lane.state.value == "VERIFY"
+
+    # A span that no longer holds the snapshot's entry forces a full replay.
+    snapshot["ledger_offset"] += 1
+    (tmp_path / "rc_posture.json").write_text(json.dumps(snapshot), encoding="utf-8")
+    read_from.clear()
+    replayed = _runtime()
+    assert read_from == [snapshot["ledger_offset"], 0]
+    assert replayed.rc_lanes.state("session-a").value == "LOCKDOWN"
+    assert replayed.rc_lane.state.value == "VERIFY"
+
+
+def test_extracted_signals_raise_rc_score_and_transition_across_cycles(tmp_path: Path) -> None:
+    def _run_two_failing_cycles(root: Path, extractor: RCSignalExtractor | None):
+        runtime = OpenClawRuntime.from_manifest(
+            manifest_path=_manifest_path(),
+            ledger_path=root / "ledger.jsonl",
+            sandbox_root=root / "sandbox",
+            signal_extractor=extractor,
+        )
+        return [
+            runtime.run_command_cycle(
+                user_text="Run a flaky tool.",
+                proposal_text="Reversible write.",
+                action_class="WRITE_FILE",
+                scope="workspace:project",
+                effect_class=EffectClass.REVERSIBLE,
+                command=("python3", "-c", "import sys; sys.exit(1)"),
+                rc_signals=RCConflictSignals(
+                    provenance_mismatch=1.0,
+                    identity_capability_inconsistency=0.6,
+                ),
+                input_provenance=("test-user-message",),
+                session_id="session-a",
+            )
+            for _ in range(2)
+        ]
+
+    # A huge gap ceiling keeps temporal discontinuity out of the comparison.
+    extractor = RCSignalExtractor(
+        RCSignalExtractionConfig(gap_ratio_ceiling=1e9, failure_streak_saturation=1)
+    )
+    first, second = _run_two_failing_cycles(tmp_path / "extracted", extractor)
+    baseline = _run_two_failing_cycles(tmp_path / "baseline", None)
+
+    assert first.execution_result is not None
+    assert first.execution_result.returncode == 1
+    assert first.rc_conflict_score == baseline[0].rc_conflict_score
+    assert first.rc_state.value == "NORMAL"
+    # The failed first command is observed from the ledger and feeds the second cycle.
+    assert second.rc_conflict_score > baseline[1].rc_conflict_score
+    assert second.rc_state.value == "VERIFY"
+    assert baseline[1].rc_state.value == "NORMAL"
+    assert second.ledger_entry["payload"]["rc_state"] == "VERIFY"
@@ -29,3 +29,31 @@ def test_sandbox_blocks_path_escape(tmp_path: Path) -> None:
     with pytest.raises(PermissionError):
         executor.write_text("../escape.txt", "blocked")
 
+
+def test_sandbox_binary_roundtrip_and_streaming(tmp_path: Path) -> None:
+    executor = SandboxedExecutor(tmp_path / "sandbox")
+    payload = bytes(range(256)) * 64
+    executor.write_bytes("artifacts/blob.bin", memoryview(payload))
+    assert executor.read_bytes("artifacts/blob.bin") == payload
+
+    executor.write_chunks("artifacts/streamed.bin", (payload[:100], bytearray(payload[100:])))
+    assert b"".join(executor.iter_chunks("artifacts/streamed.bin", chunk_size=1000)) == payload
+    for chunk_size in (0, -1):
+        with pytest.raises(ValueError):
+            executor.iter_chunks("artifacts/streamed.bin", chunk_size=chunk_size)
+
+    with executor.map_bytes("artifacts/blob.bin") as view:
+        assert len(view) == len(payload)
+        assert bytes(view[:4]) == payload[:4]
+
+
+def test_sandbox_write_many_checks_all_paths_before_writing(tmp_path: Path) -> None:
+    executor = SandboxedExecutor(tmp_path / "sandbox")
+    with pytest.raises(PermissionError):
+        executor.write_many({"ok.txt": "fine", "../escape.bin": b"blocked"})
+    assert not (tmp_path / "sandbox" / "ok.txt").exists()
+
+    written = executor.write_many({"a.txt": "alpha", "nested/b.bin": b"\x00\x01"})
+    assert len(written) == 2
+    assert executor.read_text("a.txt") == "alpha"
+    assert executor.read_bytes("nested/b.bin") == b"\x00\x01"
@@ -1,8 +1,19 @@
+import json
+import time
 from pathlib import Path
 
+import pytest
+
 from ree_openclaw.rc.hysteresis import RCState
 from ree_openclaw.types import EffectClass
-from ree_openclaw.verifier.capability_manifest import load_capabilities
+from ree_openclaw.verifier.audit import AuditLogWriter
+from ree_openclaw.verifier.capability_manifest import (
+    Capability,
+    compile_manifest_file,
+    load_capabilities,
+    load_manifest,
+)
+from ree_openclaw.verifier.scopes import ScopeIndex
 from ree_openclaw.verifier.verifier import (
     CapabilityVerifier,
     ConsentToken,
@@ -142,3 +153,163 @@ def test_provenance_binding_missing_is_blocked() -> None:
     )
     assert not decision.allowed
     assert decision.reason == "provenance_binding_missing"
+
+
+def test_decision_cache_keeps_live_consent_and_provenance_checks() -> None:
+    verifier = CapabilityVerifier(_load_default_caps(), decision_cache_size=8)
+    request = VerificationRequest(
+        action_class="SEND_EMAIL",
+        scope="mailbox:primary",
+        effect_class=EffectClass.PRIVILEGED,
+        provenance=_provenance(),
+        provided_verifiers=_verifier_labels(),
+    )
+    assert verifier.verify(request).reason == "consent_required"
+
+    consented = VerificationRequest(
+        action_class=request.action_class,
+        scope=request.scope,
+        effect_class=request.effect_class,
+        consent_token=ConsentToken(
+            action_class="SEND_EMAIL",
+            scope="mailbox:primary",
+            nonce="n1",
+            issued_at="2026-02-18T00:00:00+00:00",
+        ),
+        provenance=_provenance(),
+        provided_verifiers=_verifier_labels(),
+    )
+    assert verifier.verify(consented).allowed
+
+    unbound = VerificationRequest(
+        action_class=request.action_class,
+        scope=request.scope,
+        effect_class=request.effect_class,
+        consent_token=consented.consent_token,
+        provenance={"model_call_id": "m1"},
+        provided_verifiers=_verifier_labels(),
+    )
+    assert verifier.verify(unbound).reason == "provenance_binding_missing"
+
+
+def test_decision_cache_is_invalidated_when_capabilities_change() -> None:
+    capabilities = _load_default_caps()
+    verifier = CapabilityVerifier(capabilities)
+    request = VerificationRequest(
+        action_class="READ_FILE",
+        scope="workspace:readonly",
+        effect_class=EffectClass.NONE,
+        provenance=_provenance(),
+        provided_verifiers=_verifier_labels(),
+    )
+    assert verifier.verify(request).allowed
+
+    with pytest.raises(TypeError):
+        del verifier.capabilities["READ_FILE"]  # type: ignore[attr-defined]
+    capabilities.pop("READ_FILE")
+    assert verifier.verify(request).allowed
+
+    verifier.capabilities = capabilities
+    assert verifier.verify(request).reason == "unknown_action_class"
+
+
+def test_compiled_manifest_roundtrip_matches_source_decisions(tmp_path: Path) -> None:
+    root = Path(__file__).resolve().parents[1]
+    source = root / "config" / "capabilities" / "default_manifest.json"
+    compiled_path = tmp_path / "compiled.json"
+    compile_manifest_file(source, compiled_path)
+    compiled = load_manifest(compiled_path)
+
+    source_verifier = CapabilityVerifier(_load_default_caps())
+    compiled_verifier = CapabilityVerifier(compiled)
+    assert compiled_verifier.capabilities == source_verifier.capabilities
+    for action_class, scope, effect_class, labels in (
+        ("WRITE_FILE", "workspace:project", EffectClass.REVERSIBLE, _verifier_labels()),
+        ("WRITE_FILE", "workspace:other", EffectClass.REVERSIBLE, _verifier_labels()),
+        ("DELETE_FILE", "workspace:sandbox", EffectClass.DESTRUCTIVE, ("scope_verifier",)),
+        ("UNKNOWN", "workspace:project", EffectClass.NONE, ()),
+    ):
+        request = VerificationRequest(
+            action_class=action_class,
+            scope=scope,
+            effect_class=effect_class,
+            provenance=_provenance(),
+            provided_verifiers=labels,
+        )
+        assert compiled_verifier.verify(request) == source_verifier.verify(request)
+
+
+def test_wildcard_scope_patterns_match_by_segment() -> None:
+    capabilities = _load_default_caps()
+    capabilities["WRITE_FILE"] = Capability(
+        action_class="WRITE_FILE",
+        effect_class=EffectClass.REVERSIBLE,
+        requires_consent=False,
+        allowed_scopes=("workspace:*", "repo:org/**"),
+        required_verifiers=("scope_verifier",),
+        provenance_bindings=("model_call_id",),
+    )
+    verifier = CapabilityVerifier(capabilities)
+
+    def _reason(scope: str) -> str:
+        return verifier.verify(
+            VerificationRequest(
+                action_class="WRITE_FILE",
+                scope=scope,
+                effect_class=EffectClass.REVERSIBLE,
+                provenance=_provenance(),
+                provided_verifiers=_verifier_labels(),
+            )
+        ).reason
+
+    assert _reason("workspace:project") == "allowed"
+    assert _reason("repo:org/team/service") == "allowed"
+    assert _reason("workspace:project/nested") == "scope_not_allowed"
+    assert _reason("repo:other/service") == "scope_not_allowed"
+    assert _reason("workspace:*") == "scope_not_allowed"
+
+
+def test_partial_segment_wildcard_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        ScopeIndex(("workspace:proj*",))
+
+
+def test_buffered_audit_writer_flushes_on_close_and_rotates(tmp_path: Path) -> None:
+    audit_path = tmp_path / "audit" / "verifier_audit.jsonl"
+    writer = AuditLogWriter(audit_path, flush_interval_seconds=3600.0, max_bytes=600)
+    verifier = CapabilityVerifier(_load_default_caps(), audit_writer=writer)
+    request = VerificationRequest(
+        action_class="READ_FILE",
+        scope="workspace:readonly",
+        effect_class=EffectClass.NONE,
+        provenance=_provenance(),
+        provided_verifiers=_verifier_labels(),
+    )
+    for _ in range(4):
+        verifier.verify(request)
+    verifier.close()
+
+    assert audit_path.with_name("verifier_audit.jsonl.1").exists()
+    lines = [
+        line
+        for path in audit_path.parent.iterdir()
+        for line in path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert len(lines) == 4
+    assert all(json.loads(line)["decision"]["allowed"] for line in lines)
+
+
+def test_buffered_audit_record_is_flushed_after_interval_without_further_writes(
+    tmp_path: Path,
+) -> None:
+    audit_path = tmp_path / "audit.jsonl"
+    writer = AuditLogWriter(audit_path, flush_interval_seconds=0.05)
+    writer.write({"event": "buffered"})
+    assert audit_path.read_text(encoding="utf-8") == ""
+
+    deadline = time.monotonic() + 5.0
+    while not audit_path.read_text(encoding="utf-8"):
+        assert time.monotonic() < deadline, "buffered audit record was never flushed"
+        time.sleep(0.01)
+    assert json.loads(audit_path.read_text(encoding="utf-8")) == {"event": "buffered"}
+    writer.close()